@@ -0,0 +1,277 @@
+"""
+Performance regression harness for the hot paths: search calls, Maze
+operations, a Game.update tick and a headless Game.draw, all on fixed
+seeds. Results are compared with a stored JSON baseline and the run fails
+when a metric is slower than the baseline by more than its noise allows.
+
+    python benchmark.py              # Compare with the baseline (saved on first run)
+    python benchmark.py --save       # Measure and store a new baseline
+    python benchmark.py --only search
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+with contextlib.redirect_stdout(io.StringIO()):  # Layout checks log on import
+    from src.algorithms.adaptive import AdaptivePlanner
+    from src.algorithms.distances import BFSDistanceCache
+    from src.algorithms.path_cache import CachedSearch
+    from src.algorithms.search import (AStarSearch, BreadthFirstSearch, UniformCostSearch,
+                                       BidirectionalBFS, BidirectionalAStar, MultiGoalAStarSearch)
+    from src.config.constants import MAZE_WIDTH, MAZE_HEIGHT
+    from src.config.maze_layouts import LEVEL_1
+    from src.core.game import Game
+    from src.environment.maze import Maze
+
+BASELINE_PATH = ".benchmarks/baseline.json"
+SEED = 0
+QUERIES = 50            # Search queries per search measurement
+GAME_TICKS = 200        # Ticks per Game.update measurement
+MIN_SAMPLE_TIME = 0.05  # Seconds a single sample runs for (the loop count is calibrated to it)
+REFERENCE_LOOPS = 200000  # Iterations of the reference workload (about 20 ms)
+REL_TOLERANCE = 0.10    # Slowdowns below 10% never fail
+NOISE_FACTOR = 3.0      # ...nor below this many relative spreads (MAD / median) of either run
+
+Setup = Callable[[], Callable[[], None]]
+
+
+def quiet(fn):
+    """Run a setup step without the game's logging"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+def new_maze() -> Maze:
+    maze = Maze(MAZE_WIDTH, MAZE_HEIGHT)
+    maze.load_layout(LEVEL_1)
+    return maze
+
+
+def search_benchmark(make_algorithm, goals: int = 1) -> Setup:
+    def setup():
+        maze = quiet(new_maze)
+        algorithm = make_algorithm(maze)
+        cells = [(x, y) for y in range(maze.height) for x in range(maze.width)
+                 if maze.is_valid_position(x, y)]
+        rng = random.Random(SEED)
+        queries = [(rng.choice(cells), rng.sample(cells, goals)) for _ in range(QUERIES)]
+
+        def run():
+            for start, targets in queries:
+                algorithm.find_path(start, targets, maze)
+        return run
+    return setup
+
+
+def adaptive_planner(maze) -> CachedSearch:
+    """The planner behind a path cache, as Pacman uses it"""
+    planner = AdaptivePlanner()
+    planner.distances = BFSDistanceCache(maze)
+    return CachedSearch(planner)
+
+
+def maze_load() -> Callable[[], None]:
+    maze = quiet(new_maze)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze.ghost_starts = []
+            maze.load_layout(LEVEL_1)
+    return run
+
+
+def maze_queries() -> Callable[[], None]:
+    maze = quiet(new_maze)
+    cells = [(x, y) for y in range(-1, maze.height + 1) for x in range(-1, maze.width + 1)]
+
+    def run():
+        for x, y in cells:
+            maze.is_valid_position(x, y)
+            maze.get_cell_type(x, y)
+    return run
+
+
+def maze_pellets() -> Callable[[], None]:
+    maze = quiet(new_maze)
+    pellets = maze.pellet_positions()
+    bits = (maze.pellet_bits, maze.power_bits)
+
+    def run():
+        for x, y in pellets:
+            maze.eat_pellet(x, y)
+        maze.pellet_positions()
+        maze.restore_pellets(*bits)
+    return run
+
+
+def game_update() -> Callable[[], None]:
+    game = quiet(lambda: Game(headless=True, seed=SEED))
+    start = game.snapshot()
+
+    def run():
+        game.restore(start)
+        for _ in range(GAME_TICKS):
+            game.update()
+    return run
+
+
+def game_draw() -> Callable[[], None]:
+    game = quiet(lambda: Game(headless=True, seed=SEED))
+    quiet(lambda: game.simulate(120))  # Some pellets eaten, agents spread out
+
+    def run():
+        game.draw(0.5)
+    return run
+
+
+BENCHMARKS: Dict[str, Tuple[Setup, str]] = {
+    'search/bfs': (search_benchmark(lambda maze: BreadthFirstSearch()), f"{QUERIES} queries"),
+    'search/astar': (search_benchmark(lambda maze: AStarSearch()), f"{QUERIES} queries"),
+    'search/astar_cached': (search_benchmark(lambda maze: CachedSearch(AStarSearch())),
+                            f"{QUERIES} repeated queries"),
+    'search/ucs': (search_benchmark(lambda maze: UniformCostSearch()), f"{QUERIES} queries"),
+    'search/bidirectional_bfs': (search_benchmark(lambda maze: BidirectionalBFS()), f"{QUERIES} queries"),
+    'search/bidirectional_astar': (search_benchmark(lambda maze: BidirectionalAStar()), f"{QUERIES} queries"),
+    'search/multigoal_astar_8': (search_benchmark(lambda maze: MultiGoalAStarSearch(), goals=8),
+                                 f"{QUERIES} queries, 8 goals"),
+    'search/adaptive_8': (search_benchmark(adaptive_planner, goals=8), f"{QUERIES} queries, 8 goals"),
+    'maze/load_layout': (maze_load, "LEVEL_1"),
+    'maze/cell_queries': (maze_queries, "every cell and border"),
+    'maze/eat_pellets': (maze_pellets, "eat all, list, restore"),
+    'game/update': (game_update, f"{GAME_TICKS} ticks"),
+    'game/draw': (game_draw, "one frame"),
+}
+
+
+def reference_work():
+    """Fixed pure-Python workload timed next to every sample to track the machine's current speed"""
+    table = {}
+    total = 0
+    for i in range(REFERENCE_LOOPS):
+        table[i & 255] = total
+        total += (i * 7) % 13
+    return total
+
+
+def timed(fn, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number
+
+
+def measure(setup: Setup, warmup: int, repeat: int) -> Dict:
+    """
+    Seconds per run() call over `repeat` samples, after warmup. Each sample
+    is paired with a run of reference_work(), and `relative` (the median
+    ratio of the two) is what gets compared, so a machine that is busier or
+    clocked lower than during the baseline doesn't read as a regression.
+    """
+    run = setup()
+    start = time.perf_counter()
+    calls = 0
+    while calls < max(warmup, 1) or time.perf_counter() - start < MIN_SAMPLE_TIME:
+        run()
+        calls += 1
+    # Loop count that makes one sample last about MIN_SAMPLE_TIME
+    number = max(1, int(MIN_SAMPLE_TIME / ((time.perf_counter() - start) / calls)))
+    samples, ratios = [], []
+    gc.collect()
+    gc.disable()  # Like timeit: keep collector pauses out of the samples
+    try:
+        for _ in range(repeat):
+            reference = timed(reference_work, 1)
+            sample = timed(run, number)
+            samples.append(sample)
+            ratios.append(sample / reference)
+    finally:
+        gc.enable()
+    relative = statistics.median(ratios)
+    spread = statistics.median(abs(r - relative) for r in ratios)  # Median absolute deviation
+    return {'median': statistics.median(samples), 'min': min(samples), 'relative': relative,
+            'noise': spread / relative, 'repeat': repeat, 'number': number}
+
+
+def threshold(base: Dict, current: Dict) -> float:
+    """Relative slowdown a metric may show before it counts as a regression"""
+    return max(REL_TOLERANCE, NOISE_FACTOR * max(base['noise'], current['noise']))
+
+
+def compare(baseline: Dict, results: Dict) -> List[str]:
+    """Print a baseline/current table and return the regressed metrics"""
+    regressions = []
+    print(f"{'metric':<30}{'baseline us':>14}{'current us':>14}{'change':>10}{'allowed':>10}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<30}{'-':>14}{current['median'] * 1e6:>14.1f}{'new':>10}")
+            continue
+        change = current['relative'] / base['relative'] - 1
+        allowed = threshold(base, current)
+        status = ''
+        if change > allowed:
+            status = '  REGRESSION'
+            regressions.append(name)
+        elif change < -allowed:
+            status = '  faster'
+        print(f"{name:<30}{base['median'] * 1e6:>14.1f}{current['median'] * 1e6:>14.1f}"
+              f"{change:>+10.1%}{allowed:>10.1%}{status}")
+    print("(times are raw medians; change is measured relative to the reference workload)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths and check for regressions")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--only', help="Only run benchmarks whose name contains this")
+    parser.add_argument('--warmup', type=int, default=3, help="Unmeasured calls before sampling")
+    parser.add_argument('--repeat', type=int, default=9, help="Samples per benchmark")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (setup, description) in BENCHMARKS.items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(setup, args.warmup, args.repeat)
+        results[name]['description'] = description
+        print(f"{name:<30}{results[name]['median'] * 1e6:>12.1f} us  ({description})", file=sys.stderr)
+
+    path = Path(args.baseline)
+    if args.save or not path.exists():
+        stored = {}
+        if path.exists():
+            with open(path) as f:
+                stored = json.load(f)['results']
+        stored.update(results)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': stored}, f, indent=2)
+        print(f"Baseline saved to {path}")
+        return
+
+    with open(path) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(baseline, results)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+"""
+Build the navigation tables the web client loads instead of searching at
+runtime: one JSON file per LEVEL_* layout in src/config/maze_layouts.py,
+written to web/js/data/nav/ by default.
+"""
+import argparse
+
+from src.core.nav_export import NAV_TABLE_DIR, build_nav_tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export next-hop/distance tables for the web client")
+    parser.add_argument('--out', default=NAV_TABLE_DIR, help="Output directory")
+    args = parser.parse_args()
+    build_nav_tables(args.out)
+
+
+if __name__ == '__main__':
+    main()
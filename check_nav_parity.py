@@ -0,0 +1,83 @@
+"""
+Check that the web client and the Python agent make the same navigation
+choices: seeded random (start, goals) queries are answered by the Python
+DistanceOracle and, through node, by the client's NavTable/TableSearch and
+its runtime BFS. Exits non-zero on any mismatch.
+"""
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+
+from src.algorithms.distances import TableDistances
+from src.config.constants import DIRECTIONS
+from src.core.map_loader import LayoutArtifacts, compile_layout
+from src.core.nav_export import export_nav_table, layout_levels
+
+GOAL_COUNTS = [1, 1, 2, 4, 16]  # Goals per query, picked at random
+
+
+def python_answers(artifacts: LayoutArtifacts, queries):
+    """Nearest goal by wall-aware distance (first on ties) and the first move towards it"""
+    oracle = TableDistances(artifacts)
+    answers = []
+    for start, goals in queries:
+        best, best_distance = None, None
+        for goal in goals:
+            distance = oracle.distance(start, goal)
+            if distance >= 0 and (best_distance is None or distance < best_distance):
+                best, best_distance = goal, distance
+        path = oracle.path(start, best) if best is not None else []
+        move = DIRECTIONS.index((path[0][0] - start[0], path[0][1] - start[1])) if path else None
+        answers.append({'move': move, 'distance': len(path)})
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JS and Python navigation choices")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--queries', type=int, default=2000, help="Queries per level")
+    parser.add_argument('--node', default='node', help="Node.js executable")
+    args = parser.parse_args()
+
+    node = shutil.which(args.node)
+    if node is None:
+        sys.exit(f"{args.node} not found; Node.js is needed to run the web client code")
+
+    failures = 0
+    for level in layout_levels():
+        artifacts = LayoutArtifacts(compile_layout(level.layout))
+        cells = [tuple(cell) for cell in np.asarray(artifacts.cells).tolist()]
+        rng = random.Random(f"{args.seed}:{level.name}")
+        queries = [(rng.choice(cells), rng.sample(cells, rng.choice(GOAL_COUNTS)))
+                   for _ in range(args.queries)]
+
+        expected = python_answers(artifacts, queries)
+        request = {
+            'table': export_nav_table(level, artifacts),
+            'layout': level.layout,
+            'queries': [{'start': start, 'goals': goals} for start, goals in queries],
+        }
+        result = subprocess.run([node, '--experimental-default-type=module', 'web/tools/navParity.js'],
+                                input=json.dumps(request), capture_output=True, text=True)
+        if result.returncode != 0:
+            sys.exit(f"node failed:\n{result.stderr}")
+        actual = json.loads(result.stdout)
+
+        mismatches = [(query, want, got) for query, want, got in zip(queries, expected, actual)
+                      if (want['move'], want['distance']) != (got['move'], got['distance'])
+                      or got['bfsDistance'] != want['distance']]
+        failures += len(mismatches)
+        print(f"{level.name}: {len(queries) - len(mismatches)}/{len(queries)} queries agree")
+        for (start, goals), want, got in mismatches[:5]:
+            print(f"  start={start} goals={goals}: python={want} js={got}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
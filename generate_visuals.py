@@ -9,6 +9,10 @@ from matplotlib.patches import FancyBboxPatch, Circle
 import numpy as np
 import os
 
+from src.algorithms.search import AStarSearch
+from src.config.maze_layouts import LEVEL_1  # Render the actual level, not a copy
+from src.environment.maze import Maze
+
 BG = '#0d1117'
 CARD = '#161b22'
 BORDER = '#30363d'
@@ -26,29 +30,9 @@ plt.rcParams.update({
     'figure.facecolor': BG, 'text.color': TEXT, 'font.family': 'DejaVu Sans',
 })
 
-out = '/home/user/workspace/pacman_ai/assets/visuals'
+out = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'visuals')
 os.makedirs(out, exist_ok=True)
 
-# Actual LEVEL_1 from src/config/maze_layouts.py
-LEVEL_1 = [
-    "WWWWWWWWWWWWWWWWWWWW",
-    "W........W..........",
-    "W.WW.WWW.W.WWW.WW.W.",
-    "WoW....GG........oW.",
-    "W.W.WW.WWWW.WW.W.W..",
-    "W.....W....W.....W..",
-    "W.WWW.WWWW.WWW.W.W..",
-    "W.WWW.W....WWW.W.W..",
-    "W.....W..........W..",
-    "W.WWW.WSSSW.WWW.W...",
-    "W.....W....W.....W..",
-    "W.W.WW.WWWW.WW.W.W..",
-    "WoW....GG.....W..oW.",
-    "W.WW.WWW.W.WWW.WW.W.",
-    "W........W..........",
-    "WWWWWWWWWWWWWWWWWWW."
-]
-
 def make_hero():
     rows = len(LEVEL_1)
     cols = max(len(r) for r in LEVEL_1)
@@ -91,9 +75,11 @@ def make_hero():
                 gcolor = ghost_colors[gi % 4]
                 ax.add_patch(Circle((c, r), 0.35, facecolor=gcolor, edgecolor='none', alpha=0.8))
     
-    # Simulated A* path overlay
-    astar_path = [(8, 9), (8, 8), (7, 8), (6, 8), (5, 8), (5, 7), (5, 6), (5, 5),
-                  (4, 5), (3, 5), (3, 4), (3, 3)]
+    # A* path from Pacman's start to the nearest power pellet
+    maze = Maze(cols, rows)
+    maze.load_layout(LEVEL_1)
+    power_pellets = [(c, r) for r, row in enumerate(LEVEL_1) for c, ch in enumerate(row) if ch == 'o']
+    astar_path = [maze.pacman_start] + AStarSearch().find_path(maze.pacman_start, power_pellets, maze)
     for i, (c, r) in enumerate(astar_path):
         alpha = 0.3 + 0.5 * (i / len(astar_path))
         ax.add_patch(plt.Rectangle((c - 0.3, r - 0.3), 0.6, 0.6,
@@ -1,27 +1,86 @@
+import argparse
+import time
 import pygame
 from src.core.game import Game
+from src.config.constants import FPS, UNRENDERED_TICK_BATCH, SWARM_GHOST_COUNT
+from src.core.map_loader import MapLoader
+from src.core.quality import QUALITY_TIERS, QualityGovernor
+from src.algorithms.search_stats import SearchStats
+from src.utils.telemetry import Telemetry
+from src.config.settings import AgentSettings
 
 def main():
+    parser = argparse.ArgumentParser(description="PACMAN AI")
+    parser.add_argument('--turbo', type=int, default=0,
+                        help="Start in turbo mode at this many times game speed")
+    parser.add_argument('--no-render', action='store_true',
+                        help="Don't render frames while in turbo mode")
+    parser.add_argument('--level', help="Level file to play instead of LEVEL_1")
+    parser.add_argument('--swarm', type=int, nargs='?', const=SWARM_GHOST_COUNT,
+                        help="Swarm mode: play against this many ghosts")
+    parser.add_argument('--cooperative', action='store_true',
+                        help="Ghosts plan their hunt together (windowed cooperative A*)")
+    parser.add_argument('--search-stats', nargs='?', const='', metavar='JSON_PATH',
+                        help="Compare search algorithms on Pacman's queries; dump stats at game end")
+    parser.add_argument('--telemetry', metavar='DIR',
+                        help="Stream per-tick samples and game events to compressed segments in DIR")
+    parser.add_argument('--settings', metavar='JSON_PATH',
+                        help="Agent settings to play with (overrides, or a sweep.py ranking)")
+    parser.add_argument('--telemetry-format', choices=('jsonl', 'csv'), default='jsonl')
+    parser.add_argument('--minimap', action='store_true',
+                        help="Show a minimap of the whole maze (toggle with M; V switches the followed agent)")
+    parser.add_argument('--quality', type=int, choices=range(len(QUALITY_TIERS)), metavar='TIER',
+                        help="Pin the visual quality instead of adapting it to the frame time: "
+                             + ", ".join(f"{i}={name}" for i, name in enumerate(QUALITY_TIERS)))
+    args = parser.parse_args()
+
     pygame.init()
+
+    level = None
+    artifacts = None
+    if args.level:
+        loader = MapLoader()
+        level = loader.load_level(args.level)
+        artifacts = loader.artifacts(level)  # Compile or memory-map the layout cache
     
-    game = Game()
+    search_stats = SearchStats() if args.search_stats is not None else None
+    telemetry = Telemetry(args.telemetry, args.telemetry_format) if args.telemetry else None
+    game = Game(level=level, ghost_count=args.swarm, artifacts=artifacts,
+                cooperative=args.cooperative, search_stats=search_stats, telemetry=telemetry,
+                settings=AgentSettings.load(args.settings) if args.settings else None)
+    game.search_stats_path = args.search_stats or None
+    game.show_minimap = args.minimap
+    if args.quality is not None:
+        game.quality = QualityGovernor(pinned=args.quality)
+    if args.turbo > 1:
+        game.set_turbo(True, args.turbo)
+        game.render_enabled = not args.no_render
     clock = pygame.time.Clock()
     running = True
     
     while running:
         # Handle events
         running = game.handle_events()
+
+        if not game.render_enabled and not game.is_game_over:
+            # Rendering off: simulate flat out, polling events between batches
+            game.simulate(UNRENDERED_TICK_BATCH)
+            clock.tick()
+            continue
         
-        # Update game state
-        game.update()
-        
-        # Draw frame
-        game.draw()
+        # Run as many fixed simulation ticks as the elapsed frame time covers
+        frame_time = clock.tick(FPS) / 1000.0
+        frame_start = time.perf_counter()
+        for _ in range(game.clock.advance(frame_time)):
+            game.update()
         
-        # Control frame rate
-        clock.tick(60)
+        # Draw frame, interpolated between the last two ticks
+        game.draw(game.clock.alpha)
+        game.quality.record(time.perf_counter() - frame_start)
     
+    if telemetry is not None:
+        telemetry.close()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
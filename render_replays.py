@@ -0,0 +1,55 @@
+"""
+Render recorded or freshly simulated headless games offline, without a
+display: PNG sequences, or GIF/MP4 clips when ffmpeg is available.
+
+    python render_replays.py replays/*.npz --out clips --format mp4
+    python render_replays.py --games 20 --seed 7 --out clips --format gif --stride 2
+"""
+import argparse
+import os
+from pathlib import Path
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from src.core.game import Game
+from src.utils.replay import Replay, ReplayRecorder
+from src.utils.visualization import render_replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render replays to PNG sequences, GIFs or MP4s")
+    parser.add_argument('replays', nargs='*', help="Replay .npz files to render")
+    parser.add_argument('--games', type=int, default=0, help="Also simulate and render this many headless games")
+    parser.add_argument('--seed', type=int, default=0, help="Seeds the simulated games")
+    parser.add_argument('--max-ticks', type=int, default=20000, help="Tick limit of simulated games")
+    parser.add_argument('--record-every', type=int, default=1, help="Ticks between recorded frames")
+    parser.add_argument('--save-replays', action='store_true', help="Keep simulated games as .npz replays")
+    parser.add_argument('--out', default='renders', help="Output directory")
+    parser.add_argument('--format', choices=('png', 'gif', 'mp4'), default='png')
+    parser.add_argument('--stride', type=int, default=1, help="Render every n-th recorded frame")
+    parser.add_argument('--downscale', type=int, default=1, help="Integer downscale factor")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = [(Path(path).stem, lambda path=path: Replay.load(path)) for path in args.replays]
+    for index in range(args.games):
+        def simulate(seed=args.seed * 100003 + index):
+            game = Game(headless=True, seed=seed)
+            return ReplayRecorder(game).record(args.max_ticks, args.record_every)
+        jobs.append((f"game_{index:05d}", simulate))
+
+    for name, load in jobs:
+        replay = load()
+        if args.save_replays and name.startswith('game_'):
+            replay.save(out_dir / f"{name}.npz")
+        target = out_dir / (name if args.format == 'png' else f"{name}.{args.format}")
+        count = render_replay(replay, target, args.stride, args.processes, args.downscale, args.record_every)
+        print(f"{name}: {count} frames -> {target}")
+
+
+if __name__ == '__main__':
+    main()
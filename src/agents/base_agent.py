@@ -3,10 +3,24 @@ from typing import Tuple, List
 from ..config.constants import Direction, CellType
 
 class BaseAgent(ABC):
+    __slots__ = ()
+
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.direction = Direction.RIGHT
 
     def get_position(self) -> Tuple[int, int]:
-        return (int(round(self.x)), int(round(self.y)))
\ No newline at end of file
+        return (int(round(self.x)), int(round(self.y)))
+
+    def save_position(self):
+        """Remember the position at the start of a simulation tick"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def interpolated_position(self, alpha: float) -> Tuple[float, float]:
+        """Position between the previous and current tick for rendering"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
@@ -1,30 +1,82 @@
 import pygame
-import random
-import math
-from typing import Tuple, List
+import numpy as np
+from typing import Optional, Tuple, List
 from ..config.constants import Direction, CELL_SIZE, GHOST_SPEED, CellType
+from .base_agent import BaseAgent
+from .ghost_store import (GhostStore, DIRECTION_ORDER, DIRECTION_INDEX, NO_DIRECTION,
+                          SCATTER_DURATION)
+
+
+def _slot_property(field: str, convert=None, doc: str = ""):
+    """Property reading and writing one element of a GhostStore array"""
+    def getter(self):
+        value = getattr(self.store, field)[self.index]
+        return convert(value) if convert else value.item()
+
+    def setter(self, value):
+        getattr(self.store, field)[self.index] = value
+
+    return property(getter, setter, doc=doc)
+
+
+class GhostAgent(BaseAgent):
+    """View onto one slot of a GhostStore (standalone ghosts get a private store)"""
+    __slots__ = ('store', 'index')
+
+    frightened_color = (0, 0, 255)  # Blue when frightened
+
+    def __init__(self, x: int, y: int, color: Tuple[int, int, int],
+                 store: Optional[GhostStore] = None):
+        self.store = store if store is not None else GhostStore(capacity=1)
+        self.index = self.store.add(float(x), float(y), color)
+
+    x = _slot_property('x')
+    y = _slot_property('y')
+    prev_x = _slot_property('prev_x')
+    prev_y = _slot_property('prev_y')
+    is_frightened = _slot_property('is_frightened')
+    frightened_timer = _slot_property('frightened_timer')
+    speed = _slot_property('speed')
+    scatter_mode = _slot_property('scatter_mode')
+    scatter_timer = _slot_property('scatter_timer')
+    stuck_counter = _slot_property('stuck_counter')
+    direction_change_cooldown = _slot_property('cooldown')
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        return tuple(self.store.color[self.index].tolist())
+
+    @color.setter
+    def color(self, value: Tuple[int, int, int]):
+        self.store.color[self.index] = value
+
+    @property
+    def direction(self) -> Direction:
+        return DIRECTION_ORDER[self.store.direction[self.index]]
+
+    @direction.setter
+    def direction(self, value: Direction):
+        self.store.direction[self.index] = DIRECTION_INDEX[value]
+
+    @property
+    def last_valid_direction(self) -> Optional[Direction]:
+        value = self.store.last_valid_direction[self.index]
+        return None if value == NO_DIRECTION else DIRECTION_ORDER[value]
+
+    @property
+    def home_corner(self) -> Optional[Tuple[int, int]]:
+        if not self.store.has_home[self.index]:
+            return None
+        return (int(self.store.home_x[self.index]), int(self.store.home_y[self.index]))
+
+    @property
+    def last_position(self) -> Tuple[int, int]:
+        return (int(self.store.last_cell_x[self.index]), int(self.store.last_cell_y[self.index]))
 
-class GhostAgent:
-    def __init__(self, x: int, y: int, color: Tuple[int, int, int]):
-        self.x = float(x)
-        self.y = float(y)
-        self.color = color
-        self.direction = Direction.RIGHT
-        self.is_frightened = False
-        self.frightened_timer = 0
-        self.frightened_color = (0, 0, 255)  # Blue when frightened
-        self.speed = GHOST_SPEED
-        self.scatter_mode = False
-        self.scatter_timer = 0
-        self.home_corner = None
-        self.stuck_counter = 0
-        self.last_position = (x, y)
-        self.direction_change_cooldown = 0
-        self.last_valid_direction = None
-        
     def set_home_corner(self, corner: Tuple[int, int]):
         """Set the ghost's home corner for scatter mode"""
-        self.home_corner = corner
+        self.store.home_x[self.index], self.store.home_y[self.index] = corner
+        self.store.has_home[self.index] = True
     
     def get_valid_moves(self, maze, exclude_reverse: bool = True) -> List[Direction]:
         """Get list of valid directions from current position"""
@@ -52,130 +104,25 @@ class GhostAgent:
         """Check if two directions are opposite"""
         return (dir1.value[0] == -dir2.value[0] and 
                 dir1.value[1] == -dir2.value[1])
-    
-    def _distance_to_target(self, x: int, y: int, target: Tuple[int, int]) -> float:
-        """Calculate Manhattan distance to target"""
-        return abs(x - target[0]) + abs(y - target[1])
-    
-    def choose_direction(self, maze, pacman_pos: Tuple[int, int]) -> Direction:
-        """Choose next direction based on current mode and target"""
-        current_x = int(round(self.x))
-        current_y = int(round(self.y))
-        current_pos = (current_x, current_y)
-        
-        # If movement is locked, continue in current direction if possible
-        if self.direction_change_cooldown > 0:
-            self.direction_change_cooldown -= 1
-            if maze.is_valid_position(current_x + self.direction.value[0], 
-                                    current_y + self.direction.value[1]):
-                return self.direction
-        
-        # Get valid moves
-        valid_moves = self.get_valid_moves(maze)
-        if not valid_moves:
-            return self.direction
-            
-        # If frightened, move randomly but smartly
-        if self.is_frightened:
-            # Prefer moves that lead away from Pacman
-            safe_moves = []
-            for move in valid_moves:
-                next_x = current_x + move.value[0]
-                next_y = current_y + move.value[1]
-                if self._distance_to_target(next_x, next_y, pacman_pos) > 3:
-                    safe_moves.append(move)
-            
-            if safe_moves:
-                self.direction = random.choice(safe_moves)
-            else:
-                self.direction = random.choice(valid_moves)
-            
-            self.direction_change_cooldown = 2
-            return self.direction
-        
-        # Choose target based on mode
-        target = self.home_corner if self.scatter_mode else pacman_pos
-        
-        # Calculate distances to target for each valid move
-        move_scores = []
-        for move in valid_moves:
-            next_x = current_x + move.value[0]
-            next_y = current_y + move.value[1]
-            
-            # Base score on distance to target
-            score = -self._distance_to_target(next_x, next_y, target)
-            
-            # Prefer continuing in same direction (reduce jitter)
-            if move == self.direction:
-                score += 0.5
-                
-            # Avoid going back and forth
-            if self.last_valid_direction and self._is_opposite_direction(move, self.last_valid_direction):
-                score -= 1
-                
-            move_scores.append((score, move))
-        
-        # Choose best move
-        self.direction = max(move_scores, key=lambda x: x[0])[1]
-        self.last_valid_direction = self.direction
-        self.direction_change_cooldown = 2
-        
-        return self.direction
-    
+
     def update(self, maze, pacman_pos: Tuple[int, int]):
-        """Update ghost position and state"""
-        # Update timers
-        if self.is_frightened:
-            self.frightened_timer -= 1
-            if self.frightened_timer <= 0:
-                self.is_frightened = False
-                self.speed = GHOST_SPEED
-        
-        if self.scatter_mode:
-            self.scatter_timer -= 1
-            if self.scatter_timer <= 0:
-                self.scatter_mode = False
-        
-        # Check if stuck
-        current_pos = (int(round(self.x)), int(round(self.y)))
-        if current_pos == self.last_position:
-            self.stuck_counter += 1
-            if self.stuck_counter > 5:  # If stuck for too long
-                valid_moves = self.get_valid_moves(maze, exclude_reverse=False)
-                if valid_moves:
-                    self.direction = random.choice(valid_moves)
-                self.stuck_counter = 0
-        else:
-            self.stuck_counter = 0
-        self.last_position = current_pos
-        
-        # Choose new direction
-        self.direction = self.choose_direction(maze, pacman_pos)
-        
-        # Update position
-        next_x = self.x + self.direction.value[0] * self.speed
-        next_y = self.y + self.direction.value[1] * self.speed
-        
-        # Check if move is valid
-        if maze.is_valid_position(int(round(next_x)), int(round(next_y))):
-            self.x = next_x
-            self.y = next_y
+        """Update ghost position and state (see GhostStore.update)"""
+        self.store.update(maze, pacman_pos, np.array([self.index]))
     
     def make_frightened(self):
         """Make ghost frightened"""
-        self.is_frightened = True
-        self.frightened_timer = 600  # 10 seconds
-        self.speed = GHOST_SPEED * 0.5  # Slower when frightened
+        self.store.frighten([self.index])
     
     def enter_scatter_mode(self):
         """Enter scatter mode"""
         self.scatter_mode = True
-        self.scatter_timer = 420  # 7 seconds
+        self.scatter_timer = SCATTER_DURATION
     
-    def draw(self, screen, offset_y=0):
-        """Draw ghost with vertical offset"""
-        center_x = int(self.x * CELL_SIZE + CELL_SIZE // 2)
-        center_y = int(self.y * CELL_SIZE + CELL_SIZE // 2) + offset_y
+    def draw(self, screen, offset_y=0, alpha=1.0, offset_x=0):
+        """Draw ghost with a pixel offset, interpolated `alpha` of the way into the last tick"""
+        x, y = self.interpolated_position(alpha)
+        center_x = int(x * CELL_SIZE + CELL_SIZE // 2) + offset_x
+        center_y = int(y * CELL_SIZE + CELL_SIZE // 2) + offset_y
         
         color = self.frightened_color if self.is_frightened else self.color
         
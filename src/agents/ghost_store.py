@@ -0,0 +1,262 @@
+import numpy as np
+from typing import List, Optional, Tuple
+from ..config.constants import Direction, GHOST_SPEED
+from ..config.settings import AgentSettings
+
+# Direction <-> index into the per-ghost direction array (Direction enum order)
+DIRECTION_ORDER = list(Direction)
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTION_ORDER)}
+DIR_DX = np.array([d.value[0] for d in DIRECTION_ORDER], dtype=np.int32)
+DIR_DY = np.array([d.value[1] for d in DIRECTION_ORDER], dtype=np.int32)
+OPPOSITE = np.array([DIRECTION_INDEX[Direction((-d.value[0], -d.value[1]))]
+                     for d in DIRECTION_ORDER], dtype=np.int8)
+NO_DIRECTION = -1
+
+SCATTER_DURATION = 420     # 7 seconds
+FRIGHTENED_SPEED_FACTOR = 0.5
+
+
+def walkable_at(walkable: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Vectorized Maze.is_valid_position over integer cell arrays"""
+    height, width = walkable.shape
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    result = np.zeros(xs.shape, dtype=bool)
+    result[inside] = walkable[ys[inside], xs[inside]]
+    return result
+
+
+class GhostStore:
+    """
+    Ghost state held as contiguous arrays (one slot per ghost). GhostAgent
+    objects are thin views onto a slot; updates run over the arrays for all
+    ghosts at once. Behaviour parameters come from an AgentSettings.
+    """
+    FIELDS = {
+        'x': np.float64, 'y': np.float64,
+        'prev_x': np.float64, 'prev_y': np.float64,
+        'direction': np.int8, 'last_valid_direction': np.int8,
+        'is_frightened': bool, 'frightened_timer': np.int32,
+        'speed': np.float64,
+        'scatter_mode': bool, 'scatter_timer': np.int32,
+        'home_x': np.int32, 'home_y': np.int32, 'has_home': bool,
+        'stuck_counter': np.int32, 'last_cell_x': np.int32, 'last_cell_y': np.int32,
+        'cooldown': np.int32,
+        'planned_direction': np.int8,
+    }
+
+    # One record per ghost holding every field, for snapshots
+    STATE_DTYPE = np.dtype(list(FIELDS.items()))
+
+    def __init__(self, capacity: int = 4, seed: Optional[int] = None,
+                 settings: Optional[AgentSettings] = None):
+        self.settings = settings if settings is not None else AgentSettings()
+        self.count = 0
+        self.capacity = max(1, capacity)
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+        self.color = np.zeros((self.capacity, 3), dtype=np.uint8)
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in list(self.FIELDS) + ['color']:
+            old = getattr(self, name)
+            new = np.zeros((self.capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, x: float, y: float, color: Tuple[int, int, int]) -> int:
+        """Allocate a slot for a new ghost and return its index"""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.count += 1
+        for name in self.FIELDS:
+            getattr(self, name)[i] = 0
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.color[i] = color
+        self.direction[i] = DIRECTION_INDEX[Direction.RIGHT]
+        self.last_valid_direction[i] = NO_DIRECTION
+        self.planned_direction[i] = NO_DIRECTION
+        self.speed[i] = GHOST_SPEED
+        self.last_cell_x[i] = int(x)
+        self.last_cell_y[i] = int(y)
+        return i
+
+    def spawn(self, x: float, y: float, color: Tuple[int, int, int]) -> 'GhostAgent':
+        """Add a ghost and return a view onto it"""
+        from .ghost import GhostAgent
+        return GhostAgent(x, y, color, store=self)
+
+    def snapshot(self) -> Tuple[np.ndarray, dict]:
+        """Read-only copy of every ghost's fields plus the RNG state"""
+        n = self.count
+        record = np.empty(n, dtype=self.STATE_DTYPE)
+        for name in self.FIELDS:
+            record[name] = getattr(self, name)[:n]
+        record.flags.writeable = False
+        return record, self.rng.bit_generator.state
+
+    def restore(self, state: Tuple[np.ndarray, dict]):
+        """Put the ghosts back to a snapshot taken from this store"""
+        record, rng_state = state
+        if len(record) != self.count:
+            raise ValueError(f"Snapshot has {len(record)} ghosts, the store has {self.count}")
+        for name in self.FIELDS:
+            getattr(self, name)[:self.count] = record[name]
+        self.rng.bit_generator.state = rng_state
+
+    def cells(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Rounded cell coordinates of every ghost"""
+        n = self.count
+        return (np.rint(self.x[:n]).astype(np.int32),
+                np.rint(self.y[:n]).astype(np.int32))
+
+    def positions(self) -> List[Tuple[int, int]]:
+        """Rounded cell positions as a list of tuples"""
+        xs, ys = self.cells()
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def save_positions(self):
+        """Remember tick-start positions for interpolated rendering"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def frighten(self, idx):
+        self.is_frightened[idx] = True
+        self.frightened_timer[idx] = self.settings.frightened_duration
+        self.speed[idx] = GHOST_SPEED * FRIGHTENED_SPEED_FACTOR
+
+    def teleport(self, idx, pos: Tuple[int, int]):
+        """Move ghosts to a cell without interpolating across the jump"""
+        self.x[idx] = self.prev_x[idx] = pos[0]
+        self.y[idx] = self.prev_y[idx] = pos[1]
+
+    def _random_choice(self, mask: np.ndarray) -> np.ndarray:
+        """Pick a uniformly random True column per row (rows must have at least one)"""
+        weights = self.rng.random(mask.shape) * mask
+        return np.argmax(weights, axis=1).astype(np.int8)
+
+    def update(self, maze, pacman_pos: Tuple[int, int], idx: Optional[np.ndarray] = None):
+        """Advance the given ghosts (all by default) by one tick"""
+        if idx is None:
+            idx = np.arange(self.count)
+        if len(idx) == 0:
+            return
+        walkable = maze.walkable
+        settings = self.settings
+        cooldown_ticks = settings.direction_change_cooldown
+
+        # Update timers
+        frightened = self.is_frightened[idx]
+        timer = self.frightened_timer[idx] - frightened
+        expired = frightened & (timer <= 0)
+        frightened = frightened & ~expired
+        self.frightened_timer[idx] = timer
+        self.is_frightened[idx] = frightened
+        speed = np.where(expired, GHOST_SPEED, self.speed[idx])
+
+        scatter = self.scatter_mode[idx]
+        scatter_timer = self.scatter_timer[idx] - scatter
+        scatter = scatter & (scatter_timer > 0)
+        self.scatter_timer[idx] = scatter_timer
+        self.scatter_mode[idx] = scatter
+
+        x, y = self.x[idx], self.y[idx]
+        cx = np.rint(x).astype(np.int32)
+        cy = np.rint(y).astype(np.int32)
+        direction = self.direction[idx].copy()
+
+        # Valid moves from the current cell in each direction (N, 4)
+        open_moves = walkable_at(walkable, cx[:, None] + DIR_DX, cy[:, None] + DIR_DY)
+        any_open = open_moves.any(axis=1)
+
+        # Check if stuck
+        stuck = (cx == self.last_cell_x[idx]) & (cy == self.last_cell_y[idx])
+        stuck_counter = np.where(stuck, self.stuck_counter[idx] + 1, 0)
+        unstick = stuck_counter > settings.stuck_limit
+        if unstick.any():
+            rows = unstick & any_open
+            direction[rows] = self._random_choice(open_moves[rows])
+            stuck_counter[unstick] = 0
+        self.stuck_counter[idx] = stuck_counter
+        self.last_cell_x[idx] = cx
+        self.last_cell_y[idx] = cy
+
+        # If movement is locked, continue in current direction if possible
+        cooldown = self.cooldown[idx]
+        locked = cooldown > 0
+        cooldown = np.where(locked, cooldown - 1, cooldown)
+        rows = np.arange(len(idx))
+        keep = locked & open_moves[rows, direction]
+
+        # Hunting ghosts steered by a cooperative plan take the planned move
+        planned = self.planned_direction[idx]
+        steered = (planned != NO_DIRECTION) & ~frightened & ~scatter
+        steered &= open_moves[rows, np.maximum(planned, 0)]
+        keep &= ~steered
+
+        # Valid moves, excluding reversal unless it's the only way out
+        valid = open_moves.copy()
+        valid[rows, OPPOSITE[direction]] = False
+        dead_end = ~valid.any(axis=1)
+        valid[dead_end] = open_moves[dead_end]
+        choose = ~keep & ~steered & valid.any(axis=1)
+        last_valid = self.last_valid_direction[idx]
+        if steered.any():
+            direction[steered] = planned[steered]
+            last_valid[steered] = planned[steered]
+            cooldown[steered] = cooldown_ticks
+
+        # Frightened: random move, preferring ones that lead away from Pacman
+        scared = choose & frightened
+        if scared.any():
+            next_x = cx[scared, None] + DIR_DX
+            next_y = cy[scared, None] + DIR_DY
+            distance = np.abs(next_x - pacman_pos[0]) + np.abs(next_y - pacman_pos[1])
+            options = valid[scared]
+            safe = options & (distance > settings.frightened_safe_distance)
+            has_safe = safe.any(axis=1)
+            options[has_safe] = safe[has_safe]
+            direction[scared] = self._random_choice(options)
+            cooldown[scared] = cooldown_ticks
+
+        # Chase or scatter: score each move by distance to target
+        hunting = choose & ~frightened
+        if hunting.any():
+            use_home = scatter[hunting] & self.has_home[idx][hunting]
+            target_x = np.where(use_home, self.home_x[idx][hunting], pacman_pos[0])
+            target_y = np.where(use_home, self.home_y[idx][hunting], pacman_pos[1])
+            next_x = cx[hunting, None] + DIR_DX
+            next_y = cy[hunting, None] + DIR_DY
+            score = -(np.abs(next_x - target_x[:, None]) +
+                      np.abs(next_y - target_y[:, None])).astype(np.float64)
+            current = direction[hunting]
+            hunt_rows = np.arange(len(current))
+            score[hunt_rows, current] += settings.same_direction_bonus
+            last = last_valid[hunting]
+            has_last = last != NO_DIRECTION
+            score[hunt_rows[has_last], OPPOSITE[last[has_last]]] -= settings.reversal_penalty
+            score[~valid[hunting]] = -np.inf
+            best = np.argmax(score, axis=1).astype(np.int8)
+            direction[hunting] = best
+            last_valid[hunting] = best
+            cooldown[hunting] = cooldown_ticks
+
+        self.direction[idx] = direction
+        self.last_valid_direction[idx] = last_valid
+        self.cooldown[idx] = cooldown
+        self.speed[idx] = speed
+
+        # Update position if the move is valid
+        next_x = x + DIR_DX[direction] * speed
+        next_y = y + DIR_DY[direction] * speed
+        moved = walkable_at(walkable, np.rint(next_x).astype(np.int32),
+                            np.rint(next_y).astype(np.int32))
+        self.x[idx] = np.where(moved, next_x, x)
+        self.y[idx] = np.where(moved, next_y, y)
@@ -1,14 +1,35 @@
 import random
 import pygame
 import math
-from typing import Tuple, List
+from operator import attrgetter
+from typing import Dict, Optional, Tuple, List
 from ..config.constants import Direction, CELL_SIZE, PACMAN_SPEED, CellType
+from ..config.settings import AgentSettings
 from .base_agent import BaseAgent
-from ..algorithms.search import AStarSearch, BreadthFirstSearch, UniformCostSearch
+from ..algorithms.search import SearchAlgorithm
+from ..algorithms.adaptive import AdaptivePlanner
+from ..algorithms.path_cache import CachedSearch
+from ..algorithms.distances import BFSDistanceCache
+from ..algorithms.tour import TourPlanner
+from ..algorithms.dstar_lite import DStarLite
+from ..core.events import POWER_START, POWER_END, TARGET_SELECTED
+
+GHOST_COST_RADIUS = 8  # Only ghosts this close to Pacman make cells costlier
+GHOST_CELL_COSTS = {0: 20, 1: 8, 2: 3}  # Extra cost of a cell by its distance to a ghost
 
 class PacmanAgent(BaseAgent):
-    def __init__(self, x: int, y: int):
+    # Plain attributes saved by snapshot(), besides the path and the tour
+    SNAPSHOT_FIELDS = ('x', 'y', 'prev_x', 'prev_y', 'cell', 'direction', 'score',
+                       'is_powered_up', 'power_timer', 'mouth_angle', 'opening_mouth',
+                       'autonomous_mode', 'stuck_timer', 'last_position', 'no_movement_counter',
+                       'current_target', '_detoured')
+    _get_snapshot_fields = attrgetter(*SNAPSHOT_FIELDS)
+
+    def __init__(self, x: int, y: int, settings: Optional[AgentSettings] = None):
         super().__init__(x, y)
+        self.settings = settings if settings is not None else AgentSettings()
+        self.cell = (int(round(x)), int(round(y)))  # Rounded position, updated as Pacman moves
+        self.events = None  # EventBus for power-ups and AI targets, set by the game
         self.score = 0
         self.is_powered_up = False
         self.power_timer = 0
@@ -18,11 +39,19 @@ class PacmanAgent(BaseAgent):
         
         # AI components
         self.current_path = []
-        self.search_algorithm = AStarSearch()
+        self.planner = AdaptivePlanner()  # Cheapest strategy per query
+        self.search_algorithm = CachedSearch(self.planner)  # Pacman's path queries (the game shares the cache)
+        self.shadow_searches: List[SearchAlgorithm] = []  # Replay each new target's query (search stats)
         self.autonomous_mode = True
         self.stuck_timer = 0
         self.last_position = (x, y)
         self.no_movement_counter = 0
+        self.ghost_index = None  # SpatialIndex of ghost cells, set by the game
+        self.distances = None    # DistanceOracle for the maze, set by the game
+        self.tour_planner = None
+        self.current_target = None
+        self.replanner = None    # Persistent DStarLite planner towards current_target
+        self._detoured = False
         
         # Colors
         self.YELLOW = (255, 255, 0)
@@ -67,48 +96,57 @@ class PacmanAgent(BaseAgent):
         current_pos = (int(round(self.x)), int(round(self.y)))
         
         # Check if we're in danger (too close to ghosts)
-        in_danger = False
-        for ghost_pos in ghost_positions:
-            distance = abs(current_pos[0] - ghost_pos[0]) + abs(current_pos[1] - ghost_pos[1])
-            if distance < 3:  # Danger threshold
-                in_danger = True
-                break
+        in_danger = self._ghost_within(current_pos, self.settings.danger_radius, ghost_positions)
         
         # If in danger, focus on escaping
         if in_danger and not self.is_powered_up:
-            # Find direction that maximizes distance from all ghosts
+            # The closest ghost to any neighbour is within danger_radius + 2 cells of us when in danger
+            if self.ghost_index is not None:
+                ghost_positions = [cell for _, cell in
+                                   self.ghost_index.within(current_pos, self.settings.danger_radius + 2)]
+
+            # Find direction that maximizes distance from all ghosts, without
+            # running deeper into a dead-end branch unless there's no other way
             best_direction = self.direction
             max_min_distance = -1
+            moves = [direction for direction in [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]
+                     if maze.is_valid_position(current_pos[0] + direction.value[0],
+                                               current_pos[1] + direction.value[1])]
+            topology = maze.topology
+            if topology is not None:
+                depth = topology.depth(current_pos)
+                open_moves = [direction for direction in moves
+                              if topology.depth((current_pos[0] + direction.value[0],
+                                                 current_pos[1] + direction.value[1])) <= depth]
+                moves = open_moves or moves
             
-            for direction in [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]:
+            for direction in moves:
                 next_x = current_pos[0] + direction.value[0]
                 next_y = current_pos[1] + direction.value[1]
                 
-                if maze.is_valid_position(next_x, next_y):
-                    # Calculate minimum distance to any ghost from this position
-                    min_ghost_distance = min(
-                        abs(next_x - gx) + abs(next_y - gy)
-                        for gx, gy in ghost_positions
-                    )
-                    
-                    if min_ghost_distance > max_min_distance:
-                        max_min_distance = min_ghost_distance
-                        best_direction = direction
+                # Calculate minimum distance to any ghost from this position
+                min_ghost_distance = min(
+                    abs(next_x - gx) + abs(next_y - gy)
+                    for gx, gy in ghost_positions
+                )
+                
+                if min_ghost_distance > max_min_distance:
+                    max_min_distance = min_ghost_distance
+                    best_direction = direction
             
             self.current_path = []  # Clear current path when in danger
+            self._detoured = True
             return best_direction
         
-        # Normal pathfinding to pellets when safe
+        # Normal pathfinding to pellets when safe: follow the pellet tour
         if not self.current_path or self._is_near_target():
-            pellets = self.get_pellet_positions(maze)
-            if pellets:
-                # Find the safest pellet to target
-                safest_pellet = max(pellets, key=lambda p: min(
-                    abs(p[0] - gx) + abs(p[1] - gy)
-                    for gx, gy in ghost_positions
-                ))
-                self.current_path = self.search_algorithm.find_path(
-                    current_pos, [safest_pellet], maze)
+            target = self._next_tour_target(maze, current_pos, ghost_positions)
+            if target != self.current_target and target is not None:
+                self._emit(TARGET_SELECTED, target=target, cell=current_pos)
+            self.current_target = target
+
+        # Repair the route to the target around nearby ghosts every tick
+        self.current_path = self._route_to_target(maze, current_pos, ghost_positions)
         
         # If we have a path, follow it
         if self.current_path:
@@ -121,6 +159,18 @@ class PacmanAgent(BaseAgent):
             else:
                 return Direction.DOWN if dy > 0 else Direction.UP
         
+        # No tour target (every pellet's approach is blocked): head for the nearest safe pellet
+        safe_pellets = [p for p in maze.pellet_positions()
+                        if not self._ghost_within(p, self.settings.safe_radius, ghost_positions)]
+        if safe_pellets:
+            self.current_path = self.search_algorithm.find_path(current_pos, safe_pellets, maze)
+            if self.current_path:
+                dx = self.current_path[0][0] - self.x
+                dy = self.current_path[0][1] - self.y
+                if abs(dx) > abs(dy):
+                    return Direction.RIGHT if dx > 0 else Direction.LEFT
+                return Direction.DOWN if dy > 0 else Direction.UP
+
         # If no path, find a safe direction
         valid_directions = []
         for direction in [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]:
@@ -128,11 +178,7 @@ class PacmanAgent(BaseAgent):
             next_y = current_pos[1] + direction.value[1]
             if maze.is_valid_position(next_x, next_y):
                 # Check if this direction is safe from ghosts
-                min_ghost_distance = min(
-                    abs(next_x - gx) + abs(next_y - gy)
-                    for gx, gy in ghost_positions
-                )
-                if min_ghost_distance >= 2:  # Safe distance threshold
+                if not self._ghost_within((next_x, next_y), self.settings.safe_radius, ghost_positions):
                     valid_directions.append(direction)
         
         if valid_directions:
@@ -153,6 +199,70 @@ class PacmanAgent(BaseAgent):
                 
         return self.direction
     
+    def _next_tour_target(self, maze, current_pos: Tuple[int, int],
+                          ghost_positions: List[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+        """Next pellet of the tour whose approach isn't blocked by a ghost"""
+        if self.tour_planner is None:
+            if self.distances is None:
+                self.distances = BFSDistanceCache(maze)
+            self.tour_planner = TourPlanner(self.distances)
+
+        def is_blocked(pellet: Tuple[int, int]) -> bool:
+            if self.is_powered_up:
+                return False
+            lookahead = self.search_algorithm.find_path(current_pos, [pellet], maze)[:self.settings.block_lookahead]
+            return any(self._ghost_within(cell, self.settings.safe_radius, ghost_positions)
+                       for cell in lookahead)
+
+        target = self.tour_planner.next_target(current_pos, maze, is_blocked, self._detoured)
+        self._detoured = False
+        if target is not None:
+            for algorithm in self.shadow_searches:
+                algorithm.find_path(current_pos, [target], maze)
+        return target
+
+    def _ghost_costs(self, current_pos: Tuple[int, int],
+                     ghost_positions: List[Tuple[int, int]]) -> Dict[Tuple[int, int], float]:
+        """Extra cost of cells around the ghosts near Pacman"""
+        if self.is_powered_up:
+            return {}
+        if self.ghost_index is not None:
+            nearby = {cell for _, cell in self.ghost_index.within(current_pos, GHOST_COST_RADIUS)}
+        else:
+            nearby = {g for g in ghost_positions
+                      if abs(g[0] - current_pos[0]) + abs(g[1] - current_pos[1]) <= GHOST_COST_RADIUS}
+        costs = {}
+        for gx, gy in nearby:
+            for dy in range(-2, 3):
+                for dx in range(-2 + abs(dy), 3 - abs(dy)):
+                    cell = (gx + dx, gy + dy)
+                    cost = GHOST_CELL_COSTS[abs(dx) + abs(dy)]
+                    if costs.get(cell, 0) < cost:
+                        costs[cell] = cost
+        return costs
+
+    def _route_to_target(self, maze, current_pos: Tuple[int, int],
+                         ghost_positions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Incrementally replanned path to the current target, avoiding cells near ghosts"""
+        if self.current_target is None:
+            return []
+        if self.replanner is None or self.replanner.maze is not maze:
+            self.replanner = DStarLite(maze)
+        path = self.replanner.plan(current_pos, self.current_target,
+                                   self._ghost_costs(current_pos, ghost_positions))
+        # Rounded onto the target but not there yet: finish moving onto it
+        if not path and math.hypot(self.x - current_pos[0], self.y - current_pos[1]) >= 0.3:
+            path.insert(0, current_pos)
+        return path
+
+    def _ghost_within(self, pos: Tuple[int, int], radius: int,
+                      ghost_positions: List[Tuple[int, int]]) -> bool:
+        """Whether a ghost is within Manhattan distance `radius` of pos"""
+        if self.ghost_index is not None:
+            return self.ghost_index.any_within(pos, radius)
+        return any(abs(pos[0] - gx) + abs(pos[1] - gy) <= radius
+                   for gx, gy in ghost_positions)
+
     def _is_near_target(self) -> bool:
         """Check if Pacman is near the next target in the path"""
         if not self.current_path:
@@ -162,6 +272,16 @@ class PacmanAgent(BaseAgent):
         distance = math.sqrt((self.x - target[0])**2 + (self.y - target[1])**2)
         return distance < 0.3  # Increased threshold
     
+    def _emit(self, kind: str, **payload):
+        if self.events is not None:
+            self.events.emit(kind, **payload)
+    
+    def power_up(self):
+        """Start (or renew) the power-up after eating a power pellet"""
+        self.is_powered_up = True
+        self.power_timer = self.settings.power_duration
+        self._emit(POWER_START, duration=self.power_timer)
+    
     def update(self, maze, ghost_positions: List[Tuple[int, int]]):
         """Update Pacman's position and state"""
         # Get next move from AI or manual control
@@ -182,10 +302,7 @@ class PacmanAgent(BaseAgent):
         if maze.is_valid_position(cell_x, cell_y):
             # Check if move is safe from ghosts
             if self.autonomous_mode and not self.is_powered_up:
-                too_close_to_ghost = any(
-                    abs(cell_x - gx) + abs(cell_y - gy) < 2
-                    for gx, gy in ghost_positions
-                )
+                too_close_to_ghost = self._ghost_within((cell_x, cell_y), self.settings.safe_radius, ghost_positions)
                 if too_close_to_ghost:
                     return  # Don't make the move if it's too dangerous
             
@@ -201,20 +318,19 @@ class PacmanAgent(BaseAgent):
             cell_x = int(round(self.x))
             cell_y = int(round(self.y))
             
+            self.cell = (cell_x, cell_y)
+            
+            # Scoring is left to the game's PELLET_EATEN handler
             if (abs(self.x - cell_x) < 0.3 and abs(self.y - cell_y) < 0.3):
-                is_power_pellet = maze.eat_pellet(cell_x, cell_y)
-                if is_power_pellet:
-                    self.is_powered_up = True
-                    self.power_timer = 600
-                    self.score += 50
-                else:
-                    self.score += 10
+                if maze.eat_pellet(cell_x, cell_y):
+                    self.power_up()
         
         # Update power-up timer
         if self.is_powered_up:
             self.power_timer -= 1
             if self.power_timer <= 0:
                 self.is_powered_up = False
+                self._emit(POWER_END)
         
         # Update mouth animation
         if self.opening_mouth:
@@ -226,11 +342,12 @@ class PacmanAgent(BaseAgent):
             if self.mouth_angle <= 0:
                 self.opening_mouth = True
     
-    def draw(self, screen, offset_y=0):
-        """Draw Pacman with vertical offset"""
+    def draw(self, screen, offset_y=0, alpha=1.0, offset_x=0, path_dots=True):
+        """Draw Pacman with a pixel offset, interpolated `alpha` of the way into the last tick"""
         # Calculate center position
-        center_x = int(self.x * CELL_SIZE + CELL_SIZE // 2)
-        center_y = int(self.y * CELL_SIZE + CELL_SIZE // 2) + offset_y
+        x, y = self.interpolated_position(alpha)
+        center_x = int(x * CELL_SIZE + CELL_SIZE // 2) + offset_x
+        center_y = int(y * CELL_SIZE + CELL_SIZE // 2) + offset_y
         
         direction_angle = {
             Direction.RIGHT: 0,
@@ -255,13 +372,27 @@ class PacmanAgent(BaseAgent):
                            start_angle, end_angle, 3)
         
         # Draw the planned path
-        if self.autonomous_mode and self.current_path:
+        if path_dots and self.autonomous_mode and self.current_path:
             for x, y in self.current_path:
-                path_center_x = int(x * CELL_SIZE + CELL_SIZE // 2)
+                path_center_x = int(x * CELL_SIZE + CELL_SIZE // 2) + offset_x
                 path_center_y = int(y * CELL_SIZE + CELL_SIZE // 2) + offset_y
                 pygame.draw.circle(screen, (255, 0, 0), 
                                 (path_center_x, path_center_y), 2)
     
+    def snapshot(self) -> tuple:
+        """Immutable copy of Pacman's state, including the AI's route and pellet tour"""
+        tour = tuple(self.tour_planner.tour) if self.tour_planner is not None else None
+        return self._get_snapshot_fields(self) + (tuple(self.current_path), tour)
+
+    def restore(self, state: tuple):
+        """Put Pacman back to a snapshot"""
+        for name, value in zip(self.SNAPSHOT_FIELDS, state):
+            setattr(self, name, value)
+        path, tour = state[len(self.SNAPSHOT_FIELDS):]
+        self.current_path = list(path)
+        if self.tour_planner is not None:
+            self.tour_planner.tour = list(tour) if tour is not None else []
+
     def toggle_control_mode(self):
         """Toggle between AI and manual control"""
         self.autonomous_mode = not self.autonomous_mode
@@ -0,0 +1,135 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .search import SearchAlgorithm, BreadthFirstSearch, MultiGoalAStarSearch
+from .search_stats import SearchCallStats
+
+ADAPTIVE_WARMUP = 3            # Times each strategy is tried per query shape before choosing
+ADAPTIVE_EXPLORE_EVERY = 50    # Re-measure a non-preferred strategy this often per shape
+ADAPTIVE_COST_DECAY = 0.2      # Weight of the newest measurement in a strategy's average cost
+FEW_GOALS = 4                  # Goal counts above this are "many"
+LARGE_MAZE_CELLS = 2000        # Walkable cells above this make a maze "large"
+
+# Strategy per goal bucket when not measuring, from LEVEL_1 timings (table
+# first when a DistanceOracle is available, else the first search listed)
+DEFAULT_STRATEGIES = {
+    'single': ('table', 'astar'),
+    'few': ('table', 'astar'),
+    'many': ('bfs',),
+}
+
+
+class AdaptivePlanner(SearchAlgorithm):
+    """
+    Search front-end that answers find_path with the cheapest strategy for
+    the query's shape: a DistanceOracle table lookup when one is available,
+    BFS or multi-goal A*. Every strategy returns a shortest path to the
+    nearest goal, but they break ties between equally short paths
+    differently. By default each shape gets a fixed strategy from
+    DEFAULT_STRATEGIES, so seeded runs are reproducible; with measure=True
+    the planner times each strategy per shape and keeps using the one with
+    the lowest average cost, which makes the chosen paths depend on
+    wall-clock timing. Put it behind a CachedSearch so repeated queries
+    skip it altogether. Search stats are recorded as 'adaptive:<strategy>'.
+    """
+
+    def __init__(self, distances=None, measure: bool = False):
+        self.distances = distances  # DistanceOracle for the maze, if available
+        self.measure = measure      # Pick strategies by measured cost (not reproducible)
+        self.strategies: Dict[str, SearchAlgorithm] = {
+            'bfs': BreadthFirstSearch(),
+            'astar': MultiGoalAStarSearch(),
+        }
+        for strategy in self.strategies.values():
+            strategy.prune_dead_ends = True
+        self.maze_version = None
+        self.maze_cells = 0
+        self.costs: Dict[tuple, Dict[str, float]] = {}
+        self.trials: Dict[tuple, Dict[str, int]] = {}
+        self.queries: Dict[tuple, int] = {}
+        self.dispatched: Dict[str, int] = {}
+
+    def query_shape(self, goals: List[Tuple[int, int]]) -> tuple:
+        """Bucket a query by goal count and maze size"""
+        goal_bucket = 'single' if len(goals) == 1 else 'few' if len(goals) <= FEW_GOALS else 'many'
+        size_bucket = 'large' if self.maze_cells > LARGE_MAZE_CELLS else 'small'
+        return (goal_bucket, size_bucket)
+
+    def candidates(self) -> List[str]:
+        names = list(self.strategies)
+        if self.distances is not None:
+            names.append('table')
+        return names
+
+    def choose(self, shape: tuple) -> str:
+        """
+        Strategy to run for a query shape: the fixed default, or when
+        measuring, untried ones first and then the cheapest
+        """
+        names = self.candidates()
+        if not self.measure:
+            return next(name for name in DEFAULT_STRATEGIES[shape[0]] + ('bfs',) if name in names)
+        trials = self.trials.setdefault(shape, {})
+        for name in names:
+            if trials.get(name, 0) < ADAPTIVE_WARMUP:
+                return name
+        costs = self.costs[shape]
+        best = min(names, key=lambda name: costs.get(name, float('inf')))
+        count = self.queries.get(shape, 0)
+        if count % ADAPTIVE_EXPLORE_EVERY == 0:
+            # Occasionally re-measure another strategy in case costs drifted
+            others = [name for name in names if name != best]
+            if others:
+                return others[(count // ADAPTIVE_EXPLORE_EVERY) % len(others)]
+        return best
+
+    def _table_path(self, start: Tuple[int, int], goals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Path to the nearest goal read off the distance table"""
+        start_id = self.distances.cell_id(start)
+        if start_id < 0:
+            return []
+        best, best_distance = None, None
+        for goal in goals:
+            distance = self.distances.distance(start, goal)
+            if distance >= 0 and (best_distance is None or distance < best_distance):
+                best, best_distance = goal, distance
+        return self.distances.path(start, best) if best is not None and best != start else []
+
+    def find_path(self, start: Tuple[int, int],
+                 goals: List[Tuple[int, int]],
+                 maze) -> List[Tuple[int, int]]:
+        """Shortest path to the nearest goal, using the cheapest strategy"""
+        if not goals:
+            return []
+        if maze.version != self.maze_version:
+            self.maze_version = maze.version
+            self.maze_cells = int(maze.walkable.sum())
+        shape = self.query_shape(goals)
+        name = self.choose(shape)
+        self.queries[shape] = self.queries.get(shape, 0) + 1
+        started = time.perf_counter()
+        if name == 'table':
+            path = self._table_path(start, goals)
+        else:
+            strategy = self.strategies[name]
+            strategy.stats, strategy.stats_name = self.stats, f'adaptive:{name}'
+            path = strategy.find_path(start, goals, maze)
+        elapsed = time.perf_counter() - started
+        self._learn(shape, name, elapsed)
+        if name == 'table' and self.stats is not None:
+            self.stats.record(SearchCallStats('adaptive:table', 0, 0, 0, elapsed, len(path),
+                                              bool(path) or start in goals))
+        return path
+
+    def _learn(self, shape: tuple, name: str, cost: float):
+        trials = self.trials.setdefault(shape, {})
+        trials[name] = trials.get(name, 0) + 1
+        costs = self.costs.setdefault(shape, {})
+        previous = costs.get(name)
+        costs[name] = cost if previous is None else previous + ADAPTIVE_COST_DECAY * (cost - previous)
+        self.dispatched[name] = self.dispatched.get(name, 0) + 1
+
+    def preferred(self) -> Dict[tuple, Optional[str]]:
+        """Strategy currently believed cheapest for each query shape seen"""
+        return {shape: min(costs, key=costs.get) if costs else None
+                for shape, costs in self.costs.items()}
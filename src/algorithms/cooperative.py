@@ -0,0 +1,260 @@
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..agents.ghost_store import DIRECTION_INDEX, NO_DIRECTION
+from ..config.constants import DIRECTIONS, Direction, GHOST_SPEED
+
+COOP_WINDOW = 8             # Space-time search depth in cell steps
+COOP_REPLANS_PER_TICK = 8   # Ghost plans refreshed per tick (bounds planning cost)
+COOP_MAX_EXPANSIONS = 256   # Node budget of one windowed search
+SURROUND_DEPTH = 4          # How far down each corridor from Pacman ghosts try to cut him off
+CLAIMED_TARGET_PENALTY = 6  # Extra distance of a surround target per ghost already heading there
+STEP_TICKS = max(1, round(1 / GHOST_SPEED))  # Ticks a ghost takes to cross one cell
+
+# Cell step -> GhostStore direction index
+STEP_DIRECTION = {direction.value: DIRECTION_INDEX[direction] for direction in Direction}
+
+
+class ReservationTable:
+    """Space-time cells (and swaps between cells) claimed by planned ghost moves"""
+
+    def __init__(self):
+        self.cells: Dict[Tuple[int, int, int], int] = {}
+        self.edges: Dict[Tuple[Tuple[int, int], Tuple[int, int], int], int] = {}
+        self.owned: Dict[int, List[tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def is_free(self, agent_id: int, origin: Tuple[int, int], cell: Tuple[int, int], t: int) -> bool:
+        """Whether agent_id may move from origin at t - 1 onto cell at t"""
+        owner = self.cells.get((cell[0], cell[1], t), agent_id)
+        if owner != agent_id:
+            return False
+        # Two ghosts swapping cells would pass through each other
+        owner = self.edges.get((cell, origin, t), agent_id)
+        return owner == agent_id
+
+    def reserve(self, agent_id: int, start: Tuple[int, int], path: List[Tuple[int, int]], t0: int):
+        """Claim start at t0 and path[k] at t0 + k + 1 (replacing agent_id's old claims)"""
+        self.release(agent_id)
+        keys = []
+        previous = start
+        for t, cell in enumerate([start] + path, t0):
+            key = (cell[0], cell[1], t)
+            self.cells.setdefault(key, agent_id)
+            keys.append(('cell', key))
+            if t > t0:
+                edge = (previous, cell, t)
+                self.edges.setdefault(edge, agent_id)
+                keys.append(('edge', edge))
+            previous = cell
+        self.owned[agent_id] = keys
+
+    def release(self, agent_id: int):
+        """Drop every claim of agent_id"""
+        for kind, key in self.owned.pop(agent_id, ()):
+            table = self.cells if kind == 'cell' else self.edges
+            if table.get(key) == agent_id:
+                del table[key]
+
+    def clear(self):
+        self.cells.clear()
+        self.edges.clear()
+        self.owned.clear()
+
+    def snapshot(self) -> tuple:
+        """Immutable copy of every claim"""
+        return (tuple(self.cells.items()), tuple(self.edges.items()),
+                tuple((agent_id, tuple(keys)) for agent_id, keys in self.owned.items()))
+
+    def restore(self, state: tuple):
+        cells, edges, owned = state
+        self.cells = dict(cells)
+        self.edges = dict(edges)
+        self.owned = {agent_id: list(keys) for agent_id, keys in owned}
+
+
+class CooperativeGhostPlanner:
+    """
+    Windowed hierarchical cooperative A* (WHCA*, Silver 2005) for the ghosts.
+    Ghosts plan COOP_WINDOW steps ahead in space-time, one after another,
+    avoiding the cells earlier plans reserved; the heuristic is the true maze
+    distance to the ghost's target (the abstract, ghost-free search of HCA*),
+    read from a DistanceOracle. Each hunting ghost is sent to a different cell
+    around Pacman so the pack closes in from several sides. Only
+    COOP_REPLANS_PER_TICK plans are refreshed per tick, so planning cost
+    stays bounded however many ghosts there are.
+    """
+
+    def __init__(self, distances, window: int = COOP_WINDOW,
+                 replans_per_tick: int = COOP_REPLANS_PER_TICK):
+        self.distances = distances
+        self.window = window
+        self.replans_per_tick = replans_per_tick
+        self.reservations = ReservationTable()
+        self.plans: Dict[int, List[Tuple[int, int]]] = {}
+        self.plan_steps: Dict[int, int] = {}
+        self.targets: Dict[int, Tuple[int, int]] = {}
+        self.next_ghost = 0
+        self.searches = 0
+        self.expansions = 0
+
+    def reset(self):
+        """Forget every plan and reservation"""
+        self.reservations.clear()
+        self.plans.clear()
+        self.plan_steps.clear()
+        self.targets.clear()
+        self.next_ghost = 0
+
+    def snapshot(self) -> tuple:
+        """Immutable copy of the plans, targets and reservations, for GameState"""
+        return (tuple((ghost_id, tuple(plan)) for ghost_id, plan in self.plans.items()),
+                tuple(self.plan_steps.items()), tuple(self.targets.items()),
+                self.next_ghost, self.reservations.snapshot())
+
+    def restore(self, state: tuple):
+        """Put the plans back to a snapshot"""
+        plans, plan_steps, targets, self.next_ghost, reservations = state
+        self.plans = {ghost_id: list(plan) for ghost_id, plan in plans}
+        self.plan_steps = dict(plan_steps)
+        self.targets = dict(targets)
+        self.reservations.restore(reservations)
+
+    def _drop(self, ghost_id: int):
+        self.plans.pop(ghost_id, None)
+        self.plan_steps.pop(ghost_id, None)
+        self.targets.pop(ghost_id, None)
+        self.reservations.release(ghost_id)
+
+    def surround_targets(self, maze, pacman_pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Pacman's cell plus the cell SURROUND_DEPTH steps down each corridor leaving it"""
+        targets = [pacman_pos]
+        for dx, dy in DIRECTIONS:
+            cell = pacman_pos
+            for _ in range(SURROUND_DEPTH):
+                nxt = (cell[0] + dx, cell[1] + dy)
+                if not maze.is_valid_position(*nxt):
+                    break
+                cell = nxt
+            if cell != pacman_pos:
+                targets.append(cell)
+        return targets
+
+    def _choose_target(self, ghost_id: int, cell: Tuple[int, int],
+                       targets: List[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+        claimed: Dict[Tuple[int, int], int] = {}
+        for other, target in self.targets.items():
+            if other != ghost_id:
+                claimed[target] = claimed.get(target, 0) + 1
+        best, best_cost = None, None
+        for target in targets:
+            distance = self.distances.distance(cell, target)
+            if distance < 0:
+                continue
+            cost = distance + CLAIMED_TARGET_PENALTY * claimed.get(target, 0)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = target, cost
+        return best
+
+    def plan_ghost(self, ghost_id: int, start: Tuple[int, int], goal: Tuple[int, int],
+                   t0: int) -> List[Tuple[int, int]]:
+        """
+        Space-time A* from start (at step t0) towards goal, at most `window`
+        steps deep, avoiding reserved cells; returns the cells entered at
+        t0 + 1, t0 + 2, ... and reserves them.
+        """
+        self.searches += 1
+        goal_id = self.distances.cell_id(goal)
+        row = self.distances.row(goal_id) if goal_id >= 0 else None
+        if row is None or self.distances.cell_id(start) < 0:
+            self.reservations.release(ghost_id)
+            return []
+
+        def h(cell: Tuple[int, int]) -> int:
+            distance = row[self.distances.cell_id(cell)]
+            return distance if distance >= 0 else len(row)
+
+        counter = 0
+        open_set = [(h(start), 0, counter, start)]
+        parents: Dict[Tuple[Tuple[int, int], int], Optional[Tuple[Tuple[int, int], int]]] = {(start, 0): None}
+        closed: Set[Tuple[Tuple[int, int], int]] = set()
+        best = (h(start), 0, start)
+        expansions = 0
+        while open_set and expansions < COOP_MAX_EXPANSIONS:
+            _, depth, _, cell = heapq.heappop(open_set)
+            if (cell, depth) in closed:
+                continue
+            closed.add((cell, depth))
+            expansions += 1
+            if cell == goal or depth == self.window:
+                best = (h(cell), depth, cell)
+                break
+            if (h(cell), -depth) < (best[0], -best[1]):
+                best = (h(cell), depth, cell)
+            t = t0 + depth + 1
+            for dx, dy in DIRECTIONS:
+                nxt = (cell[0] + dx, cell[1] + dy)
+                state = (nxt, depth + 1)
+                if state in parents or self.distances.cell_id(nxt) < 0:
+                    continue
+                if not self.reservations.is_free(ghost_id, cell, nxt, t):
+                    continue
+                parents[state] = (cell, depth)
+                counter += 1
+                heapq.heappush(open_set, (depth + 1 + h(nxt), depth + 1, counter, nxt))
+        self.expansions += expansions
+
+        path = []
+        state = (best[2], best[1])
+        while parents[state] is not None:
+            path.append(state[0])
+            state = parents[state]
+        path.reverse()
+        self.reservations.reserve(ghost_id, start, path, t0)
+        return path
+
+    def update(self, store, maze, pacman_pos: Tuple[int, int], tick: int):
+        """Refresh a bounded number of plans and steer hunting ghosts along theirs"""
+        n = store.count
+        step = tick // STEP_TICKS
+        xs, ys = store.cells()
+        hunting = ~store.is_frightened[:n] & ~store.scatter_mode[:n]
+        for ghost_id in list(self.plans):
+            if ghost_id >= n or not hunting[ghost_id]:
+                self._drop(ghost_id)
+
+        # Replan the ghosts whose plans are the most stale, round robin
+        due = [i for i in np.nonzero(hunting)[0].tolist()
+               if i not in self.plans or step - self.plan_steps[i] >= self.window // 2
+               or not self.plans[i]]
+        if due:
+            due.sort(key=lambda i: ((i - self.next_ghost) % n))
+            targets = self.surround_targets(maze, pacman_pos)
+            for ghost_id in due[:self.replans_per_tick]:
+                cell = (int(xs[ghost_id]), int(ys[ghost_id]))
+                target = self._choose_target(ghost_id, cell, targets)
+                if target is None:
+                    self._drop(ghost_id)
+                    continue
+                self.targets[ghost_id] = target
+                self.plans[ghost_id] = self.plan_ghost(ghost_id, cell, target, step)
+                self.plan_steps[ghost_id] = step
+                self.next_ghost = (ghost_id + 1) % n
+
+        # Steer each planned ghost towards the next cell of its plan
+        planned = np.full(n, NO_DIRECTION, dtype=np.int8)
+        for ghost_id, plan in self.plans.items():
+            cell = (int(xs[ghost_id]), int(ys[ghost_id]))
+            if cell in plan:
+                del plan[:plan.index(cell) + 1]
+            if plan:
+                direction = STEP_DIRECTION.get((plan[0][0] - cell[0], plan[0][1] - cell[1]))
+                if direction is None:
+                    plan.clear()  # Knocked off the plan: replan when next due
+                else:
+                    planned[ghost_id] = direction
+        store.planned_direction[:n] = planned
@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..config.constants import DIRECTIONS
+
+
+class DistanceOracle(ABC):
+    """
+    Wall-aware distances between maze cells. Subclasses provide the distance
+    row of a goal cell (distance from every cell to the goal); shortest paths
+    are read off a row by stepping downhill, so no search is needed.
+    """
+
+    def __init__(self, walkable: np.ndarray):
+        self.height, self.width = walkable.shape
+        self.cell_ids = np.full(walkable.shape, -1, dtype=np.int32)
+        ys, xs = np.nonzero(walkable)
+        self.cell_ids[ys, xs] = np.arange(len(xs), dtype=np.int32)
+        self.cells: List[Tuple[int, int]] = list(zip(xs.tolist(), ys.tolist()))
+        self._ids: Dict[Tuple[int, int], int] = {cell: i for i, cell in enumerate(self.cells)}
+        self.neighbors: List[List[int]] = []
+        for x, y in self.cells:
+            self.neighbors.append([self._ids[(x + dx, y + dy)] for dx, dy in DIRECTIONS
+                                   if (x + dx, y + dy) in self._ids])
+
+    def cell_id(self, pos: Tuple[int, int]) -> int:
+        """Id of a walkable cell, -1 for walls and out-of-bounds positions"""
+        return self._ids.get(pos, -1)
+
+    @abstractmethod
+    def row(self, goal_id: int) -> List[int]:
+        """Distance from every cell id to goal_id (-1 where unreachable)"""
+        pass
+
+    def distance(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        """Shortest path length between two cells, -1 if unreachable"""
+        ia, ib = self.cell_id(a), self.cell_id(b)
+        if ia < 0 or ib < 0:
+            return -1
+        return self.row(ib)[ia]
+
+    def path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Shortest path from start to goal, excluding start (like SearchAlgorithm.find_path)"""
+        current, goal_id = self.cell_id(start), self.cell_id(goal)
+        if current < 0 or goal_id < 0:
+            return []
+        row = self.row(goal_id)
+        if row[current] < 0:
+            return []
+        path = []
+        while current != goal_id:
+            target = row[current] - 1
+            for neighbor in self.neighbors[current]:
+                if row[neighbor] == target:
+                    current = neighbor
+                    break
+            path.append(self.cells[current])
+        return path
+
+
+class BFSDistanceCache(DistanceOracle):
+    """Distance rows computed by BFS on first use and kept for the rest of the game"""
+
+    def __init__(self, maze):
+        super().__init__(maze.walkable)
+        self._rows: Dict[int, List[int]] = {}
+        self.bfs_runs = 0
+
+    def row(self, goal_id: int) -> List[int]:
+        cached = self._rows.get(goal_id)
+        if cached is None:
+            cached = self._rows[goal_id] = self._bfs_row(goal_id)
+        return cached
+
+    def _bfs_row(self, goal_id: int) -> List[int]:
+        self.bfs_runs += 1
+        row = [-1] * len(self.cells)
+        row[goal_id] = 0
+        queue = deque([goal_id])
+        neighbors = self.neighbors
+        while queue:
+            current = queue.popleft()
+            next_distance = row[current] + 1
+            for neighbor in neighbors[current]:
+                if row[neighbor] < 0:
+                    row[neighbor] = next_distance
+                    queue.append(neighbor)
+        return row
+
+
+class TableDistances(BFSDistanceCache):
+    """
+    Distance rows read from a precompiled all-pairs table (see
+    core.map_loader). Layouts too big for a dense table have none, and
+    their rows are computed by BFS on first use instead.
+    """
+
+    def __init__(self, artifacts):
+        DistanceOracle.__init__(self, np.asarray(artifacts.walkable))
+        self.table = artifacts.distances if artifacts.dense else None
+        self._rows: Dict[int, List[int]] = {}
+        self.bfs_runs = 0
+
+    def row(self, goal_id: int) -> List[int]:
+        cached = self._rows.get(goal_id)
+        if cached is None:
+            cached = self._rows[goal_id] = (self.table[goal_id].tolist() if self.table is not None
+                                            else self._bfs_row(goal_id))
+        return cached
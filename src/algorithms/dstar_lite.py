@@ -0,0 +1,145 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+from ..config.constants import DIRECTIONS
+
+
+class DStarLite:
+    """
+    Incremental shortest-path planner (D* Lite, Koenig & Likhachev 2002).
+
+    Keeps its search state between calls to plan(): when the start moves or
+    the extra cost of some cells changes (e.g. cells near ghosts), only the
+    affected vertices are repaired instead of searching from scratch.
+    Moving onto a cell costs 1 plus its extra cost.
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.goal: Optional[Tuple[int, int]] = None
+        self.start: Optional[Tuple[int, int]] = None
+        self.extra_costs: Dict[Tuple[int, int], float] = {}
+        self.expansions = 0
+        self.resets = 0
+        self._reset_state()
+
+    def _reset_state(self):
+        self.g: Dict[Tuple[int, int], float] = {}
+        self.rhs: Dict[Tuple[int, int], float] = {}
+        self.queue: List[Tuple[Tuple[float, float], Tuple[int, int]]] = []
+        self.queued: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        self.km = 0.0
+        self.last_start = self.start
+
+    @staticmethod
+    def heuristic(a: Tuple[int, int], b: Tuple[int, int]) -> float:
+        """Manhattan distance (admissible since every move costs at least 1)"""
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _neighbors(self, cell: Tuple[int, int]) -> List[Tuple[int, int]]:
+        x, y = cell
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS
+                if self.maze.is_valid_position(x + dx, y + dy)]
+
+    def _cost(self, target: Tuple[int, int]) -> float:
+        return 1 + self.extra_costs.get(target, 0)
+
+    def _key(self, cell: Tuple[int, int]) -> Tuple[float, float]:
+        best = min(self.g.get(cell, math.inf), self.rhs.get(cell, math.inf))
+        return (best + self.heuristic(self.start, cell) + self.km, best)
+
+    def _push(self, cell: Tuple[int, int]):
+        key = self._key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, cell))
+
+    def _update_vertex(self, cell: Tuple[int, int]):
+        if cell != self.goal:
+            self.rhs[cell] = min((self._cost(n) + self.g.get(n, math.inf) for n in self._neighbors(cell)),
+                                 default=math.inf)
+        self.queued.pop(cell, None)
+        if self.g.get(cell, math.inf) != self.rhs.get(cell, math.inf):
+            self._push(cell)
+
+    def _top_key(self) -> Tuple[float, float]:
+        # Drop stale entries left behind by lazy deletion
+        while self.queue and self.queued.get(self.queue[0][1]) != self.queue[0][0]:
+            heapq.heappop(self.queue)
+        return self.queue[0][0] if self.queue else (math.inf, math.inf)
+
+    def _compute_shortest_path(self):
+        start = self.start
+        while (self._top_key() < self._key(start) or
+               self.rhs.get(start, math.inf) != self.g.get(start, math.inf)):
+            if not self.queue:
+                break
+            old_key, cell = heapq.heappop(self.queue)
+            del self.queued[cell]
+            self.expansions += 1
+            new_key = self._key(cell)
+            if old_key < new_key:
+                self._push(cell)
+            elif self.g.get(cell, math.inf) > self.rhs.get(cell, math.inf):
+                self.g[cell] = self.rhs[cell]
+                for neighbor in self._neighbors(cell):
+                    self._update_vertex(neighbor)
+            else:
+                self.g[cell] = math.inf
+                self._update_vertex(cell)
+                for neighbor in self._neighbors(cell):
+                    self._update_vertex(neighbor)
+
+    def set_goal(self, goal: Tuple[int, int], start: Tuple[int, int]):
+        """Start planning towards a new goal (discards the search state)"""
+        self.resets += 1
+        self.goal = goal
+        self.start = start
+        self._reset_state()
+        self.rhs[goal] = 0
+        self._push(goal)
+
+    def move_start(self, start: Tuple[int, int]):
+        """Move the start; keys already queued stay valid thanks to km"""
+        if start == self.start:
+            return
+        self.km += self.heuristic(self.last_start, start)
+        self.last_start = start
+        self.start = start
+
+    def set_extra_costs(self, extra_costs: Dict[Tuple[int, int], float]):
+        """Replace the extra cell costs, repairing only around cells that changed"""
+        changed = [cell for cell in set(self.extra_costs) | set(extra_costs)
+                   if self.extra_costs.get(cell, 0) != extra_costs.get(cell, 0)]
+        self.extra_costs = dict(extra_costs)
+        if self.goal is None:
+            return
+        for cell in changed:
+            # Entering `cell` got cheaper or dearer: re-evaluate everything that can enter it
+            for neighbor in self._neighbors(cell):
+                self._update_vertex(neighbor)
+
+    def plan(self, start: Tuple[int, int], goal: Tuple[int, int],
+             extra_costs: Optional[Dict[Tuple[int, int], float]] = None) -> List[Tuple[int, int]]:
+        """Bring the plan up to date and return the path from start to goal (excluding start)"""
+        if goal != self.goal:
+            self.extra_costs = dict(extra_costs or {})
+            self.set_goal(goal, start)
+        else:
+            self.move_start(start)
+            if extra_costs is not None:
+                self.set_extra_costs(extra_costs)
+        self._compute_shortest_path()
+        return self.path()
+
+    def path(self) -> List[Tuple[int, int]]:
+        """Follow the cheapest successors from the start to the goal"""
+        if self.start is None or self.g.get(self.start, math.inf) == math.inf:
+            return []
+        path = []
+        current = self.start
+        while current != self.goal and len(path) <= len(self.g):
+            current = min(self._neighbors(current),
+                          key=lambda n: self._cost(n) + self.g.get(n, math.inf))
+            path.append(current)
+        return path if current == self.goal else []
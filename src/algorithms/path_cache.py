@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .search import SearchAlgorithm
+
+PATH_CACHE_SIZE = 1024  # Paths kept before the least recently used is evicted
+
+
+class PathCache:
+    """
+    Bounded LRU cache of search results keyed by (algorithm, start, goal
+    set, maze version). Maze.version is a hash of the walls, so eating
+    pellets never invalidates a path, a new maze with the same walls (a
+    reset) reuses the old maze's entries, and a maze whose walls change
+    simply stops matching its old entries, which then age out.
+    """
+
+    def __init__(self, capacity: int = PATH_CACHE_SIZE):
+        self.capacity = capacity
+        self.entries: 'OrderedDict[tuple, Tuple[Tuple[int, int], ...]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def key(algorithm: str, start: Tuple[int, int], goals: List[Tuple[int, int]], maze) -> tuple:
+        return (algorithm, start, frozenset(goals), maze.version)
+
+    def get(self, key: tuple) -> Optional[List[Tuple[int, int]]]:
+        """Copy of the cached path, or None (counted as a miss)"""
+        path = self.entries.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(path)
+
+    def put(self, key: tuple, path: List[Tuple[int, int]]):
+        self.entries[key] = tuple(path)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (f"Path cache: {self.hits} hits, {self.misses} misses ({self.hit_rate:.0%}), "
+                f"{len(self.entries)}/{self.capacity} entries")
+
+
+class CachedSearch(SearchAlgorithm):
+    """Any search algorithm behind a PathCache; only misses reach the algorithm (and its stats)"""
+
+    def __init__(self, algorithm: SearchAlgorithm, cache: Optional[PathCache] = None):
+        self.algorithm = algorithm
+        self.cache = cache if cache is not None else PathCache()
+        self.name = type(algorithm).__name__
+
+    @property
+    def stats(self):
+        return self.algorithm.stats
+
+    @stats.setter
+    def stats(self, stats):
+        self.algorithm.stats = stats
+
+    def find_path(self, start: Tuple[int, int],
+                 goals: List[Tuple[int, int]],
+                 maze) -> List[Tuple[int, int]]:
+        if not goals:
+            return []
+        key = PathCache.key(self.name, start, goals, maze)
+        path = self.cache.get(key)
+        if path is None:
+            path = self.algorithm.find_path(start, goals, maze)
+            self.cache.put(key, path)
+        return path
@@ -1,10 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Set, Deque, Dict
+from typing import List, Optional, Tuple, Set, Deque, Dict
 from collections import deque
 from queue import PriorityQueue
+import heapq
 import math
+import time
+from .search_stats import SearchCallStats, SearchStats
 
 class SearchAlgorithm(ABC):
+    # Set to a SearchStats to record nodes expanded, frontier size, improved
+    # costs and time of every call; None (the default) records nothing
+    stats: Optional[SearchStats] = None
+    stats_name: Optional[str] = None  # Name the calls are recorded under (the class name if None)
+    # Skip dead-end branches (Maze.topology) that hold no goal: a shortest
+    # path never enters one. Honoured by BFS and multi-goal A*
+    prune_dead_ends: bool = False
+
     @abstractmethod
     def find_path(self, start: Tuple[int, int], 
                  goals: List[Tuple[int, int]], 
@@ -12,6 +23,23 @@ class SearchAlgorithm(ABC):
         """Find a path from start to the nearest goal"""
         pass
 
+    def _dead_end_filter(self, goals: List[Tuple[int, int]], maze):
+        """(dead-end depths, cells on the way to a goal) when pruning dead ends, else None"""
+        if not self.prune_dead_ends or maze.topology is None:
+            return None
+        return maze.topology.dead_end_depth, maze.topology.branch_cells(goals)
+
+    def _start_timer(self) -> float:
+        return time.perf_counter() if self.stats is not None else 0.0
+
+    def _finish(self, path: List[Tuple[int, int]], started: float, expanded: int,
+                max_frontier: int = 0, improved: int = 0, found: bool = True) -> List[Tuple[int, int]]:
+        """Record the call's counters if stats are enabled, return the path"""
+        if self.stats is not None:
+            self.stats.record(SearchCallStats(self.stats_name or type(self).__name__, expanded, max_frontier, improved,
+                                              time.perf_counter() - started, len(path), found))
+        return path
+
 class BreadthFirstSearch(SearchAlgorithm):
     def find_path(self, start: Tuple[int, int], 
                  goals: List[Tuple[int, int]], 
@@ -23,8 +51,13 @@ class BreadthFirstSearch(SearchAlgorithm):
         if not goals:
             return []
         
+        started = self._start_timer()
+        track = self.stats is not None
+        expanded = max_frontier = 0
+
         # Convert goals to set for O(1) lookup
         goal_set = set(goals)
+        dead_ends = self._dead_end_filter(goals, maze)
         
         # Queue stores (position, path)
         queue = deque([(start, [start])])
@@ -34,11 +67,14 @@ class BreadthFirstSearch(SearchAlgorithm):
         directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
         
         while queue:
+            if track and len(queue) > max_frontier:
+                max_frontier = len(queue)
             current, path = queue.popleft()
+            expanded += 1
             
             # Check if current position is a goal
             if current in goal_set:
-                return path[1:]  # Exclude start position
+                return self._finish(path[1:], started, expanded, max_frontier)  # Exclude start position
             
             # Try all possible movements
             for dx, dy in directions:
@@ -47,10 +83,14 @@ class BreadthFirstSearch(SearchAlgorithm):
                 
                 if (next_pos not in visited and 
                     maze.is_valid_position(next_x, next_y)):
+                    if dead_ends is not None:
+                        depth, on_way = dead_ends
+                        if depth[next_y, next_x] > depth[current[1], current[0]] and next_pos not in on_way:
+                            continue  # Deeper into a branch with no goal in it
                     visited.add(next_pos)
                     queue.append((next_pos, path + [next_pos]))
         
-        return []  # No path found
+        return self._finish([], started, expanded, max_frontier, found=False)  # No path found
 
 class AStarSearch(SearchAlgorithm):
     def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
@@ -67,6 +107,10 @@ class AStarSearch(SearchAlgorithm):
         if not goals:
             return []
         
+        started = self._start_timer()
+        track = self.stats is not None
+        expanded = max_frontier = improved = 0
+
         # Find nearest goal using Manhattan distance
         nearest_goal = min(goals, key=lambda g: self.heuristic(start, g))
         
@@ -84,10 +128,13 @@ class AStarSearch(SearchAlgorithm):
         directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
         
         while not open_set.empty():
+            if track and open_set.qsize() > max_frontier:
+                max_frontier = open_set.qsize()
             _, current, path = open_set.get()
+            expanded += 1
             
             if current == nearest_goal:
-                return path[1:]  # Exclude start position
+                return self._finish(path[1:], started, expanded, max_frontier, improved)  # Exclude start position
             
             for dx, dy in directions:
                 next_x, next_y = current[0] + dx, current[1] + dy
@@ -104,8 +151,77 @@ class AStarSearch(SearchAlgorithm):
                         if next_pos not in visited:
                             visited.add(next_pos)
                             open_set.put((f_score, next_pos, path + [next_pos]))
+                        else:
+                            improved += 1  # Better cost for a node already queued (not queued again)
         
-        return []  # No path found
+        return self._finish([], started, expanded, max_frontier, improved, found=False)  # No path found
+
+class MultiGoalAStarSearch(SearchAlgorithm):
+    def find_path(self, start: Tuple[int, int], 
+                 goals: List[Tuple[int, int]], 
+                 maze) -> List[Tuple[int, int]]:
+        """
+        Implements A* towards the nearest of several goals: the heuristic is
+        the Manhattan distance to the closest goal, which stays consistent,
+        so the path found leads to the truly nearest goal (unlike AStarSearch,
+        which commits to the Manhattan-nearest goal up front).
+        Returns: List of positions forming the path
+        """
+        if not goals:
+            return []
+        started = self._start_timer()
+        track = self.stats is not None
+        expanded = max_frontier = improved = 0
+
+        goal_set = set(goals)
+        goal_list = list(goal_set)
+        dead_ends = self._dead_end_filter(goal_list, maze)
+
+        def heuristic(pos: Tuple[int, int]) -> int:
+            return min(abs(pos[0] - gx) + abs(pos[1] - gy) for gx, gy in goal_list)
+
+        # Possible movements
+        directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+        open_set = [(heuristic(start), 0, start)]
+        g_scores = {start: 0}
+        parents = {start: None}
+        closed = set()
+
+        while open_set:
+            if track and len(open_set) > max_frontier:
+                max_frontier = len(open_set)
+            _, g, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+
+            if current in goal_set:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                path.reverse()
+                return self._finish(path[1:], started, expanded, max_frontier, improved)  # Exclude start position
+
+            for dx, dy in directions:
+                next_pos = (current[0] + dx, current[1] + dy)
+                if not maze.is_valid_position(*next_pos):
+                    continue
+                if dead_ends is not None:
+                    depth, on_way = dead_ends
+                    if depth[next_pos[1], next_pos[0]] > depth[current[1], current[0]] and next_pos not in on_way:
+                        continue  # Deeper into a branch with no goal in it
+                tentative_g = g + 1
+                if tentative_g < g_scores.get(next_pos, math.inf):
+                    if next_pos in g_scores:
+                        improved += 1
+                    g_scores[next_pos] = tentative_g
+                    parents[next_pos] = current
+                    heapq.heappush(open_set, (tentative_g + heuristic(next_pos), tentative_g, next_pos))
+
+        return self._finish([], started, expanded, max_frontier, improved, found=False)  # No path found
 
 class UniformCostSearch(SearchAlgorithm):
     def find_path(self, start: Tuple[int, int], 
@@ -118,6 +234,10 @@ class UniformCostSearch(SearchAlgorithm):
         if not goals:
             return []
         
+        started = self._start_timer()
+        track = self.stats is not None
+        expanded = max_frontier = improved = 0
+
         # Convert goals to set for O(1) lookup
         goal_set = set(goals)
         
@@ -132,10 +252,13 @@ class UniformCostSearch(SearchAlgorithm):
         directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
         
         while not queue.empty():
+            if track and queue.qsize() > max_frontier:
+                max_frontier = queue.qsize()
             cost, current, path = queue.get()
+            expanded += 1
             
             if current in goal_set:
-                return path[1:]  # Exclude start position
+                return self._finish(path[1:], started, expanded, max_frontier, improved)  # Exclude start position
             
             for dx, dy in directions:
                 next_x, next_y = current[0] + dx, current[1] + dy
@@ -146,7 +269,173 @@ class UniformCostSearch(SearchAlgorithm):
                 
                 if (maze.is_valid_position(next_x, next_y) and 
                     (next_pos not in visited or new_cost < visited[next_pos])):
+                    if next_pos in visited:
+                        improved += 1
                     visited[next_pos] = new_cost
                     queue.put((new_cost, next_pos, path + [next_pos]))
         
-        return []  # No path found
\ No newline at end of file
+        return self._finish([], started, expanded, max_frontier, improved, found=False)  # No path found
+
+def _join_paths(meet: Tuple[int, int],
+                forward_parents: Dict[Tuple[int, int], Tuple[int, int]],
+                backward_parents: Dict[Tuple[int, int], Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Path from the forward root to the backward root through the meeting cell, excluding the start"""
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = forward_parents[node]
+    path.reverse()
+    node = backward_parents[meet]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+    return path[1:]
+
+
+class BidirectionalBFS(SearchAlgorithm):
+    def find_path(self, start: Tuple[int, int], 
+                 goals: List[Tuple[int, int]], 
+                 maze) -> List[Tuple[int, int]]:
+        """
+        Implements bidirectional BFS: a forward search from start and a backward
+        search from all goals, expanding whole layers of the smaller frontier
+        until they meet. Returns the same shortest path length as BFS.
+        Returns: List of positions forming the path
+        """
+        if not goals:
+            return []
+        started = self._start_timer()
+        goal_set = set(goals)
+        if start in goal_set:
+            return self._finish([], started, 0)  # Already at a goal
+        expanded = max_frontier = 0
+
+        forward_parents = {start: None}
+        backward_parents = {goal: None for goal in goal_set}
+        forward_depth = {start: 0}
+        backward_depth = {goal: 0 for goal in goal_set}
+        forward_frontier = [start]
+        backward_frontier = list(goal_set)
+
+        # Possible movements (up, right, down, left)
+        directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+        while forward_frontier and backward_frontier:
+            # Expand the smaller frontier one full layer
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, parents, depth = forward_frontier, forward_parents, forward_depth
+                other_parents, other_depth = backward_parents, backward_depth
+                forward = True
+            else:
+                frontier, parents, depth = backward_frontier, backward_parents, backward_depth
+                other_parents, other_depth = forward_parents, forward_depth
+                forward = False
+
+            next_frontier = []
+            best_meet, best_length = None, None
+            max_frontier = max(max_frontier, len(forward_frontier) + len(backward_frontier))
+            expanded += len(frontier)
+            for current in frontier:
+                for dx, dy in directions:
+                    next_pos = (current[0] + dx, current[1] + dy)
+                    if next_pos in parents or not maze.is_valid_position(*next_pos):
+                        continue
+                    parents[next_pos] = current
+                    depth[next_pos] = depth[current] + 1
+                    next_frontier.append(next_pos)
+                    if next_pos in other_parents:
+                        # Keep the shortest meeting found in this layer
+                        length = depth[next_pos] + other_depth[next_pos]
+                        if best_length is None or length < best_length:
+                            best_meet, best_length = next_pos, length
+
+            if best_meet is not None:
+                return self._finish(_join_paths(best_meet, forward_parents, backward_parents),
+                                    started, expanded, max_frontier)
+
+            if forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return self._finish([], started, expanded, max_frontier, found=False)  # No path found
+
+
+class BidirectionalAStar(SearchAlgorithm):
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
+        """Manhattan distance heuristic"""
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+
+    def find_path(self, start: Tuple[int, int], 
+                 goals: List[Tuple[int, int]], 
+                 maze) -> List[Tuple[int, int]]:
+        """
+        Implements bidirectional A* towards the nearest goal (by Manhattan
+        distance, like AStarSearch). Both searches run A* towards each other's
+        root; the best meeting cost mu is tracked and the search stops once
+        the smallest f on either open list reaches mu, which keeps the path
+        optimal with the consistent Manhattan heuristic.
+        Returns: List of positions forming the path
+        """
+        if not goals:
+            return []
+
+        # Find nearest goal using Manhattan distance
+        started = self._start_timer()
+        goal = min(goals, key=lambda g: self.heuristic(start, g))
+        if goal == start:
+            return self._finish([], started, 0)  # Already at the goal
+        track = self.stats is not None
+        expanded = max_frontier = improved = 0
+
+        # Possible movements
+        directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+        roots = (start, goal)
+        g_scores = ({start: 0}, {goal: 0})
+        parents = ({start: None}, {goal: None})
+        closed = (set(), set())
+        open_sets = ([(self.heuristic(start, goal), 0, start)],
+                     [(self.heuristic(goal, start), 0, goal)])
+        best_meet, best_cost = None, math.inf
+
+        while open_sets[0] and open_sets[1]:
+            # Stop when neither side can still improve on the best meeting
+            if max(open_sets[0][0][0], open_sets[1][0][0]) >= best_cost:
+                break
+
+            if track and len(open_sets[0]) + len(open_sets[1]) > max_frontier:
+                max_frontier = len(open_sets[0]) + len(open_sets[1])
+
+            # Expand the side with the smaller open list
+            side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+            other = 1 - side
+            _, g, current = heapq.heappop(open_sets[side])
+            if current in closed[side] or g > g_scores[side][current]:
+                continue
+            closed[side].add(current)
+            expanded += 1
+            target = roots[other]
+
+            for dx, dy in directions:
+                next_pos = (current[0] + dx, current[1] + dy)
+                if not maze.is_valid_position(*next_pos):
+                    continue
+                tentative_g = g + 1
+                if tentative_g < g_scores[side].get(next_pos, math.inf):
+                    if next_pos in g_scores[side]:
+                        improved += 1
+                    g_scores[side][next_pos] = tentative_g
+                    parents[side][next_pos] = current
+                    heapq.heappush(open_sets[side],
+                                   (tentative_g + self.heuristic(next_pos, target), tentative_g, next_pos))
+                    if next_pos in g_scores[other]:
+                        cost = tentative_g + g_scores[other][next_pos]
+                        if cost < best_cost:
+                            best_meet, best_cost = next_pos, cost
+
+        if best_meet is None:
+            return self._finish([], started, expanded, max_frontier, improved, found=False)  # No path found
+        return self._finish(_join_paths(best_meet, parents[0], parents[1]),
+                            started, expanded, max_frontier, improved)
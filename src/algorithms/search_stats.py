@@ -0,0 +1,117 @@
+import json
+from typing import Dict, List, Optional
+
+
+class SearchCallStats:
+    """Counters of one find_path call"""
+    __slots__ = ('algorithm', 'expanded', 'max_frontier', 'improved', 'elapsed', 'path_length', 'found')
+
+    def __init__(self, algorithm: str, expanded: int, max_frontier: int, improved: int,
+                 elapsed: float, path_length: int, found: bool = True):
+        self.algorithm = algorithm
+        self.expanded = expanded
+        self.max_frontier = max_frontier
+        self.improved = improved  # Times a shorter route to an already reached node was found
+        self.elapsed = elapsed
+        self.path_length = path_length
+        self.found = found  # A goal was reached (with an empty path when start is a goal)
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class AlgorithmStats:
+    """Counters of every recorded call of one algorithm"""
+
+    def __init__(self, algorithm: str):
+        self.algorithm = algorithm
+        self.calls = 0
+        self.found = 0
+        self.expanded = 0
+        self.improved = 0
+        self.max_frontier = 0
+        self.elapsed = 0.0
+        self.path_length = 0
+
+    def add(self, call: SearchCallStats):
+        self.calls += 1
+        self.found += call.found
+        self.expanded += call.expanded
+        self.improved += call.improved
+        self.max_frontier = max(self.max_frontier, call.max_frontier)
+        self.elapsed += call.elapsed
+        self.path_length += call.path_length
+
+    def as_dict(self) -> Dict:
+        calls = max(self.calls, 1)
+        return {
+            'algorithm': self.algorithm,
+            'calls': self.calls,
+            'found': self.found,
+            'expanded': self.expanded,
+            'improved': self.improved,
+            'max_frontier': self.max_frontier,
+            'elapsed': self.elapsed,
+            'mean_expanded': self.expanded / calls,
+            'mean_elapsed_us': self.elapsed / calls * 1e6,
+            'mean_path_length': self.path_length / calls,
+        }
+
+
+class SearchStats:
+    """
+    Collects SearchCallStats from every SearchAlgorithm it is attached to
+    (see SearchAlgorithm.stats): the last call, totals per algorithm and,
+    if keep_calls is set, every call.
+    """
+
+    def __init__(self, keep_calls: bool = False, source: Optional[str] = None):
+        self.keep_calls = keep_calls
+        self.source = source  # What the recorded calls are, stated with the summary
+        self.calls: List[SearchCallStats] = []
+        self.last: Optional[SearchCallStats] = None
+        self.by_algorithm: Dict[str, AlgorithmStats] = {}
+
+    def record(self, call: SearchCallStats):
+        self.last = call
+        totals = self.by_algorithm.get(call.algorithm)
+        if totals is None:
+            totals = self.by_algorithm[call.algorithm] = AlgorithmStats(call.algorithm)
+        totals.add(call)
+        if self.keep_calls:
+            self.calls.append(call)
+
+    def clear(self):
+        self.calls.clear()
+        self.last = None
+        self.by_algorithm.clear()
+
+    def as_dict(self) -> Dict:
+        result = {'algorithms': [totals.as_dict() for totals in self.by_algorithm.values()]}
+        if self.keep_calls:
+            result['calls'] = [call.as_dict() for call in self.calls]
+        return result
+
+    def summary(self) -> str:
+        """Aggregated stats as a text table"""
+        lines = [f"Calls: {self.source}"] if self.source else []
+        lines.append(f"{'algorithm':<20}{'calls':>8}{'found':>8}{'expanded':>10}{'improved':>10}"
+                     f"{'frontier':>10}{'mean us':>10}")
+        for totals in self.by_algorithm.values():
+            row = totals.as_dict()
+            lines.append(f"{totals.algorithm:<20}{totals.calls:>8}{totals.found:>8}{row['mean_expanded']:>10.1f}"
+                         f"{totals.improved:>10}{totals.max_frontier:>10}{row['mean_elapsed_us']:>10.1f}")
+        return "\n".join(lines)
+
+    def dump(self, path: Optional[str] = None, cache=None):
+        """Print the aggregated stats (and a PathCache's hit rate), and write them as JSON if a path is given"""
+        print("Search statistics (expanded is per call, frontier is the largest seen):")
+        print(self.summary())
+        result = self.as_dict()
+        if cache is not None:
+            print(cache.summary())
+            result['path_cache'] = {'hits': cache.hits, 'misses': cache.misses, 'entries': len(cache)}
+        if path:
+            with open(path, 'w') as f:
+                json.dump(result, f, indent=2)
+            print(f"Search statistics written to {path}")
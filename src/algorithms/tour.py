@@ -0,0 +1,208 @@
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.constants import CellType
+
+TOUR_MAX_PELLETS = 600    # Pellets per tour; the nearest ones are toured first on huge maps
+NEIGHBOR_LIST_SIZE = 8    # Candidate neighbours per pellet for 2-opt / Or-opt moves
+MAX_IMPROVE_PASSES = 4    # Improvement passes per build
+OR_OPT_SEGMENT = 3        # Longest segment Or-opt tries to relocate
+MAX_DEFERRALS = 3         # Blocked pellets skipped per query before giving up
+HEAD_WINDOW = 6           # Tour entries considered when re-entering the tour after a detour
+UNREACHABLE = 1 << 20
+
+
+class TourPlanner:
+    """
+    Orders the remaining pellets into a short visiting tour (greedy nearest
+    neighbour improved with 2-opt and Or-opt over wall-aware distances) and
+    keeps it up to date as pellets are eaten or blocked, instead of picking
+    and searching for one pellet at a time.
+    """
+
+    def __init__(self, distances):
+        self.distances = distances
+        self.tour: List[Tuple[int, int]] = []
+        self.builds = 0
+        self.deferrals = 0
+
+    def build(self, start: Tuple[int, int], pellets: List[Tuple[int, int]]):
+        """Plan a tour over the reachable pellets starting from start"""
+        self.builds += 1
+        start_row = self.distances.row(self.distances.cell_id(start)) \
+            if self.distances.cell_id(start) >= 0 else None
+        if start_row is None:
+            self.tour = []
+            return
+
+        reachable = [p for p in pellets
+                     if self.distances.cell_id(p) >= 0 and start_row[self.distances.cell_id(p)] >= 0]
+        if len(reachable) > TOUR_MAX_PELLETS:
+            reachable.sort(key=lambda p: start_row[self.distances.cell_id(p)])
+            reachable = reachable[:TOUR_MAX_PELLETS]
+        if not reachable:
+            self.tour = []
+            return
+
+        nodes = [start] + reachable
+        dist = self._distance_matrix(nodes)
+        order = self._nearest_neighbor(dist)
+        neighbor_lists = self._neighbor_lists(dist)
+        for _ in range(MAX_IMPROVE_PASSES):
+            improved = self._two_opt(order, dist, neighbor_lists)
+            improved |= self._or_opt(order, dist, neighbor_lists)
+            if not improved:
+                break
+        self.tour = [nodes[i] for i in order[1:]]
+
+    def _distance_matrix(self, nodes: List[Tuple[int, int]]) -> np.ndarray:
+        ids = np.array([self.distances.cell_id(node) for node in nodes])
+        dist = np.empty((len(nodes), len(nodes)), dtype=np.int64)
+        for j, node_id in enumerate(ids.tolist()):
+            dist[:, j] = np.asarray(self.distances.row(node_id))[ids]
+        dist[dist < 0] = UNREACHABLE
+        return dist
+
+    @staticmethod
+    def _nearest_neighbor(dist: np.ndarray) -> List[int]:
+        count = len(dist)
+        visited = np.zeros(count, dtype=bool)
+        visited[0] = True
+        order = [0]
+        for _ in range(count - 1):
+            row = np.where(visited, UNREACHABLE + 1, dist[order[-1]])
+            nxt = int(np.argmin(row))
+            visited[nxt] = True
+            order.append(nxt)
+        return order
+
+    @staticmethod
+    def _neighbor_lists(dist: np.ndarray) -> List[List[int]]:
+        k = min(NEIGHBOR_LIST_SIZE + 1, len(dist))
+        nearest = np.argsort(dist, axis=1, kind='stable')[:, :k]
+        return [[j for j in row if j != i] for i, row in enumerate(nearest.tolist())]
+
+    @staticmethod
+    def _two_opt(order: List[int], dist: np.ndarray, neighbor_lists: List[List[int]]) -> bool:
+        """Reverse segments that shorten the open tour (order[0] stays fixed)"""
+        d = dist.tolist()
+        n = len(order)
+        position = [0] * n
+        for i, node in enumerate(order):
+            position[node] = i
+        improved = False
+        for i in range(1, n):
+            a, b = order[i - 1], order[i]
+            for c in neighbor_lists[a]:
+                j = position[c]
+                if j <= i:
+                    continue
+                nxt = order[j + 1] if j + 1 < n else None
+                delta = d[a][c] - d[a][b]
+                if nxt is not None:
+                    delta += d[b][nxt] - d[c][nxt]
+                if delta < 0:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    for k in range(i, j + 1):
+                        position[order[k]] = k
+                    improved = True
+                    break
+        return improved
+
+    @staticmethod
+    def _or_opt(order: List[int], dist: np.ndarray, neighbor_lists: List[List[int]]) -> bool:
+        """Move short segments next to a near neighbour when that shortens the tour"""
+        d = dist.tolist()
+        n = len(order)
+        position = [0] * n
+        for i, node in enumerate(order):
+            position[node] = i
+        improved = False
+        for length in range(1, OR_OPT_SEGMENT + 1):
+            for i in range(1, n - length + 1):
+                segment = order[i:i + length]
+                first, last = segment[0], segment[-1]
+                prev = order[i - 1]
+                nxt = order[i + length] if i + length < n else None
+                gain = d[prev][first] + (d[last][nxt] - d[prev][nxt] if nxt is not None else 0)
+
+                best = None
+                for c in neighbor_lists[first] + neighbor_lists[last]:
+                    k = position[c]
+                    if i <= k < i + length:
+                        continue
+                    # Successor of c once the segment is taken out
+                    succ_index = k + 1 if k + 1 != i else i + length
+                    succ = order[succ_index] if succ_index < n else None
+                    for seg in (segment, segment[::-1]):
+                        cost = d[c][seg[0]]
+                        if succ is not None:
+                            cost += d[seg[-1]][succ] - d[c][succ]
+                        if cost < gain and (best is None or cost < best[0]):
+                            best = (cost, c, seg)
+                if best is not None:
+                    _, c, seg = best
+                    rest = order[:i] + order[i + length:]
+                    k = rest.index(c)
+                    order[:] = rest[:k + 1] + seg + rest[k + 1:]
+                    for j, node in enumerate(order):
+                        position[node] = j
+                    improved = True
+        return improved
+
+    def _drop_eaten(self, maze):
+        while self.tour and maze.get_cell_type(*self.tour[0]) not in (CellType.PELLET, CellType.POWER_PELLET):
+            self.tour.pop(0)
+
+    def _reenter(self, current_pos: Tuple[int, int]):
+        """After a detour, start from the nearest of the next few tour pellets"""
+        window = self.tour[:HEAD_WINDOW]
+        distances = [self.distances.distance(current_pos, p) for p in window]
+        best = min(range(len(window)), key=lambda i: distances[i] if distances[i] >= 0 else UNREACHABLE)
+        if best:
+            self.tour.insert(0, self.tour.pop(best))
+
+    def _defer_head(self):
+        """Move the blocked head pellet to its cheapest later position in the tour"""
+        pellet = self.tour.pop(0)
+        self.deferrals += 1
+        if not self.tour:
+            self.tour.append(pellet)
+            return
+        best_index, best_cost = len(self.tour), self.distances.distance(self.tour[-1], pellet)
+        for k in range(1, len(self.tour)):
+            a, b = self.tour[k - 1], self.tour[k]
+            cost = (self.distances.distance(a, pellet) + self.distances.distance(pellet, b)
+                    - self.distances.distance(a, b))
+            if cost < best_cost:
+                best_index, best_cost = k, cost
+        self.tour.insert(best_index, pellet)
+
+    def next_target(self, current_pos: Tuple[int, int], maze,
+                    is_blocked: Optional[Callable[[Tuple[int, int]], bool]] = None,
+                    detoured: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        Next pellet to head for, or None. Builds the tour on first use (and
+        when it runs out while pellets remain), drops eaten pellets, re-enters
+        the tour at a nearby pellet after a detour and defers pellets whose
+        approach is blocked by ghosts.
+        """
+        self._drop_eaten(maze)
+        if not self.tour:
+            pellets = maze.pellet_positions()
+            if not pellets:
+                return None
+            self.build(current_pos, pellets)
+            if not self.tour:
+                return None
+        elif detoured:
+            self._reenter(current_pos)
+
+        for _ in range(min(MAX_DEFERRALS, len(self.tour))):
+            head = self.tour[0]
+            if is_blocked is None or not is_blocked(head):
+                return head
+            self._defer_head()
+            self._drop_eaten(maze)
+        return None
@@ -5,14 +5,30 @@ CELL_SIZE = 30
 MAZE_WIDTH = 20
 MAZE_HEIGHT = 16
 SCOREBOARD_HEIGHT = 60  # Height of the scoreboard area
-SCREEN_WIDTH = MAZE_WIDTH * CELL_SIZE
-SCREEN_HEIGHT = MAZE_HEIGHT * CELL_SIZE + SCOREBOARD_HEIGHT
+VIEW_WIDTH = MAZE_WIDTH    # Cells shown at once; bigger mazes scroll to follow Pacman
+VIEW_HEIGHT = MAZE_HEIGHT
+SCREEN_WIDTH = VIEW_WIDTH * CELL_SIZE
+SCREEN_HEIGHT = VIEW_HEIGHT * CELL_SIZE + SCOREBOARD_HEIGHT
+MINIMAP_SIZE = 150         # Longer side of the minimap (pixels)
+MINIMAP_MARGIN = 10        # Gap between the minimap and the view's corner (pixels)
 
-# Game settings
+# Game settings (speeds and timers are per simulation tick)
 PACMAN_SPEED = 0.20
 GHOST_SPEED = 0.08
 FPS = 60
 
+# Fixed-timestep simulation
+TICK_RATE = 60               # Simulation ticks per second of game time
+MAX_FRAME_TIME = 0.25        # Longest real frame time fed to the simulation (seconds)
+TURBO_SPEED = 20             # Game-time multiplier in turbo mode
+UNRENDERED_TICK_BATCH = 600  # Ticks run between event polls when rendering is off
+
+# Swarm mode
+SWARM_GHOST_COUNT = 500
+
+# Precompiled layout artifacts (see src/core/map_loader.py)
+LAYOUT_CACHE_DIR = ".cache/layouts"
+
 class CellType(Enum):
     WALL = 0
     PATH = 1
@@ -24,4 +40,7 @@ class Direction(Enum):
     UP = (0, -1)
     DOWN = (0, 1)
     LEFT = (-1, 0)
-    RIGHT = (1, 0)
\ No newline at end of file
+    RIGHT = (1, 0)
+
+# Neighbour order shared by the maze loader, topology and search algorithms (up, right, down, left)
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
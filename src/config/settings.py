@@ -0,0 +1,52 @@
+import json
+from typing import Dict
+
+
+class AgentSettings:
+    """
+    Tunable agent parameters. The defaults are the hand-picked values the
+    agents have always used; sweep.py searches over them.
+    """
+    DEFAULTS = {
+        # Pacman
+        'danger_radius': 2,                # Pacman flees once a ghost is this close (Manhattan cells)
+        'safe_radius': 1,                  # Pacman won't step within this of a ghost
+        'power_duration': 600,             # Ticks a power pellet lasts for Pacman (10 seconds)
+        'block_lookahead': 6,              # Path cells checked for ghosts before committing to a pellet
+        # Ghosts
+        'frightened_duration': 600,        # Ticks ghosts stay frightened (10 seconds)
+        'frightened_safe_distance': 3,     # Frightened ghosts prefer moves further than this from Pacman
+        'direction_change_cooldown': 2,    # Ticks a ghost keeps its direction after choosing one
+        'stuck_limit': 5,                  # Ticks in the same cell before a ghost picks a random way out
+        'same_direction_bonus': 0.5,       # Chase score bonus for keeping the current direction
+        'reversal_penalty': 1.0,           # Chase score penalty for turning back
+    }
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown agent settings: {', '.join(sorted(unknown))}")
+        for name, default in self.DEFAULTS.items():
+            value = overrides.get(name, default)
+            setattr(self, name, type(default)(value))
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+    def replace(self, **changes) -> 'AgentSettings':
+        """Copy with some values changed"""
+        return AgentSettings(**{**self.as_dict(), **changes})
+
+    @classmethod
+    def load(cls, path) -> 'AgentSettings':
+        """Settings from a JSON object of overrides, or the best entry of a sweep.py ranking"""
+        with open(path) as f:
+            data = json.load(f)
+        if 'ranking' in data:
+            data = data['ranking'][0]['settings']
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        changed = {name: value for name, value in self.as_dict().items()
+                   if value != self.DEFAULTS[name]}
+        return f"AgentSettings({', '.join(f'{k}={v!r}' for k, v in changed.items())})"
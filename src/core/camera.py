@@ -0,0 +1,92 @@
+from typing import Tuple
+
+import numpy as np
+import pygame
+
+from ..config.constants import CELL_SIZE, MINIMAP_SIZE
+
+
+class Camera:
+    """
+    Window onto the maze, view_width x view_height cells, that keeps a
+    target (usually Pacman) centred. The view stops at the maze's edges, so
+    a maze no bigger than the view is drawn exactly as before.
+    """
+
+    def __init__(self, view_width: int, view_height: int):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.x = 0.0  # Top-left corner of the view, in pixels of the maze
+        self.y = 0.0
+        self.maze_width = view_width
+        self.maze_height = view_height
+
+    def set_bounds(self, maze_width: int, maze_height: int):
+        self.maze_width = maze_width
+        self.maze_height = maze_height
+
+    def follow(self, x: float, y: float):
+        """Centre the view on a (fractional) cell position"""
+        view_w, view_h = self.view_width * CELL_SIZE, self.view_height * CELL_SIZE
+        max_x = max(0, self.maze_width * CELL_SIZE - view_w)
+        max_y = max(0, self.maze_height * CELL_SIZE - view_h)
+        self.x = float(min(max(x * CELL_SIZE + CELL_SIZE / 2 - view_w / 2, 0), max_x))
+        self.y = float(min(max(y * CELL_SIZE + CELL_SIZE / 2 - view_h / 2, 0), max_y))
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """Pixel offset to add to maze coordinates to get view coordinates"""
+        return -int(self.x), -int(self.y)
+
+    def visible_cells(self) -> Tuple[int, int, int, int]:
+        """Inclusive cell rectangle (x0, y0, x1, y1) the view overlaps"""
+        x0, y0 = int(self.x // CELL_SIZE), int(self.y // CELL_SIZE)
+        x1 = min(self.maze_width - 1, int((self.x + self.view_width * CELL_SIZE - 1) // CELL_SIZE))
+        y1 = min(self.maze_height - 1, int((self.y + self.view_height * CELL_SIZE - 1) // CELL_SIZE))
+        return x0, y0, x1, y1
+
+    @property
+    def scrolls(self) -> bool:
+        """Whether the maze is bigger than the view"""
+        return self.maze_width > self.view_width or self.maze_height > self.view_height
+
+
+class Minimap:
+    """
+    Whole-maze overview: the walls are drawn one pixel per cell and scaled
+    down once per wall layout (Maze.version); each frame only blits that
+    surface and marks the view rectangle and Pacman on top.
+    """
+
+    WALL_COLOR = (40, 40, 160)
+    PATH_COLOR = (0, 0, 0)
+    VIEW_COLOR = (255, 255, 255)
+    PACMAN_COLOR = (255, 255, 0)
+
+    def __init__(self, size: int = MINIMAP_SIZE):
+        self.size = size
+        self.surface = None
+        self.version = None
+        self.scale = 1.0
+
+    def _build(self, maze):
+        pixels = np.where(maze.walkable.T[:, :, None], self.PATH_COLOR, self.WALL_COLOR).astype(np.uint8)
+        full = pygame.surfarray.make_surface(pixels)
+        self.scale = self.size / max(maze.width, maze.height)
+        self.surface = pygame.transform.scale(
+            full, (max(1, round(maze.width * self.scale)), max(1, round(maze.height * self.scale))))
+        self.version = maze.version
+
+    def draw(self, screen, maze, camera: Camera, pacman_pos: Tuple[float, float], topright: Tuple[int, int]):
+        if self.version != maze.version:
+            self._build(maze)
+        left, top = topright[0] - self.surface.get_width(), topright[1]
+        screen.blit(self.surface, (left, top))
+        cell = self.scale / CELL_SIZE  # Minimap pixels per maze pixel
+        view = pygame.Rect(left + int(camera.x * cell), top + int(camera.y * cell),
+                           max(2, int(camera.view_width * CELL_SIZE * cell)),
+                           max(2, int(camera.view_height * CELL_SIZE * cell)))
+        pygame.draw.rect(screen, self.VIEW_COLOR, view, 1)
+        pygame.draw.circle(screen, self.PACMAN_COLOR,
+                           (left + int((pacman_pos[0] + 0.5) * self.scale),
+                            top + int((pacman_pos[1] + 0.5) * self.scale)), 2)
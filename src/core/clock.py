@@ -0,0 +1,29 @@
+from ..config.constants import TICK_RATE, MAX_FRAME_TIME
+
+
+class FixedTimestepClock:
+    """Turns real frame times into a whole number of fixed simulation ticks"""
+
+    def __init__(self, tick_rate: int = TICK_RATE, max_frame_time: float = MAX_FRAME_TIME):
+        self.tick_duration = 1.0 / tick_rate
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.speed = 1
+
+    def advance(self, frame_time: float) -> int:
+        """Add a real frame time (seconds) and return how many ticks to simulate"""
+        # Clamp long frames so a stall can't trigger an endless catch-up
+        frame_time = min(frame_time, self.max_frame_time)
+        self.accumulator += frame_time * self.speed
+        ticks = int(self.accumulator / self.tick_duration)
+        self.accumulator -= ticks * self.tick_duration
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of the next tick already elapsed, used to interpolate rendering"""
+        return self.accumulator / self.tick_duration
+
+    def reset(self):
+        """Drop any accumulated time"""
+        self.accumulator = 0.0
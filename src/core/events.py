@@ -0,0 +1,36 @@
+from typing import Callable, Dict, List
+
+# Event kinds and their payloads (keyword arguments passed to handlers)
+PELLET_EATEN = 'pellet_eaten'        # x, y, power: bool
+POWER_START = 'power_start'          # duration (ticks); also sent when a power-up is renewed
+POWER_END = 'power_end'              # -
+TARGET_SELECTED = 'target_selected'  # target, cell: the pellet the AI heads for next, from where
+GHOST_EATEN = 'ghost_eaten'          # cell, count
+PACMAN_DIED = 'pacman_died'          # cell
+LEVEL_CLEARED = 'level_cleared'      # -
+
+Handler = Callable[..., None]
+
+
+class EventBus:
+    """
+    Synchronous publish/subscribe between the game's parts: emitters call
+    emit() when something happens, and every handler subscribed to that
+    kind runs once, in subscription order, before emit() returns.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.tick = 0  # Tick being simulated, for handlers that log
+
+    def subscribe(self, kind: str, handler: Handler):
+        self.handlers.setdefault(kind, []).append(handler)
+
+    def unsubscribe(self, kind: str, handler: Handler):
+        handlers = self.handlers.get(kind, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def emit(self, kind: str, **payload):
+        for handler in self.handlers.get(kind, ()):
+            handler(**payload)
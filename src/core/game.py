@@ -1,54 +1,94 @@
 # Required imports
 import pygame
-import math
+import random
+import numpy as np
 import time
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from ..config.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, CELL_SIZE,
-                              MAZE_WIDTH, MAZE_HEIGHT, SCOREBOARD_HEIGHT, CellType)
+                              MAZE_WIDTH, MAZE_HEIGHT, SCOREBOARD_HEIGHT,
+                              TICK_RATE, TURBO_SPEED, VIEW_WIDTH, VIEW_HEIGHT, MINIMAP_MARGIN)
 from ..config.maze_layouts import LEVEL_1
+from ..config.settings import AgentSettings
 from ..environment.maze import Maze
+from ..environment.spatial_index import SpatialIndex
+from ..environment.state import GameState
 from ..agents.pacman import PacmanAgent
-from ..agents.ghost import GhostAgent
+from ..agents.ghost_store import GhostStore, NO_DIRECTION
 from ..utils.sound_manager import SoundManager
+from .camera import Camera, Minimap
+from .hud import Hud
+from .quality import QualityGovernor
+from .sprites import (BackgroundFrames, PelletSprites, WallLayer, draw_gradient,
+                      glow_sprite, shadow_sprite)
+from .clock import FixedTimestepClock
+from .events import (EventBus, PELLET_EATEN, POWER_START, GHOST_EATEN, PACMAN_DIED,
+                     LEVEL_CLEARED)
+from .map_loader import LevelData, LayoutArtifacts
+from ..algorithms.distances import BFSDistanceCache, TableDistances
+from ..algorithms.cooperative import CooperativeGhostPlanner
+from ..algorithms.search import (AStarSearch, BreadthFirstSearch, UniformCostSearch,
+                                 BidirectionalBFS, BidirectionalAStar)
+from ..algorithms.path_cache import PathCache
+from ..algorithms.search_stats import SearchStats
+from ..utils.telemetry import Telemetry
 
 
 # Initialize Pygame
 pygame.init()
 
 class Game:
-    def __init__(self):
-        """Initialize the game state"""
-        # Initialize display
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("PACMAN AI")
-        
+    def __init__(self, headless: bool = False, level: Optional[LevelData] = None,
+                 ghost_count: Optional[int] = None,
+                 artifacts: Optional[LayoutArtifacts] = None,
+                 cooperative: bool = False,
+                 search_stats: Optional[SearchStats] = None,
+                 telemetry: Optional[Telemetry] = None,
+                 settings: Optional[AgentSettings] = None,
+                 seed: Optional[int] = None):
+        """
+        Initialize the game state (LEVEL_1 unless another level is given).
+        ghost_count overrides the one-ghost-per-start default (swarm mode);
+        artifacts are the level's precompiled layout data, if loaded;
+        cooperative makes the ghosts plan their hunt together;
+        search_stats, if given, collects search algorithm statistics on
+        Pacman's real queries and is dumped at the end of every game;
+        telemetry, if given, receives per-tick samples and game events;
+        settings are the agents' tunable parameters (defaults if omitted);
+        seed, if given, makes every game after a reset play out the same.
+        """
+        self.headless = headless
+        self.level = level if level is not None else LevelData("Level 1", LEVEL_1)
+        self.ghost_count = ghost_count
+        self.artifacts = artifacts
+        self.distances = None
+        self.path_cache = PathCache()  # Pacman's path queries; outlives resets, like the walls
+        self.cooperative = cooperative
+        self.ghost_planner = None
+        self.search_stats = search_stats
+        self.search_stats_path: Optional[str] = None  # Also write the dump as JSON here
+        self.telemetry = telemetry
+        self.settings = settings if settings is not None else AgentSettings()
+        self.seed = seed
 
         # Initialize pygame and sound
         pygame.init()
-        pygame.mixer.init()
-        
-        # Initialize display
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("PACMAN AI")
-        
-        # Initialize sound manager
-        self.sound_manager = SoundManager()
-        try:
-            self.sound_manager.load_sounds()
-            print("Sound system initialized successfully")
-        except Exception as e:
-            print(f"Warning: Sound initialization failed: {e}")
-        
-        # Play start sound
-        try:
-            self.sound_manager.play_sound('game_start')
-        except Exception as e:
-            print(f"Warning: Could not play start sound: {e}")
+
+        # Initialize display (an off-screen surface when headless)
+        if headless:
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("PACMAN AI")
+
+        # Initialize sound manager (sounds are decoded once and kept across resets)
+        self.sound_manager = SoundManager(headless=headless)
+        print(f"Sound system initialized ({self.sound_manager.backend.name} backend)")
 
         # Initialize fonts
         pygame.font.init()
         self.font = pygame.font.Font(None, 30)
         self.small_font = pygame.font.Font(None, 30)
+        self.hud = Hud(self.font, self.small_font, SCREEN_WIDTH, SCREEN_HEIGHT, SCOREBOARD_HEIGHT)
         
         # Colors
         self.BLACK = (0, 0, 0)
@@ -62,39 +102,83 @@ class Game:
         self.PURPLE = (128, 0, 128)
         self.GRAY = (128, 128, 128)
         
-        # Visual effects
+        # Visual effects, animated from cached frames and sprites
         self.pellet_animation = 0
         self.bg_animation = 0
         self.flash_timer = 0
+        self.background = BackgroundFrames(SCREEN_WIDTH, SCREEN_HEIGHT - SCOREBOARD_HEIGHT)
+        self.pellet_sprites = PelletSprites()
+        self.wall_layer = WallLayer(VIEW_WIDTH, VIEW_HEIGHT)
+        self.shadow = shadow_sprite(int(CELL_SIZE * 0.8 // 2))
+        self.glow = glow_sprite(int(CELL_SIZE * 1.2))
+        self.quality = QualityGovernor()  # Drops decoration when frames run over budget
+
+        # Fixed-timestep simulation clock; rendering can be switched off in turbo mode
+        self.clock = FixedTimestepClock(TICK_RATE)
+        self.render_enabled = True
+
+        # Scrolling view onto mazes bigger than the screen, and an optional overview
+        self.camera = Camera(VIEW_WIDTH, VIEW_HEIGHT)
+        self.minimap = Minimap()
+        self.show_minimap = False
+        self.follow_index: Optional[int] = None  # Ghost slot the camera follows, None for Pacman
+
+        # Game rules react to what the agents and the maze report instead of
+        # polling for it every tick; the bus outlives resets
+        self.events = EventBus()
+        self.events.subscribe(PELLET_EATEN, self._on_pellet_eaten)
+        self.events.subscribe(POWER_START, self._on_power_start)
+        self.events.subscribe(GHOST_EATEN, self._on_ghost_eaten)
+        self.events.subscribe(PACMAN_DIED, self._on_pacman_died)
+        self.events.subscribe(LEVEL_CLEARED, self._on_level_cleared)
+        if telemetry is not None:
+            telemetry.attach(self)
         
         # Initialize game state
         self.reset_game()
 
-        self.sound_manager = SoundManager()
-        self.sound_manager.load_sounds()
-
 
     def _count_initial_pellets(self) -> int:
         """Count initial number of pellets and power pellets"""
-        count = 0
-        for y in range(self.maze.height):
-            for x in range(self.maze.width):
-                cell = self.maze.grid[y][x]
-                if cell in [CellType.PELLET, CellType.POWER_PELLET]:
-                    count += 1
-        return count
+        return self.maze.pellets_remaining()
 
     def reset_game(self):
         """Reset the game state"""
+        if self.seed is not None:
+            random.seed(self.seed)
+
         # Initialize maze
         self.maze = Maze(MAZE_WIDTH, MAZE_HEIGHT)
-        self.maze.load_layout(LEVEL_1)
+        self.maze.load_layout(self.level.layout)
+        self.maze.events = self.events
+        self.camera.set_bounds(self.maze.width, self.maze.height)
         
         # Initialize Pacman
         pacman_x, pacman_y = self.maze.pacman_start
-        self.pacman = PacmanAgent(pacman_x, pacman_y)
+        self.pacman = PacmanAgent(pacman_x, pacman_y, self.settings)
+        self.pacman.events = self.events
+
+        # Wall-aware distances outlive resets since walls never change
+        if self.distances is None:
+            self.distances = (TableDistances(self.artifacts) if self.artifacts is not None
+                              else BFSDistanceCache(self.maze))
+        self.pacman.distances = self.distances
+        self.pacman.planner.distances = self.distances
+        self.pacman.search_algorithm.cache = self.path_cache
+
+        # Replay Pacman's queries through every search algorithm to compare them
+        if self.search_stats is not None:
+            self.search_stats.source = ("adaptive:* rows are Pacman's own queries (tour-leg lookahead, fallback); "
+                                        "the others replay each new tour target through every algorithm")
+            self.pacman.search_algorithm.stats = self.search_stats
+            self.pacman.shadow_searches = [BreadthFirstSearch(), AStarSearch(), UniformCostSearch(),
+                                           BidirectionalBFS(), BidirectionalAStar()]
+            for algorithm in self.pacman.shadow_searches:
+                algorithm.stats = self.search_stats
         
-        # Initialize ghosts with different colors
+        # Initialize ghosts with different colors; their state lives in one GhostStore
+        ghost_count = self.ghost_count or len(self.maze.ghost_starts)
+        self.ghost_store = GhostStore(capacity=ghost_count, seed=self.seed, settings=self.settings)
         self.ghosts = []
         ghost_colors = [
             (255, 0, 0),    # Blinky (red)
@@ -103,16 +187,28 @@ class Game:
             (255, 182, 85)   # Clyde (orange)
         ]
         ghost_corners = [
-            (MAZE_WIDTH-1, 0),        # Top-right
+            (self.maze.width-1, 0),        # Top-right
             (0, 0),                   # Top-left
-            (MAZE_WIDTH-1, MAZE_HEIGHT-1),  # Bottom-right
-            (0, MAZE_HEIGHT-1)        # Bottom-left
+            (self.maze.width-1, self.maze.height-1),  # Bottom-right
+            (0, self.maze.height-1)        # Bottom-left
         ]
         
-        for (x, y), color, corner in zip(self.maze.ghost_starts, ghost_colors, ghost_corners):
-            ghost = GhostAgent(x, y, color)
-            ghost.set_home_corner(corner)
+        for i in range(ghost_count if self.maze.ghost_starts else 0):
+            x, y = self.maze.ghost_starts[i % len(self.maze.ghost_starts)]
+            ghost = self.ghost_store.spawn(x, y, ghost_colors[i % len(ghost_colors)])
+            ghost.set_home_corner(ghost_corners[i % len(ghost_corners)])
             self.ghosts.append(ghost)
+
+        # Ghost cell occupancy for collision, danger and culling queries
+        self.ghost_index = SpatialIndex(self.maze.width, self.maze.height)
+        self.ghost_index.sync(*self.ghost_store.cells())
+        self.pacman.ghost_index = self.ghost_index
+
+        # Cooperative ghost planning (plans refer to this game's ghost slots)
+        if self.cooperative:
+            if self.ghost_planner is None:
+                self.ghost_planner = CooperativeGhostPlanner(self.distances)
+            self.ghost_planner.reset()
         
         # Game state
         self.is_game_over = False
@@ -121,267 +217,235 @@ class Game:
         self.total_pellets = self._count_initial_pellets()
         self.final_message = ""
         
-        # Time tracking
+        # Time tracking (game time, derived from simulation ticks)
         self.start_time = time.time()
+        self.tick_count = 0
         self.time_elapsed = 0
+        self.events.tick = 0
         
         # Ghost mode timing
         self.ghost_mode_timer = 0
         self.ghost_mode_scatter = True
 
+        self.sound_manager.reset()
         self.sound_manager.play_sound('game_start')
 
+        if self.telemetry is not None:
+            self.telemetry.event(0, 'game_start', count=ghost_count, pellets=self.total_pellets,
+                                 detail=self.level.name)
+
 
     
-    def draw(self):
-        """Draw the current game state"""
+    def draw(self, alpha: float = 1.0):
+        """Draw the current game state, interpolating agents `alpha` of the way into the last tick"""
         # Draw background and maze base
         self.screen.fill(self.BLACK)
         self.draw_maze_background()
         
-        # Draw scoreboard with gradient
-        scoreboard_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCOREBOARD_HEIGHT)
-        self.draw_gradient_rect(scoreboard_rect, self.DARK_BLUE, self.NAVY_BLUE)
-        
-        # Draw game info
-        score_text = self.font.render(f'Score: {self.score}', True, self.WHITE)
-        self.screen.blit(score_text, (20, 10))
-        
-        pellets_text = self.font.render(
-            f'Pellets: {self.count_pellets()}/{self.total_pellets}', 
-            True, self.WHITE)
-        pellets_rect = pellets_text.get_rect()
-        self.screen.blit(pellets_text, (SCREEN_WIDTH - pellets_rect.width - 20, 10))
+        # Draw scoreboard and game info (cached surfaces, re-rendered only when values change)
+        now = time.time()
+        self.hud.draw(self.screen, self.score, self.count_pellets(), self.total_pellets,
+                      self.time_elapsed, now)
         
-        # Draw time with pulsing effect
-        time_color = (255, 
-                     255 - int(abs(math.sin(time.time() * 2)) * 100), 
-                     255 - int(abs(math.sin(time.time() * 2)) * 100))
-        time_text = self.small_font.render(
-            f'Time: {self.time_elapsed}s', True, time_color)
-        self.screen.blit(time_text, (SCREEN_WIDTH // 2 - time_text.get_width() // 2, 20))
-        
-        # Draw maze content
-        maze_offset_y = SCOREBOARD_HEIGHT
-        for y in range(self.maze.height):
-            for x in range(self.maze.width):
-                cell_rect = pygame.Rect(
-                    x * CELL_SIZE, 
-                    y * CELL_SIZE + maze_offset_y, 
-                    CELL_SIZE, 
-                    CELL_SIZE
-                )
-                
-                cell = self.maze.grid[y][x]
-                if cell == CellType.WALL:
-                    # Draw walls with gradient
-                    wall_rect = pygame.Rect(
-                        x * CELL_SIZE + 1, 
-                        y * CELL_SIZE + maze_offset_y + 1, 
-                        CELL_SIZE - 2, 
-                        CELL_SIZE - 2
-                    )
-                    self.draw_gradient_rect(wall_rect, self.BLUE, self.DARK_BLUE)
-                elif cell == CellType.PELLET:
-                    # Animated pellets
-                    size = 4 + math.sin(self.pellet_animation + x * 0.5 + y * 0.5)
-                    pygame.draw.circle(
-                        self.screen,
-                        self.WHITE,
-                        (x * CELL_SIZE + CELL_SIZE // 2,
-                         y * CELL_SIZE + CELL_SIZE // 2 + maze_offset_y),
-                        size
-                    )
-                elif cell == CellType.POWER_PELLET:
-                    # Pulsing power pellets
-                    size = 8 + math.sin(self.pellet_animation * 2) * 2
-                    color = (255, 255, int(128 + math.sin(self.pellet_animation) * 127))
-                    pygame.draw.circle(
-                        self.screen,
-                        color,
-                        (x * CELL_SIZE + CELL_SIZE // 2,
-                         y * CELL_SIZE + CELL_SIZE // 2 + maze_offset_y),
-                        size
-                    )
+        # Point the camera at the followed agent; only cells and agents in view are drawn
+        self.camera.follow(*self._follow_target().interpolated_position(alpha))
+        offset_x, offset_y = self.camera.offset
+        maze_offset_y = SCOREBOARD_HEIGHT + offset_y
+        x0, y0, x1, y1 = self.camera.visible_cells()
+        self.screen.set_clip(pygame.Rect(0, SCOREBOARD_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - SCOREBOARD_HEIGHT))
+
+        # Draw maze content: cached wall layer, then animated pellets in one batch
+        self.wall_layer.draw(self.screen, self.maze, (x0, y0), (offset_x, maze_offset_y))
+        self.pellet_sprites.sync(self.maze)
+        self.pellet_sprites.draw(self.screen, self.pellet_animation, (x0, y0, x1, y1),
+                                 (offset_x, maze_offset_y))
         
         self.pellet_animation += 0.1
         
-        # Draw ghosts with shadows
-        for ghost in self.ghosts:
-            # Draw ghost shadow
-            shadow_pos = (
-                int(ghost.x * CELL_SIZE + CELL_SIZE // 2) + 4,
-                int(ghost.y * CELL_SIZE + CELL_SIZE // 2) + maze_offset_y + 4
-            )
-            shadow_radius = int(CELL_SIZE * 0.8 // 2)
-            shadow_surface = pygame.Surface((shadow_radius * 2, shadow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(shadow_surface, (0, 0, 0, 64), 
-                             (shadow_radius, shadow_radius), shadow_radius)
-            self.screen.blit(shadow_surface, 
-                           (shadow_pos[0] - shadow_radius, shadow_pos[1] - shadow_radius))
+        # Draw ghosts with shadows (only those whose cell is in view, or moving into it)
+        quality = self.quality
+        visible = self.ghost_index.in_region(max(0, x0 - 1), max(0, y0 - 1), x1 + 1, y1 + 1)
+        shadow_radius = self.shadow.get_width() // 2
+        for ghost in (self.ghosts[i] for i in sorted(visible)):
+            if quality.shadows:
+                ghost_x, ghost_y = ghost.interpolated_position(alpha)
+                shadow_pos = (
+                    int(ghost_x * CELL_SIZE + CELL_SIZE // 2) + offset_x + 4,
+                    int(ghost_y * CELL_SIZE + CELL_SIZE // 2) + maze_offset_y + 4
+                )
+                self.screen.blit(self.shadow,
+                                 (shadow_pos[0] - shadow_radius, shadow_pos[1] - shadow_radius))
             
-            ghost.draw(self.screen, maze_offset_y)
+            ghost.draw(self.screen, maze_offset_y, alpha, offset_x)
         
         # Draw Pacman
-        if self.pacman.is_powered_up:
+        pacman_x, pacman_y = self.pacman.interpolated_position(alpha)
+        if self.pacman.is_powered_up and quality.glow:
             # Add glow effect when powered up
-            glow_radius = int(CELL_SIZE * 1.2)
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            center = (glow_radius, glow_radius)
-            for i in range(10):
-                alpha = int(25 * (1 - i/10))
-                pygame.draw.circle(glow_surface, (255, 255, 0, alpha), center, glow_radius - i * 2)
+            glow_radius = self.glow.get_width() // 2
             glow_pos = (
-                int(self.pacman.x * CELL_SIZE + CELL_SIZE // 2) - glow_radius,
-                int(self.pacman.y * CELL_SIZE + CELL_SIZE // 2) + maze_offset_y - glow_radius
+                int(pacman_x * CELL_SIZE + CELL_SIZE // 2) + offset_x - glow_radius,
+                int(pacman_y * CELL_SIZE + CELL_SIZE // 2) + maze_offset_y - glow_radius
             )
-            self.screen.blit(glow_surface, glow_pos)
+            self.screen.blit(self.glow, glow_pos)
             
-        self.pacman.draw(self.screen, maze_offset_y)
+        self.pacman.draw(self.screen, maze_offset_y, alpha, offset_x, path_dots=quality.path_dots)
+        self.screen.set_clip(None)
+
+        if self.show_minimap:
+            self.minimap.draw(self.screen, self.maze, self.camera, (pacman_x, pacman_y),
+                              (SCREEN_WIDTH - MINIMAP_MARGIN, SCOREBOARD_HEIGHT + MINIMAP_MARGIN))
         
         # Draw game over screen
         if self.is_game_over:
-            # Create semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.fill(self.BLACK)
-            overlay.set_alpha(128)
-            self.screen.blit(overlay, (0, 0))
-            
-            # Draw game over message with animation
-            color = self.GREEN if self.game_won else self.RED
-            scale = 1 + math.sin(time.time() * 4) * 0.1
-            text = self.font.render(self.final_message, True, color)
-            scaled_text = pygame.transform.scale(
-                text, 
-                (int(text.get_width() * scale), 
-                 int(text.get_height() * scale))
-            )
-            text_rect = scaled_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            self.screen.blit(scaled_text, text_rect)
-            
-            # Draw restart instruction with fade effect
-            alpha = int(abs(math.sin(time.time() * 2)) * 255)
-            restart_text = self.small_font.render('Press SPACE to restart or ESC to quit', 
-                                                True, self.WHITE)
-            restart_surface = pygame.Surface(restart_text.get_size(), pygame.SRCALPHA)
-            restart_surface.blit(restart_text, (0, 0))
-            restart_surface.set_alpha(alpha)
-            restart_rect = restart_surface.get_rect(
-                center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50)
-            )
-            self.screen.blit(restart_surface, restart_rect)
-            
-            # Draw final stats
-            stats_text = self.small_font.render(
-                f'Pellets: {self.count_pellets()}/{self.total_pellets} | Time: {self.time_elapsed}s', 
-                True, self.WHITE)
-            stats_rect = stats_text.get_rect(
-                center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 100)
-            )
-            self.screen.blit(stats_text, stats_rect)
+            self.hud.draw_game_over(self.screen, self.final_message, self.game_won, self.count_pellets(),
+                                    self.total_pellets, self.time_elapsed, now)
         
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
+
+    def _follow_target(self):
+        """Agent the camera is centred on"""
+        if self.follow_index is not None and self.follow_index < len(self.ghosts):
+            return self.ghosts[self.follow_index]
+        return self.pacman
+
+    def cycle_follow(self):
+        """Point the camera at the next agent: Pacman, then each ghost in turn"""
+        if self.follow_index is None:
+            self.follow_index = 0 if self.ghosts else None
+        else:
+            self.follow_index = self.follow_index + 1 if self.follow_index + 1 < len(self.ghosts) else None
+        print(f"Camera following {'Pacman' if self.follow_index is None else f'ghost {self.follow_index}'}")
 
     def draw_gradient_rect(self, rect, color1, color2, vertical=True):
         """Draw a rectangle with a gradient between two colors"""
-        if vertical:
-            for i in range(rect.height):
-                factor = i / rect.height
-                color = (
-                    int(color1[0] * (1 - factor) + color2[0] * factor),
-                    int(color1[1] * (1 - factor) + color2[1] * factor),
-                    int(color1[2] * (1 - factor) + color2[2] * factor)
-                )
-                pygame.draw.line(self.screen, color, 
-                               (rect.x, rect.y + i), 
-                               (rect.x + rect.width, rect.y + i))
-        else:
-            for i in range(rect.width):
-                factor = i / rect.width
-                color = (
-                    int(color1[0] * (1 - factor) + color2[0] * factor),
-                    int(color1[1] * (1 - factor) + color2[1] * factor),
-                    int(color1[2] * (1 - factor) + color2[2] * factor)
-                )
-                pygame.draw.line(self.screen, color, 
-                               (rect.x + i, rect.y), 
-                               (rect.x + i, rect.y + rect.height))
+        draw_gradient(self.screen, rect, color1, color2, vertical)
 
     def draw_maze_background(self):
         """Draw animated maze background"""
-        for y in range(0, SCREEN_HEIGHT, 20):
-            for x in range(0, SCREEN_WIDTH, 20):
-                offset = math.sin((x + y + self.bg_animation) / 30) * 2
-                size = 10 + offset
-                pygame.draw.rect(self.screen, self.NAVY_BLUE,
-                               (x, y + SCOREBOARD_HEIGHT, size, size))
-        self.bg_animation = (self.bg_animation + 1) % 360
-
-    def _check_collision(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
-        """Check if two positions are close enough to count as a collision"""
-        distance = math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
-        return distance < 0.7
+        self.screen.blit(self.background.frame(self.bg_animation), (0, SCOREBOARD_HEIGHT))
+        if self.quality.animated_background:
+            self.bg_animation = (self.bg_animation + 1) % 360
 
     def count_pellets(self) -> int:
         """Count current number of pellets"""
-        count = 0
-        for y in range(self.maze.height):
-            for x in range(self.maze.width):
-                cell = self.maze.grid[y][x]
-                if cell in [CellType.PELLET, CellType.POWER_PELLET]:
-                    count += 1
-        return count
+        return self.maze.pellets_remaining()
 
     def check_win_condition(self) -> bool:
         """Check if all pellets have been collected"""
         return self.count_pellets() == 0
 
+    def _on_pellet_eaten(self, x: int, y: int, power: bool):
+        self.pacman.score += 50 if power else 10
+        if self.check_win_condition():
+            self.events.emit(LEVEL_CLEARED)
+
+    def _on_power_start(self, duration: int):
+        # Every ghost's fright (re)starts, so a renewed power-up renews it too
+        store = self.ghost_store
+        newly_frightened = not store.is_frightened[:store.count].all()
+        store.frighten(np.arange(store.count))
+        if newly_frightened:
+            self.sound_manager.play_sound('power_pellet')
+
+    def _on_ghost_eaten(self, cell: Tuple[int, int], count: int):
+        self.pacman.score += 200 * count
+        self.sound_manager.play_sound('ghost_eat')
+
+    def _on_pacman_died(self, cell: Tuple[int, int]):
+        self.is_game_over = True
+        self.game_won = False
+        self.final_message = f"Game Over! Score: {self.pacman.score}"
+        self.sound_manager.play_sound('death')
+
+    def _on_level_cleared(self):
+        self.is_game_over = True
+        self.game_won = True
+        self.final_message = f"You Win! Final Score: {self.pacman.score}"
+        self.sound_manager.play_sound('win')
+
     def update(self):
-        """Update game state"""
+        """Advance the game by one fixed simulation tick"""
         if not self.is_game_over:
+            self.sound_manager.update()
+            self.tick_count += 1
+            self.time_elapsed = self.tick_count // TICK_RATE
+            self.events.tick = self.tick_count
+
+            # Remember tick-start positions for interpolated rendering
+            self.pacman.save_position()
+            self.ghost_store.save_positions()
+
             # Get ghost positions for Pacman AI
-            ghost_positions = [(int(round(ghost.x)), int(round(ghost.y))) 
-                            for ghost in self.ghosts]
+            ghost_positions = self.ghost_store.positions()
             
-            # Update Pacman
+            # Update Pacman (eating, power-ups and clearing the level arrive as events)
             self.pacman.update(self.maze, ghost_positions)
-            pacman_pos = (int(round(self.pacman.x)), int(round(self.pacman.y)))
-            
-            # Update ghosts
-            for ghost in self.ghosts:
-                ghost.update(self.maze, pacman_pos)
-                ghost_pos = (int(round(ghost.x)), int(round(ghost.y)))
-                
-                # Check for collisions
-                if self._check_collision(pacman_pos, ghost_pos):
-                    if ghost.is_frightened:
-                        # Ghost gets eaten
-                        ghost.x, ghost.y = self.maze.ghost_starts[0]
-                        self.pacman.score += 200
-                        self.sound_manager.play_sound('ghost_eat')
-                    else:
-                        # Pacman gets caught
-                        self.is_game_over = True
-                        self.game_won = False
-                        self.final_message = f"Game Over! Score: {self.pacman.score}"
-                        self.sound_manager.play_sound('death')
+            pacman_pos = self.pacman.cell
             
-            # Check for win condition
-            if self.check_win_condition():
-                self.is_game_over = True
-                self.game_won = True
-                self.final_message = f"You Win! Final Score: {self.pacman.score}"
-                self.sound_manager.play_sound('win')
+            # Update all ghosts at once, then check for collisions in Pacman's cell
+            if self.ghost_planner is not None:
+                self.ghost_planner.update(self.ghost_store, self.maze, pacman_pos, self.tick_count)
+            self.ghost_store.update(self.maze, pacman_pos)
+            self.ghost_index.sync(*self.ghost_store.cells())
+            hits = np.fromiter(self.ghost_index.at(pacman_pos), dtype=np.intp)
+            if len(hits) and not self.game_won:
+                frightened = self.ghost_store.is_frightened[hits]
+                eaten = hits[frightened]
+                if len(eaten):
+                    # Ghosts get eaten
+                    self.ghost_store.teleport(eaten, self.maze.ghost_starts[0])
+                    for ghost_id in eaten.tolist():
+                        self.ghost_index.move(ghost_id, self.maze.ghost_starts[0])
+                    self.events.emit(GHOST_EATEN, cell=pacman_pos, count=len(eaten))
+                if not frightened.all():
+                    # Pacman gets caught
+                    self.events.emit(PACMAN_DIED, cell=pacman_pos)
+
+            if self.is_game_over and self.search_stats is not None:
+                self.search_stats.dump(self.search_stats_path, self.path_cache)
             
             # Update score
             self.score = self.pacman.score
-            
-            # Handle power pellet effects
-            if self.pacman.is_powered_up:
-                for ghost in self.ghosts:
-                    if not ghost.is_frightened:
-                        ghost.make_frightened()
-                        self.sound_manager.play_sound('power_pellet')
+
+            if self.telemetry is not None:
+                self.telemetry.sample(self)
+
+    def snapshot(self) -> GameState:
+        """Cheap immutable snapshot of the simulation state, for lookahead, rewinding and replays"""
+        return GameState.capture(self)
+
+    def restore(self, state: GameState):
+        """Roll the game back (or forward) to a snapshot taken since the last reset"""
+        state.apply(self)
+
+    def set_turbo(self, enabled: bool, speed: int = TURBO_SPEED):
+        """Run the simulation at `speed` times game speed (rendering is re-enabled when off)"""
+        self.clock.speed = speed if enabled else 1
+        if not enabled:
+            self.render_enabled = True
+        print(f"Turbo mode: {'x' + str(speed) if enabled else 'off'}")
+
+    def set_cooperative(self, enabled: bool):
+        """Switch cooperative ghost planning on or off"""
+        self.cooperative = enabled
+        if enabled:
+            if self.ghost_planner is None:
+                self.ghost_planner = CooperativeGhostPlanner(self.distances)
+            self.ghost_planner.reset()
+        else:
+            self.ghost_planner = None
+            self.ghost_store.planned_direction[:] = NO_DIRECTION
+        print(f"Cooperative ghosts: {'on' if enabled else 'off'}")
+
+    def simulate(self, max_ticks: int) -> int:
+        """Run up to `max_ticks` simulation ticks without rendering, return ticks run"""
+        ticks = 0
+        while ticks < max_ticks and not self.is_game_over:
+            self.update()
+            ticks += 1
+        return ticks
 
     def handle_events(self) -> bool:
         """Handle pygame events"""
@@ -396,15 +460,15 @@ class Game:
                     self.reset_game()
                 elif event.key == pygame.K_t:  # Toggle AI/Manual control
                     self.pacman.toggle_control_mode()
+                elif event.key == pygame.K_f:  # Toggle turbo mode
+                    self.set_turbo(self.clock.speed == 1)
+                elif event.key == pygame.K_r and self.clock.speed > 1:  # Toggle rendering in turbo
+                    self.render_enabled = not self.render_enabled
+                elif event.key == pygame.K_c:  # Toggle cooperative ghosts
+                    self.set_cooperative(not self.cooperative)
+                elif event.key == pygame.K_v:  # Switch the agent the camera follows
+                    self.cycle_follow()
+                elif event.key == pygame.K_m:  # Toggle the minimap
+                    self.show_minimap = not self.show_minimap
         
         return True
-
-
-    def handle_pellet_collection(self, is_power_pellet):
-        """Handle pellet collection and sounds"""
-        if is_power_pellet:
-            self.sound_manager.play_sound('power_pellet')
-            self.score += 50
-        else:
-            self.sound_manager.play_sound('chomp')
-            self.score += 10
\ No newline at end of file
@@ -0,0 +1,122 @@
+import math
+from collections import OrderedDict
+from typing import Callable, Dict
+
+import pygame
+
+from .sprites import draw_gradient
+
+TEXT_CACHE_SIZE = 128   # Rendered text surfaces kept (least recently used are dropped)
+PULSE_STEPS = 16        # Distinct shades/sizes of the pulsing texts, so they can be cached too
+
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+SCOREBOARD_COLORS = ((0, 0, 139), (0, 0, 128))
+RESTART_MESSAGE = 'Press SPACE to restart or ESC to quit'
+
+
+class TextCache:
+    """
+    LRU cache of rendered surfaces: font renders keyed by (font, text,
+    color), or any surface under a caller's key. A surface is only rendered
+    the first time it's needed.
+    """
+
+    def __init__(self, capacity: int = TEXT_CACHE_SIZE):
+        self.capacity = capacity
+        self.surfaces: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+        self.renders = 0
+
+    def get(self, font, text: str, color) -> pygame.Surface:
+        return self.cached((id(font), text, color), lambda: font.render(text, True, color))
+
+    def cached(self, key: tuple, render: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """The surface stored under key, calling render() to make it on a miss"""
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = render()
+            self.renders += 1
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+def _pulse(now: float, speed: float) -> int:
+    """abs(sin(now * speed)) quantized to 0..PULSE_STEPS"""
+    return round(abs(math.sin(now * speed)) * PULSE_STEPS)
+
+
+class Hud:
+    """
+    Scoreboard and game-over screen. The gradient scoreboard and the dimming
+    overlay are drawn once into preallocated surfaces, and text goes through
+    a TextCache, so a frame only re-renders text whose content changed.
+    The pulsing time is rendered once per second value and tinted from
+    that one render.
+    """
+
+    def __init__(self, font, small_font, width: int, height: int, scoreboard_height: int):
+        self.font = font
+        self.small_font = small_font
+        self.width = width
+        self.height = height
+        self.text = TextCache()
+
+        self.scoreboard = pygame.Surface((width, scoreboard_height))
+        draw_gradient(self.scoreboard, pygame.Rect(0, 0, width, scoreboard_height), *SCOREBOARD_COLORS)
+        self.overlay = pygame.Surface((width, height))
+        self.overlay.fill((0, 0, 0))
+        self.overlay.set_alpha(128)
+        self.scaled = TextCache()  # Pulsing game-over message, one surface per size step
+        self.time_seconds = None
+        self.time_shades: Dict[int, pygame.Surface] = {}  # Tinted copies of the current time text
+
+    def draw(self, screen, score: int, pellets: int, total_pellets: int, seconds: int, now: float):
+        screen.blit(self.scoreboard, (0, 0))
+        screen.blit(self.text.get(self.font, f'Score: {score}', WHITE), (20, 10))
+
+        pellets_text = self.text.get(self.font, f'Pellets: {pellets}/{total_pellets}', WHITE)
+        screen.blit(pellets_text, (self.width - pellets_text.get_width() - 20, 10))
+
+        # Time with pulsing color
+        time_text = self._time_text(seconds, _pulse(now, 2) * 100 // PULSE_STEPS)
+        screen.blit(time_text, (self.width // 2 - time_text.get_width() // 2, 20))
+
+    def _time_text(self, seconds: int, fade: int) -> pygame.Surface:
+        """The time in white tinted towards red by `fade`, rendered once per second value"""
+        if seconds != self.time_seconds:
+            self.time_seconds = seconds
+            self.time_shades = {0: self.small_font.render(f'Time: {seconds}s', True, WHITE)}
+        surface = self.time_shades.get(fade)
+        if surface is None:
+            surface = self.time_shades[fade] = self.time_shades[0].copy()
+            surface.fill((255, 255 - fade, 255 - fade), special_flags=pygame.BLEND_RGB_MULT)
+        return surface
+
+    def _scaled_message(self, message: str, color, step: int) -> pygame.Surface:
+        def render() -> pygame.Surface:
+            text = self.text.get(self.font, message, color)
+            scale = 1 + (step / PULSE_STEPS * 2 - 1) * 0.1
+            return pygame.transform.scale(text, (int(text.get_width() * scale), int(text.get_height() * scale)))
+        return self.scaled.cached((message, color, step), render)
+
+    def draw_game_over(self, screen, message: str, won: bool, pellets: int, total_pellets: int,
+                       seconds: int, now: float):
+        screen.blit(self.overlay, (0, 0))
+        center_x, center_y = self.width // 2, self.height // 2
+
+        # Game over message, gently pulsing in size
+        step = round((math.sin(now * 4) + 1) / 2 * PULSE_STEPS)
+        scaled = self._scaled_message(message, GREEN if won else RED, step)
+        screen.blit(scaled, scaled.get_rect(center=(center_x, center_y)))
+
+        # Restart instruction fading in and out
+        restart = self.text.get(self.small_font, RESTART_MESSAGE, WHITE)
+        restart.set_alpha(_pulse(now, 2) * 255 // PULSE_STEPS)
+        screen.blit(restart, restart.get_rect(center=(center_x, center_y + 50)))
+
+        stats = self.text.get(self.small_font, f'Pellets: {pellets}/{total_pellets} | Time: {seconds}s', WHITE)
+        screen.blit(stats, stats.get_rect(center=(center_x, center_y + 100)))
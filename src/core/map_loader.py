@@ -0,0 +1,325 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..algorithms.distances import TableDistances
+from ..config.constants import DIRECTIONS, LAYOUT_CACHE_DIR
+from ..config.maze_layouts import MazeSymbols
+
+# Bump when the artifact format changes so stale caches are ignored
+CACHE_FORMAT_VERSION = 2
+# Layouts with more walkable cells than this get no all-pairs distance table:
+# it grows with the square of the cell count (a 200x200 arena would need
+# gigabytes and minutes of BFS), so their distance rows are computed on demand
+DENSE_DISTANCE_CELLS = 2048
+
+LEVEL_FILE_SUFFIX = '.level'
+LAYOUT_MARKER = 'layout:'
+
+VALID_SYMBOLS = {
+    MazeSymbols.WALL, MazeSymbols.PATH, MazeSymbols.PELLET, MazeSymbols.POWER_PELLET,
+    MazeSymbols.PACMAN_START, MazeSymbols.GHOST_START, MazeSymbols.EMPTY
+}
+
+
+class LevelData:
+    """A maze layout in MazeSymbols format plus its metadata"""
+
+    def __init__(self, name: str, layout: List[str], metadata: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.layout = layout
+        self.metadata = metadata or {}
+        self.layout_hash = hash_layout(layout)
+
+    @property
+    def width(self) -> int:
+        return len(self.layout[0])
+
+    @property
+    def height(self) -> int:
+        return len(self.layout)
+
+
+def hash_layout(layout: List[str]) -> str:
+    """Stable hash of a layout, used as its cache key"""
+    digest = hashlib.sha256(f"v{CACHE_FORMAT_VERSION}\n".encode())
+    digest.update("\n".join(layout).encode())
+    return digest.hexdigest()[:32]
+
+
+def validate_layout(layout: List[str], source: str = "layout"):
+    """Raise ValueError if a layout is empty, ragged or uses unknown symbols"""
+    if not layout:
+        raise ValueError(f"{source}: empty maze layout")
+    width = len(layout[0])
+    for y, row in enumerate(layout):
+        if len(row) != width:
+            raise ValueError(f"{source}: inconsistent row length at row {y}: "
+                             f"expected {width}, got {len(row)}")
+        unknown = set(row) - VALID_SYMBOLS
+        if unknown:
+            raise ValueError(f"{source}: unknown symbols {sorted(unknown)} at row {y}")
+
+
+def parse_level(text: str, default_name: str = "level") -> LevelData:
+    """
+    Parse a level file: optional `key: value` metadata lines, a `layout:` line,
+    then the layout rows. Lines starting with '#' are comments.
+    """
+    metadata = {}
+    layout = []
+    in_layout = False
+    for line in text.splitlines():
+        if in_layout:
+            if line.strip():
+                layout.append(line.rstrip('\r\n'))
+            continue
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if stripped == LAYOUT_MARKER:
+            in_layout = True
+            continue
+        key, sep, value = stripped.partition(':')
+        if not sep:
+            raise ValueError(f"{default_name}: expected 'key: value' or '{LAYOUT_MARKER}', got {line!r}")
+        metadata[key.strip()] = value.strip()
+
+    validate_layout(layout, default_name)
+    return LevelData(metadata.get('name', default_name), layout, metadata)
+
+
+def load_level_file(path) -> LevelData:
+    """Read a single level file"""
+    path = Path(path)
+    return parse_level(path.read_text(), default_name=path.stem)
+
+
+def load_level_pack(directory) -> List[LevelData]:
+    """Read every level file in a directory, ordered by file name"""
+    directory = Path(directory)
+    files = sorted(directory.glob(f"*{LEVEL_FILE_SUFFIX}"))
+    if not files:
+        raise ValueError(f"No {LEVEL_FILE_SUFFIX} files in level pack {directory}")
+    return [load_level_file(path) for path in files]
+
+
+def format_level(level: LevelData) -> str:
+    """Serialize a level back to the level file format"""
+    lines = [f"{key}: {value}" for key, value in level.metadata.items()]
+    if 'name' not in level.metadata:
+        lines.insert(0, f"name: {level.name}")
+    lines.append(LAYOUT_MARKER)
+    lines.extend(level.layout)
+    return "\n".join(lines) + "\n"
+
+
+class LayoutArtifacts:
+    """
+    Precomputed data for a layout, loaded memory-mapped from the cache:
+      walkable        (H, W) bool
+      cell_ids        (H, W) int32, walkable cell id or -1
+      cells           (C, 2) int32, (x, y) of each cell id
+      pellets         (P, 3) int32, (x, y, is_power) of each pellet
+      distances       (C, C) int16/int32 wall-aware distances, -1 if unreachable;
+                      (0, 0) above DENSE_DISTANCE_CELLS cells (see `dense`)
+      junctions       (J, 2) int32, (x, y) of cells whose degree isn't 2
+      junction_edges  (E, 3) int32, directed (from, to, length) between junction indices
+    """
+    NAMES = ('walkable', 'cell_ids', 'cells', 'pellets', 'distances',
+             'junctions', 'junction_edges')
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        for name in self.NAMES:
+            setattr(self, name, arrays[name])
+        self._oracle = None  # Lazy distance rows when there's no dense table
+
+    def cell_id(self, pos: Tuple[int, int]) -> int:
+        """Id of a cell, or -1 for walls and out-of-bounds positions"""
+        x, y = pos
+        if 0 <= y < self.cell_ids.shape[0] and 0 <= x < self.cell_ids.shape[1]:
+            return int(self.cell_ids[y, x])
+        return -1
+
+    @property
+    def dense(self) -> bool:
+        """Whether the all-pairs distance table was built (small enough layouts only)"""
+        return len(self.distances) == len(self.cells)
+
+    def distance(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        """Wall-aware distance between two cells, -1 if either is a wall or unreachable"""
+        ia, ib = self.cell_id(a), self.cell_id(b)
+        if ia < 0 or ib < 0:
+            return -1
+        if not self.dense:
+            if self._oracle is None:
+                self._oracle = TableDistances(self)
+            return self._oracle.row(ib)[ia]
+        return int(self.distances[ia, ib])
+
+
+def _neighbor_ids(walkable: np.ndarray, cell_ids: np.ndarray, cells: np.ndarray) -> List[List[int]]:
+    height, width = walkable.shape
+    neighbors = []
+    for x, y in cells:
+        ids = []
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and walkable[ny, nx]:
+                ids.append(int(cell_ids[ny, nx]))
+        neighbors.append(ids)
+    return neighbors
+
+
+def _all_pairs_distances(neighbors: List[List[int]]) -> np.ndarray:
+    count = len(neighbors)
+    dtype = np.int16 if count < np.iinfo(np.int16).max else np.int32
+    distances = np.full((count, count), -1, dtype=dtype)
+    for source in range(count):
+        row = [-1] * count
+        row[source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_distance = row[current] + 1
+            for neighbor in neighbors[current]:
+                if row[neighbor] < 0:
+                    row[neighbor] = next_distance
+                    queue.append(neighbor)
+        distances[source] = row
+    return distances
+
+
+def _junction_graph(neighbors: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Junction cell ids and directed corridor edges between them"""
+    is_junction = [len(n) != 2 for n in neighbors]
+    # A loop with no junction still needs one node to anchor it
+    seen = set()
+    for start in range(len(neighbors)):
+        if start in seen:
+            continue
+        component = []
+        queue = deque([start])
+        seen.add(start)
+        while queue:
+            current = queue.popleft()
+            component.append(current)
+            for neighbor in neighbors[current]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        if not any(is_junction[cell] for cell in component):
+            is_junction[min(component)] = True
+
+    junction_ids = [cell for cell, flag in enumerate(is_junction) if flag]
+    index = {cell: i for i, cell in enumerate(junction_ids)}
+    edges = []
+    for cell in junction_ids:
+        for first in neighbors[cell]:
+            previous, current, length = cell, first, 1
+            while not is_junction[current]:
+                nxt = neighbors[current][0] if neighbors[current][0] != previous else neighbors[current][1]
+                previous, current = current, nxt
+                length += 1
+            edges.append((index[cell], index[current], length))
+    return np.array(junction_ids, dtype=np.int32), np.array(edges, dtype=np.int32).reshape(-1, 3)
+
+
+def compile_layout(layout: List[str]) -> Dict[str, np.ndarray]:
+    """Compute all layout artifacts (the expensive part the cache avoids)"""
+    height, width = len(layout), len(layout[0])
+    walkable = np.array([[cell != MazeSymbols.WALL for cell in row] for row in layout], dtype=bool)
+
+    cell_ids = np.full((height, width), -1, dtype=np.int32)
+    ys, xs = np.nonzero(walkable)
+    cell_ids[ys, xs] = np.arange(len(xs), dtype=np.int32)
+    cells = np.stack([xs, ys], axis=1).astype(np.int32)
+
+    pellets = [(x, y, int(cell == MazeSymbols.POWER_PELLET))
+               for y, row in enumerate(layout) for x, cell in enumerate(row)
+               if cell in (MazeSymbols.PELLET, MazeSymbols.POWER_PELLET)]
+
+    neighbors = _neighbor_ids(walkable, cell_ids, cells)
+    junction_cells, junction_edges = _junction_graph(neighbors)
+
+    return {
+        'walkable': walkable,
+        'cell_ids': cell_ids,
+        'cells': cells,
+        'pellets': np.array(pellets, dtype=np.int32).reshape(-1, 3),
+        'distances': (_all_pairs_distances(neighbors) if len(cells) <= DENSE_DISTANCE_CELLS
+                      else np.full((0, 0), -1, dtype=np.int16)),
+        'junctions': cells[junction_cells].reshape(-1, 2),
+        'junction_edges': junction_edges,
+    }
+
+
+class MapLoader:
+    """Loads levels and their precomputed artifacts through an on-disk cache"""
+
+    def __init__(self, cache_dir=LAYOUT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._artifacts: Dict[str, LayoutArtifacts] = {}
+
+    def load_level(self, path) -> LevelData:
+        """Load a level file"""
+        return load_level_file(path)
+
+    def load_pack(self, directory) -> List[LevelData]:
+        """Load every level of a level pack directory"""
+        return load_level_pack(directory)
+
+    def cache_path(self, level: LevelData) -> Path:
+        return self.cache_dir / level.layout_hash
+
+    def is_cached(self, level: LevelData) -> bool:
+        path = self.cache_path(level)
+        return all((path / f"{name}.npy").exists() for name in LayoutArtifacts.NAMES)
+
+    def artifacts(self, level: LevelData) -> LayoutArtifacts:
+        """Return the artifacts of a level, memory-mapping them from the cache when present"""
+        if level.layout_hash in self._artifacts:
+            return self._artifacts[level.layout_hash]
+
+        if not self.is_cached(level):
+            print(f"Compiling layout cache for {level.name} ({level.width}x{level.height})")
+            self._write_cache(level, compile_layout(level.layout))
+
+        path = self.cache_path(level)
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode='r')
+                  for name in LayoutArtifacts.NAMES}
+        artifacts = LayoutArtifacts(arrays)
+        self._artifacts[level.layout_hash] = artifacts
+        return artifacts
+
+    def _write_cache(self, level: LevelData, arrays: Dict[str, np.ndarray]):
+        """Write artifacts to a temporary directory, then move it into place atomically"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-'))
+        try:
+            for name, array in arrays.items():
+                np.save(staging / f"{name}.npy", array)
+            (staging / 'level.txt').write_text(format_level(level))
+            target = self.cache_path(level)
+            if target.exists() and not self.is_cached(level):
+                # Left behind incomplete by an interrupted run
+                shutil.rmtree(target, ignore_errors=True)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # Another process finished the same layout first
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def clear_cache(self):
+        """Remove every cached layout"""
+        self._artifacts.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,109 @@
+import base64
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import maze_layouts
+from ..config.constants import DIRECTIONS
+from .map_loader import DENSE_DISTANCE_CELLS, LayoutArtifacts, LevelData, compile_layout
+
+# Bump when the exported table format changes (checked by web/js/core/navTable.js)
+NAV_FORMAT_VERSION = 2
+NAV_TABLE_DIR = "web/js/data/nav"
+NO_HOP = 255  # nextHop entry for unreachable goals and for a cell to itself
+
+
+def _encode(array: np.ndarray) -> str:
+    """Base64 of an array's little-endian bytes (what JS typed arrays read on every browser)"""
+    return base64.b64encode(array.astype(array.dtype.newbyteorder('<')).tobytes()).decode('ascii')
+
+
+def _require_dense(artifacts: LayoutArtifacts):
+    if not artifacts.dense:
+        raise ValueError(f"{len(artifacts.cells)} walkable cells is too many for a dense nav table "
+                         f"(the limit is DENSE_DISTANCE_CELLS = {DENSE_DISTANCE_CELLS})")
+
+
+def next_hops(artifacts: LayoutArtifacts) -> np.ndarray:
+    """
+    next_hop[a, b]: index into DIRECTIONS of the first move on a shortest path
+    from cell a to cell b. Ties go to the first direction in DIRECTIONS order,
+    the same choice DistanceOracle.path makes. Needs the dense distance table.
+    """
+    _require_dense(artifacts)
+    distances = np.asarray(artifacts.distances).astype(np.int32)
+    cells = np.asarray(artifacts.cells)
+    cell_ids = np.asarray(artifacts.cell_ids)
+    height, width = cell_ids.shape
+    count = len(cells)
+    hops = np.full((count, count), NO_HOP, dtype=np.uint8)
+    for index, (dx, dy) in enumerate(DIRECTIONS):
+        nx, ny = cells[:, 0] + dx, cells[:, 1] + dy
+        inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        neighbor = np.full(count, -1, dtype=np.int64)
+        neighbor[inside] = cell_ids[ny[inside], nx[inside]]
+        has = np.nonzero(neighbor >= 0)[0]
+        # Moving to the neighbour brings every goal it is one step closer to in reach
+        downhill = (distances[neighbor[has]] == distances[has] - 1) & (distances[has] > 0)
+        unset = hops[has] == NO_HOP
+        rows = hops[has]
+        rows[downhill & unset] = index
+        hops[has] = rows
+    return hops
+
+
+def export_nav_table(level: LevelData, artifacts: Optional[LayoutArtifacts] = None) -> Dict:
+    """Compile a level into the JSON-serialisable table the web client loads"""
+    if artifacts is None:
+        artifacts = LayoutArtifacts(compile_layout(level.layout))
+    _require_dense(artifacts)
+    distances = np.asarray(artifacts.distances)
+    count = len(distances)
+    largest = int(distances.max()) if count else 0
+    # Smallest type that holds every distance plus the unreachable marker
+    distance_type = next(t for t in (np.uint8, np.uint16, np.uint32) if largest < np.iinfo(t).max)
+    unreachable = np.iinfo(distance_type).max
+    packed = np.where(distances < 0, unreachable, distances).astype(distance_type)
+
+    return {
+        'version': NAV_FORMAT_VERSION,
+        'name': level.name,
+        'layoutHash': level.layout_hash,
+        'width': level.width,
+        'height': level.height,
+        'cellCount': count,
+        'directions': [list(d) for d in DIRECTIONS],
+        'noHop': NO_HOP,
+        'cellIds': _encode(np.asarray(artifacts.cell_ids).astype(np.int32).ravel()),
+        'distanceType': distance_type.__name__.capitalize(),
+        'unreachable': int(unreachable),
+        'distances': _encode(packed.ravel()),
+        'nextHop': _encode(next_hops(artifacts).ravel()),
+    }
+
+
+def layout_levels() -> List[LevelData]:
+    """Every LEVEL_* layout defined in config/maze_layouts.py"""
+    return [LevelData(name, getattr(maze_layouts, name))
+            for name in sorted(vars(maze_layouts))
+            if name.startswith('LEVEL_') and isinstance(getattr(maze_layouts, name), list)]
+
+
+def table_path(out_dir, level: LevelData) -> Path:
+    return Path(out_dir) / f"{level.name.lower()}.json"
+
+
+def build_nav_tables(out_dir=NAV_TABLE_DIR, levels: Optional[List[LevelData]] = None) -> List[Path]:
+    """Write one navigation table per level into out_dir, return the files written"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for level in levels if levels is not None else layout_levels():
+        table = export_nav_table(level)
+        path = table_path(out_dir, level)
+        path.write_text(json.dumps(table, separators=(',', ':')))
+        print(f"Wrote {path} ({table['cellCount']} cells, {path.stat().st_size // 1024} KiB)")
+        written.append(path)
+    return written
@@ -0,0 +1,70 @@
+from typing import Optional
+
+from ..config.constants import FPS
+
+# Visual quality tiers, best first; each drops one more decoration than the one above
+QUALITY_TIERS = ('full', 'no glow', 'no shadows', 'static background', 'minimal')
+FRAME_TIME_SMOOTHING = 0.1  # Weight of the newest frame in the frame-time average
+DOWNGRADE_LOAD = 0.9        # Step down once frames use this much of the budget...
+DOWNGRADE_FRAMES = 15       # ...for this many frames in a row
+UPGRADE_LOAD = 0.5          # Step back up only once frames use less than this...
+UPGRADE_FRAMES = 180        # ...for this many frames in a row (3 seconds at 60 FPS)
+
+
+class QualityGovernor:
+    """
+    Holds the frame-time budget by trading off decoration. Each frame's busy
+    time (simulation and drawing, not the wait for the next frame) goes into
+    a moving average; while it stays above DOWNGRADE_LOAD of the budget the
+    tier steps down, and only a long stretch well under the budget steps it
+    back up, so the quality doesn't flicker between two tiers.
+    """
+
+    def __init__(self, target_fps: int = FPS, pinned: Optional[int] = None):
+        self.budget = 1.0 / target_fps
+        self.pinned = pinned
+        self.tier = pinned if pinned is not None else 0  # Index into QUALITY_TIERS
+        self.frame_time = 0.0  # Moving average of busy time per frame (seconds)
+        self.over = 0          # Consecutive frames above DOWNGRADE_LOAD
+        self.under = 0         # Consecutive frames below UPGRADE_LOAD
+        self.changes = 0
+
+    @property
+    def glow(self) -> bool:
+        return self.tier < 1
+
+    @property
+    def shadows(self) -> bool:
+        return self.tier < 2
+
+    @property
+    def animated_background(self) -> bool:
+        return self.tier < 3
+
+    @property
+    def path_dots(self) -> bool:
+        return self.tier < 4
+
+    @property
+    def name(self) -> str:
+        return QUALITY_TIERS[self.tier]
+
+    def record(self, busy: float):
+        """Account one frame's busy time (seconds) and adjust the tier"""
+        self.frame_time += FRAME_TIME_SMOOTHING * (busy - self.frame_time)
+        if self.pinned is not None:
+            return
+        load = self.frame_time / self.budget
+        self.over = self.over + 1 if load > DOWNGRADE_LOAD else 0
+        self.under = self.under + 1 if load < UPGRADE_LOAD else 0
+        if self.over >= DOWNGRADE_FRAMES and self.tier < len(QUALITY_TIERS) - 1:
+            self._set_tier(self.tier + 1)
+        elif self.under >= UPGRADE_FRAMES and self.tier > 0:
+            self._set_tier(self.tier - 1)
+
+    def _set_tier(self, tier: int):
+        self.tier = tier
+        self.over = self.under = 0
+        self.changes += 1
+        print(f"Quality: {self.name} (frames {self.frame_time * 1000:.1f} ms "
+              f"for a {self.budget * 1000:.1f} ms budget)")
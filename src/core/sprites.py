@@ -0,0 +1,184 @@
+import math
+from typing import Dict, List, Tuple
+
+import pygame
+
+from ..config.constants import CELL_SIZE, CellType
+
+BACKGROUND_FRAMES = 30    # Cached background frames over its 360-step cycle
+BACKGROUND_CYCLE = 360
+BACKGROUND_SPACING = 20   # Pixels between background tiles
+PELLET_FRAMES = 32        # Cached pellet sprites per 2*pi of the pellet animation
+
+WALL_COLORS = ((0, 0, 255), (0, 0, 139))
+BACKGROUND_COLORS = ((0, 0, 0), (0, 0, 128))
+PELLET_COLOR = (255, 255, 255)
+
+
+def draw_gradient(surface, rect, color1, color2, vertical=True):
+    """Draw a rectangle with a gradient between two colors"""
+    steps = rect.height if vertical else rect.width
+    for i in range(steps):
+        factor = i / steps
+        color = (
+            int(color1[0] * (1 - factor) + color2[0] * factor),
+            int(color1[1] * (1 - factor) + color2[1] * factor),
+            int(color1[2] * (1 - factor) + color2[2] * factor)
+        )
+        if vertical:
+            pygame.draw.line(surface, color, (rect.x, rect.y + i), (rect.x + rect.width, rect.y + i))
+        else:
+            pygame.draw.line(surface, color, (rect.x + i, rect.y), (rect.x + i, rect.y + rect.height))
+
+
+def shadow_sprite(radius: int) -> pygame.Surface:
+    """Soft translucent disc drawn under the ghosts"""
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (0, 0, 0, 64), (radius, radius), radius)
+    return sprite
+
+
+def glow_sprite(radius: int) -> pygame.Surface:
+    """Yellow halo around powered-up Pacman, ten rings fading outwards"""
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    for i in range(10):
+        pygame.draw.circle(sprite, (255, 255, 0, int(25 * (1 - i / 10))), (radius, radius), radius - i * 2)
+    return sprite
+
+
+class BackgroundFrames:
+    """
+    The animated tile pattern behind the maze, rendered once per phase into
+    8-bit (two-color palette) surfaces so a frame costs one blit instead of
+    a draw call and a sin() per tile.
+    """
+
+    def __init__(self, width: int, height: int, frames: int = BACKGROUND_FRAMES):
+        self.size = (width, height)
+        self.frames = frames
+        self.cache: Dict[int, pygame.Surface] = {}
+
+    def frame(self, step: int) -> pygame.Surface:
+        """Frame for a step (0-359) of the background animation"""
+        index = step * self.frames // BACKGROUND_CYCLE
+        surface = self.cache.get(index)
+        if surface is None:
+            surface = self.cache[index] = self._render(index * BACKGROUND_CYCLE // self.frames)
+        return surface
+
+    def _render(self, step: int) -> pygame.Surface:
+        surface = pygame.Surface(self.size, depth=8)
+        surface.set_palette(BACKGROUND_COLORS)
+        surface.fill(BACKGROUND_COLORS[0])
+        for y in range(0, self.size[1], BACKGROUND_SPACING):
+            for x in range(0, self.size[0], BACKGROUND_SPACING):
+                offset = math.sin((x + y + step) / 30) * 2
+                size = 10 + offset
+                pygame.draw.rect(surface, BACKGROUND_COLORS[1], (x, y, size, size))
+        return surface
+
+
+class PelletSprites:
+    """
+    Pellet and power-pellet sprites per animation phase, plus the maze's
+    remaining pellets by row. The pellet set follows the maze's bitsets:
+    only cells whose bit changed since the last frame (eaten, or put back
+    by a restore) are updated.
+    """
+
+    def __init__(self, frames: int = PELLET_FRAMES):
+        self.frames = frames
+        self.pellets = [self._sprite(4 + math.sin(self._angle(i)), PELLET_COLOR) for i in range(frames)]
+        self.power = [self._sprite(8 + math.sin(self._angle(i) * 2) * 2,
+                                   (255, 255, int(128 + math.sin(self._angle(i)) * 127)))
+                      for i in range(frames)]
+        self.rows: Dict[int, Dict[int, Tuple[int, bool]]] = {}  # y -> x -> (phase offset, power)
+        self.maze = None
+        self.bits = (0, 0)
+
+    def _angle(self, index: int) -> float:
+        return index * 2 * math.pi / self.frames
+
+    @staticmethod
+    def _sprite(radius: float, color) -> pygame.Surface:
+        sprite = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (CELL_SIZE // 2, CELL_SIZE // 2), radius)
+        return sprite
+
+    def _phase_offset(self, x: int, y: int) -> int:
+        """Pellets ripple across the maze: each cell is (x + y) / 2 radians ahead"""
+        return round((x + y) * 0.5 * self.frames / (2 * math.pi))
+
+    def sync(self, maze):
+        """Bring the pellet rows up to date with the maze's bitsets"""
+        bits = (maze.pellet_bits, maze.power_bits)
+        if maze is not self.maze:
+            # New maze: read every pellet off the grid at once
+            self.maze, self.bits, self.rows = maze, bits, {}
+            for x, y in maze.pellet_positions():
+                self.rows.setdefault(y, {})[x] = (self._phase_offset(x, y),
+                                                  maze.grid[y][x] == CellType.POWER_PELLET)
+        if bits == self.bits:
+            return
+        changed = (self.bits[0] ^ bits[0]) | (self.bits[1] ^ bits[1])
+        while changed:
+            low = changed & -changed
+            y, x = divmod(low.bit_length() - 1, maze.width)
+            row = self.rows.setdefault(y, {})
+            if (bits[0] | bits[1]) & low:
+                row[x] = (self._phase_offset(x, y), bool(bits[1] & low))
+            else:
+                row.pop(x, None)
+            changed ^= low
+        self.bits = bits
+
+    def draw(self, screen, animation: float, visible: Tuple[int, int, int, int], offset: Tuple[int, int]):
+        """Blit the visible pellets, in one batch, at an animation angle"""
+        phase = int(animation * self.frames / (2 * math.pi))
+        power_phase = phase % self.frames
+        x0, y0, x1, y1 = visible
+        offset_x, offset_y = offset
+        batch: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        for y in range(y0, y1 + 1):
+            row = self.rows.get(y)
+            if not row:
+                continue
+            top = y * CELL_SIZE + offset_y
+            for x, (shift, power) in row.items():
+                if x0 <= x <= x1:
+                    sprite = (self.power[power_phase] if power
+                              else self.pellets[(phase + shift) % self.frames])
+                    batch.append((sprite, (x * CELL_SIZE + offset_x, top)))
+        screen.blits(batch, doreturn=False)
+
+
+class WallLayer:
+    """
+    The walls in and just around the view, drawn from one cached wall
+    sprite into a colorkeyed surface. It is redrawn only when the camera
+    crosses into another cell or the walls change (Maze.version); scrolling
+    within a cell just moves the blit.
+    """
+
+    def __init__(self, view_width: int, view_height: int):
+        self.cells = (view_width + 1, view_height + 1)
+        self.surface = pygame.Surface((self.cells[0] * CELL_SIZE, self.cells[1] * CELL_SIZE))
+        self.surface.set_colorkey((0, 0, 0))
+        self.sprite = pygame.Surface((CELL_SIZE, CELL_SIZE))
+        self.sprite.fill((0, 0, 0))
+        draw_gradient(self.sprite, pygame.Rect(1, 1, CELL_SIZE - 2, CELL_SIZE - 2), *WALL_COLORS)
+        self.key = None
+
+    def draw(self, screen, maze, origin: Tuple[int, int], offset: Tuple[int, int]):
+        """Blit the walls from cell `origin` on, with `offset` the maze-to-screen pixel offset"""
+        x0, y0 = origin
+        key = (maze.version, x0, y0)
+        if key != self.key:
+            self.surface.fill((0, 0, 0))
+            blits = [(self.sprite, ((x - x0) * CELL_SIZE, (y - y0) * CELL_SIZE))
+                     for y in range(y0, min(maze.height, y0 + self.cells[1]))
+                     for x in range(x0, min(maze.width, x0 + self.cells[0]))
+                     if maze.grid[y][x] == CellType.WALL]
+            self.surface.blits(blits, doreturn=False)
+            self.key = key
+        screen.blit(self.surface, (x0 * CELL_SIZE + offset[0], y0 * CELL_SIZE + offset[1]))
@@ -0,0 +1,56 @@
+import random
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+# Sets of maze cells as Python ints: bit y * width + x is cell (x, y).
+# Copying one is free (ints are immutable) and set algebra is one
+# operation on the whole board (& | ^ ~, bit_count for popcount).
+
+ZOBRIST_SEED = 0x9E3779B9  # Fixed, so board hashes are stable across runs and processes
+
+_zobrist: Dict[int, Tuple[List[int], List[int]]] = {}
+
+
+def iter_cells(bits: int, width: int) -> Iterator[Tuple[int, int]]:
+    """(x, y) of every set bit, in row-major order"""
+    while bits:
+        low = bits & -bits
+        y, x = divmod(low.bit_length() - 1, width)
+        yield x, y
+        bits ^= low
+
+
+def cells_mask(cells: Iterable[Tuple[int, int]], width: int) -> int:
+    mask = 0
+    for x, y in cells:
+        mask |= 1 << (y * width + x)
+    return mask
+
+
+def rect_mask(x0: int, y0: int, x1: int, y1: int, width: int, height: int) -> int:
+    """Cells of the inclusive rectangle (x0, y0)-(x1, y1), clipped to the board"""
+    x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, width - 1), min(y1, height - 1)
+    if x0 > x1 or y0 > y1:
+        return 0
+    row = ((1 << (x1 - x0 + 1)) - 1) << x0
+    mask = 0
+    for y in range(y0, y1 + 1):
+        mask |= row << (y * width)
+    return mask
+
+
+def array_mask(cells: np.ndarray) -> int:
+    """Board of the True entries of an (H, W) bool array"""
+    packed = np.packbits(np.ascontiguousarray(cells, dtype=bool).ravel(), bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+def zobrist_keys(size: int) -> Tuple[List[int], List[int]]:
+    """Random 64-bit keys per cell id for pellets and power pellets, shared by boards of a size"""
+    keys = _zobrist.get(size)
+    if keys is None:
+        rng = random.Random(ZOBRIST_SEED ^ size)
+        keys = _zobrist[size] = ([rng.getrandbits(64) for _ in range(size)],
+                                 [rng.getrandbits(64) for _ in range(size)])
+    return keys
@@ -1,6 +1,19 @@
-from typing import List, Tuple
+import hashlib
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
 from ..config.constants import CellType
 from ..config.maze_layouts import MazeSymbols
+from .bitboard import array_mask, iter_cells, rect_mask, zobrist_keys
+from .topology import MazeTopology, topology_for
+from ..core.events import PELLET_EATEN
+
+
+def wall_version(walkable: np.ndarray) -> int:
+    """Maze.version of a walkability grid: a 64-bit hash of it, the same for every maze with those walls"""
+    digest = hashlib.blake2b(np.array(walkable.shape).tobytes(), digest_size=8)
+    digest.update(np.ascontiguousarray(walkable).tobytes())
+    return int.from_bytes(digest.digest(), 'little')
+
 
 class Maze:
     def __init__(self, width: int, height: int):
@@ -8,8 +21,21 @@ class Maze:
         self.width = width
         self.height = height
         self.grid = self._create_empty_maze()
+        self.walkable = np.ones((height, width), dtype=bool)
         self.pacman_start = (1, 1)  # Default start position
         self.ghost_starts = []
+        self.topology: Optional[MazeTopology] = None
+        self.unreachable_pellets: List[Tuple[int, int]] = []
+        self.events = None  # EventBus told about eaten pellets, set by the game
+        # Remaining pellets and power pellets as bitsets over cell ids (y * width + x),
+        # and a Zobrist hash of the pair kept up to date as they change
+        self.pellet_bits = 0
+        self.power_bits = 0
+        self.pellet_hash = 0
+        self._pellet_keys, self._power_keys = zobrist_keys(width * height)
+        # Identifies the wall layout (pellets don't count), so paths cached under it stay valid
+        # while pellets are eaten and carry over to new mazes with the same walls
+        self.version = wall_version(self.walkable)
         
     def _create_empty_maze(self) -> List[List[CellType]]:
         return [[CellType.EMPTY for _ in range(self.width)] 
@@ -40,6 +66,32 @@ class Maze:
                 else:
                     grid_row.append(CellType.PATH)
             self.grid.append(grid_row)
+
+        # Walkability as an array for code that works on many agents at once
+        self.walkable = np.array([[cell != CellType.WALL for cell in row] for row in self.grid],
+                                 dtype=bool)
+        self.version = wall_version(self.walkable)
+
+        # Regions, dead ends, corridors and chokepoints; pellets Pacman can't reach are dropped
+        self.topology = topology_for(self.walkable)
+        region = self.topology.component_of(self.pacman_start)
+        ys, xs = np.nonzero(self.topology.component != region)
+        self.unreachable_pellets = [(x, y) for x, y in zip(xs.tolist(), ys.tolist())
+                                    if self.grid[y][x] in (CellType.PELLET, CellType.POWER_PELLET)]
+        for x, y in self.unreachable_pellets:
+            self.grid[y][x] = CellType.PATH
+        if self.unreachable_pellets:
+            print(f"Excluded {len(self.unreachable_pellets)} unreachable pellet(s)")
+
+        self.pellet_bits = array_mask(np.array([[cell == CellType.PELLET for cell in row]
+                                                for row in self.grid], dtype=bool))
+        self.power_bits = array_mask(np.array([[cell == CellType.POWER_PELLET for cell in row]
+                                               for row in self.grid], dtype=bool))
+        self._pellet_keys, self._power_keys = zobrist_keys(self.width * self.height)
+        self.pellet_hash = 0
+        for bits, keys in ((self.pellet_bits, self._pellet_keys), (self.power_bits, self._power_keys)):
+            for x, y in iter_cells(bits, self.width):
+                self.pellet_hash ^= keys[y * self.width + x]
             
         print(f"Final grid dimensions: {len(self.grid)}x{len(self.grid[0])}")
 
@@ -53,6 +105,38 @@ class Maze:
         """Set the type of cell at the given position"""
         if 0 <= y < self.height and 0 <= x < self.width:
             self.grid[y][x] = cell_type
+            if self.walkable[y, x] != (cell_type != CellType.WALL):
+                self.walkable[y, x] = cell_type != CellType.WALL
+                self.topology = topology_for(self.walkable)
+                self.version = wall_version(self.walkable)
+            self._set_pellet_bits(x, y, cell_type)
+
+    def _set_pellet_bits(self, x: int, y: int, cell_type: CellType):
+        cell_id = y * self.width + x
+        bit = 1 << cell_id
+        if bool(self.pellet_bits & bit) != (cell_type == CellType.PELLET):
+            self.pellet_bits ^= bit
+            self.pellet_hash ^= self._pellet_keys[cell_id]
+        if bool(self.power_bits & bit) != (cell_type == CellType.POWER_PELLET):
+            self.power_bits ^= bit
+            self.pellet_hash ^= self._power_keys[cell_id]
+
+    def restore_pellets(self, pellet_bits: int, power_bits: int):
+        """Put the pellets back to a saved pair of bitsets, touching only the cells that differ"""
+        changed = (self.pellet_bits ^ pellet_bits) | (self.power_bits ^ power_bits)
+        while changed:
+            low = changed & -changed
+            cell_id = low.bit_length() - 1
+            y, x = divmod(cell_id, self.width)
+            self.grid[y][x] = (CellType.PELLET if pellet_bits & low else
+                               CellType.POWER_PELLET if power_bits & low else CellType.PATH)
+            if (self.pellet_bits ^ pellet_bits) & low:
+                self.pellet_hash ^= self._pellet_keys[cell_id]
+            if (self.power_bits ^ power_bits) & low:
+                self.pellet_hash ^= self._power_keys[cell_id]
+            changed ^= low
+        self.pellet_bits = pellet_bits
+        self.power_bits = power_bits
 
     def is_valid_position(self, x: int, y: int) -> bool:
         """Check if a position is valid and not a wall"""
@@ -67,14 +151,46 @@ class Maze:
             if cell_type in [CellType.PELLET, CellType.POWER_PELLET]:
                 is_power_pellet = cell_type == CellType.POWER_PELLET
                 self.grid[y][x] = CellType.PATH
+                cell_id = y * self.width + x
+                if is_power_pellet:
+                    self.power_bits ^= 1 << cell_id
+                    self.pellet_hash ^= self._power_keys[cell_id]
+                else:
+                    self.pellet_bits ^= 1 << cell_id
+                    self.pellet_hash ^= self._pellet_keys[cell_id]
+                if self.events is not None:
+                    self.events.emit(PELLET_EATEN, x=x, y=y, power=is_power_pellet)
                 return is_power_pellet
         return False
     
+    def pellet_positions(self) -> List[Tuple[int, int]]:
+        """Positions of all remaining pellets and power pellets"""
+        return list(iter_cells(self.pellet_bits | self.power_bits, self.width))
+
+    def pellets_remaining(self) -> int:
+        """Number of pellets and power pellets left, from the bitsets"""
+        return (self.pellet_bits | self.power_bits).bit_count()
+
+    def pellet_board(self) -> Tuple[int, int]:
+        """Immutable (pellet_bits, power_bits) pair: an O(1) copy of the pellets left"""
+        return self.pellet_bits, self.power_bits
+
+    def region_mask(self, x0: int, y0: int, x1: int, y1: int) -> int:
+        """Bitset of the inclusive cell rectangle (x0, y0)-(x1, y1)"""
+        return rect_mask(x0, y0, x1, y1, self.width, self.height)
+
+    def reachable_mask(self, cell: Tuple[int, int]) -> int:
+        """Bitset of the cells reachable from a cell"""
+        return self.topology.component_mask(self.topology.component_of(cell)) if self.topology else 0
+
+    def pellets_in(self, mask: int) -> int:
+        """Number of pellets and power pellets left within a bitset of cells"""
+        return ((self.pellet_bits | self.power_bits) & mask).bit_count()
+
+    def iter_pellets(self, mask: int = -1) -> Iterator[Tuple[int, int]]:
+        """Positions of the pellets and power pellets left (within a bitset of cells), row by row"""
+        return iter_cells((self.pellet_bits | self.power_bits) & mask, self.width)
+
     def count_remaining_pellets(self) -> int:
         """Count the number of remaining pellets in the maze"""
-        count = 0
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] in [CellType.PELLET, CellType.POWER_PELLET]:
-                    count += 1
-        return count
\ No newline at end of file
+        return self.pellets_remaining()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import numpy as np
+from typing import Dict, Iterator, List, Set, Tuple
+
+
+class SpatialIndex:
+    """
+    Per-cell occupancy buckets for agents identified by integer ids.
+    Agents are only re-bucketed when they change cells, and queries cost
+    time proportional to the cells and occupants they touch.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.buckets: Dict[Tuple[int, int], Set[int]] = {}
+        self.cell_of: Dict[int, Tuple[int, int]] = {}
+        # Last synced cells for agents tracked through sync()
+        self._cell_x = np.zeros(0, dtype=np.int32)
+        self._cell_y = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.cell_of)
+
+    def move(self, agent_id: int, cell: Tuple[int, int]):
+        """Place an agent in a cell, removing it from its previous one"""
+        old = self.cell_of.get(agent_id)
+        if old == cell:
+            return
+        if old is not None:
+            bucket = self.buckets[old]
+            bucket.discard(agent_id)
+            if not bucket:
+                del self.buckets[old]
+        self.buckets.setdefault(cell, set()).add(agent_id)
+        self.cell_of[agent_id] = cell
+
+    def remove(self, agent_id: int):
+        """Forget an agent"""
+        cell = self.cell_of.pop(agent_id, None)
+        if cell is not None:
+            bucket = self.buckets[cell]
+            bucket.discard(agent_id)
+            if not bucket:
+                del self.buckets[cell]
+
+    def sync(self, xs: np.ndarray, ys: np.ndarray):
+        """Update agents 0..n-1 from cell arrays, touching only those whose cell changed"""
+        n = len(xs)
+        if n != len(self._cell_x):
+            for agent_id in range(n, len(self._cell_x)):
+                self.remove(agent_id)
+            changed = np.arange(n)
+        else:
+            changed = np.nonzero((xs != self._cell_x) | (ys != self._cell_y))[0]
+        for agent_id, x, y in zip(changed.tolist(), xs[changed].tolist(), ys[changed].tolist()):
+            self.move(agent_id, (x, y))
+        self._cell_x = xs.copy()
+        self._cell_y = ys.copy()
+
+    def at(self, cell: Tuple[int, int]) -> Set[int]:
+        """Ids of the agents in a cell"""
+        return self.buckets.get(cell, set())
+
+    def _diamond(self, cell: Tuple[int, int], radius: int) -> Iterator[Tuple[int, int]]:
+        """Occupied cells within Manhattan distance `radius` of a cell"""
+        cx, cy = cell
+        if 2 * radius * (radius + 1) + 1 > len(self.buckets):
+            # Fewer occupied cells than cells in the query area: scan the buckets
+            for other in self.buckets:
+                if abs(other[0] - cx) + abs(other[1] - cy) <= radius:
+                    yield other
+            return
+        for dy in range(-radius, radius + 1):
+            span = radius - abs(dy)
+            for dx in range(-span, span + 1):
+                other = (cx + dx, cy + dy)
+                if other in self.buckets:
+                    yield other
+
+    def any_within(self, cell: Tuple[int, int], radius: int) -> bool:
+        """Whether any agent is within Manhattan distance `radius` of a cell"""
+        for _ in self._diamond(cell, radius):
+            return True
+        return False
+
+    def within(self, cell: Tuple[int, int], radius: int) -> List[Tuple[int, Tuple[int, int]]]:
+        """(id, cell) of every agent within Manhattan distance `radius` of a cell"""
+        return [(agent_id, other)
+                for other in self._diamond(cell, radius)
+                for agent_id in self.buckets[other]]
+
+    def in_region(self, x0: int, y0: int, x1: int, y1: int) -> List[int]:
+        """Ids of agents in the inclusive cell rectangle (x0, y0)-(x1, y1)"""
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.buckets):
+            return [agent_id
+                    for (x, y), bucket in self.buckets.items()
+                    if x0 <= x <= x1 and y0 <= y <= y1
+                    for agent_id in bucket]
+        result = []
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                bucket = self.buckets.get((x, y))
+                if bucket:
+                    result.extend(bucket)
+        return result
@@ -0,0 +1,84 @@
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..config.constants import TICK_RATE
+
+
+class GameState:
+    """
+    Snapshot of a running Game: everything a tick reads or writes (Pacman,
+    the ghosts, the remaining pellets, score, mode timers, RNG states and the
+    cooperative ghost plans when that mode is on).
+    Every part is immutable, so consecutive snapshots share what didn't
+    change between them instead of copying it: the pellet bitsets are the
+    maze's own ints until a pellet is eaten, and the walls, distances and
+    ghost colors stay with the game. Restore with Game.restore().
+    """
+    __slots__ = ('tick_count', 'score', 'pellet_bits', 'power_bits', 'pellet_hash', 'pacman', 'ghosts',
+                 'ghost_mode_timer', 'ghost_mode_scatter', 'is_game_over', 'game_won',
+                 'final_message', 'rng_state', 'ghost_plans')
+
+    def __init__(self, tick_count: int, score: int, pellet_bits: int, power_bits: int,
+                 pellet_hash: int, pacman: tuple, ghosts: Tuple[np.ndarray, dict],
+                 ghost_mode_timer: int, ghost_mode_scatter: bool,
+                 is_game_over: bool, game_won: bool, final_message: str, rng_state: tuple,
+                 ghost_plans: Optional[tuple] = None):
+        self.tick_count = tick_count
+        self.score = score
+        self.pellet_bits = pellet_bits
+        self.power_bits = power_bits
+        self.pellet_hash = pellet_hash  # Zobrist hash of the two bitsets, for transposition tables
+        self.pacman = pacman
+        self.ghosts = ghosts
+        self.ghost_mode_timer = ghost_mode_timer
+        self.ghost_mode_scatter = ghost_mode_scatter
+        self.is_game_over = is_game_over
+        self.game_won = game_won
+        self.final_message = final_message
+        self.rng_state = rng_state
+        self.ghost_plans = ghost_plans  # CooperativeGhostPlanner.snapshot(), None when planning is off
+
+    @property
+    def pellets_remaining(self) -> int:
+        return (self.pellet_bits | self.power_bits).bit_count()
+
+    @classmethod
+    def capture(cls, game) -> 'GameState':
+        """Snapshot a game's current state"""
+        maze = game.maze
+        return cls(game.tick_count, game.score, maze.pellet_bits, maze.power_bits,
+                   maze.pellet_hash, game.pacman.snapshot(), game.ghost_store.snapshot(),
+                   game.ghost_mode_timer, game.ghost_mode_scatter,
+                   game.is_game_over, game.game_won, game.final_message,
+                   random.getstate(),
+                   game.ghost_planner.snapshot() if game.ghost_planner is not None else None)
+
+    def apply(self, game):
+        """
+        Put a game back to this state. The game must be playing the level the
+        snapshot was taken from with the same ghosts (no reset in between).
+        """
+        game.ghost_store.restore(self.ghosts)
+        game.pacman.restore(self.pacman)
+        game.maze.restore_pellets(self.pellet_bits, self.power_bits)
+        random.setstate(self.rng_state)
+
+        game.tick_count = self.tick_count
+        game.events.tick = self.tick_count
+        game.time_elapsed = self.tick_count // TICK_RATE
+        game.score = self.score
+        game.ghost_mode_timer = self.ghost_mode_timer
+        game.ghost_mode_scatter = self.ghost_mode_scatter
+        game.is_game_over = self.is_game_over
+        game.game_won = self.game_won
+        game.final_message = self.final_message
+
+        game.ghost_index.sync(*game.ghost_store.cells())
+        if game.ghost_planner is not None:
+            if self.ghost_plans is not None:
+                game.ghost_planner.restore(self.ghost_plans)
+            else:
+                # Planning was off at capture: plans are rebuilt from the restored positions
+                game.ghost_planner.reset()
@@ -0,0 +1,243 @@
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..config.constants import DIRECTIONS
+from .bitboard import array_mask
+
+NO_LABEL = -1
+TOPOLOGY_CACHE_SIZE = 8  # Layouts whose topology is kept (mazes are rebuilt on every reset)
+
+_cache: Dict[Tuple[Tuple[int, int], bytes], 'MazeTopology'] = {}
+
+
+class MazeTopology:
+    """
+    Structure of a maze's walkable cells, computed once per layout:
+      degree          (H, W) int8, walkable neighbours of each cell
+      component       (H, W) int32, connected region id, -1 for walls
+      dead_end_depth  (H, W) int16, cells into a dead-end branch from its
+                      entrance (1 = first cell in), 0 outside dead ends
+      articulation    (H, W) bool, chokepoints whose removal splits a region
+      corridor        (H, W) int32, id of the corridor segment a cell lies on
+                      (a maximal run of cells with two neighbours), -1 otherwise
+    Dead-end branches are the tree-shaped parts that hang off the maze's
+    loops: once entered, the only way out is back through the entrance.
+    """
+
+    def __init__(self, walkable: np.ndarray):
+        self.walkable = walkable
+        self.height, self.width = walkable.shape
+        self.degree = np.zeros(walkable.shape, dtype=np.int8)
+        for dx, dy in DIRECTIONS:
+            shifted = np.zeros_like(walkable)
+            shifted[max(-dy, 0):self.height - max(dy, 0), max(-dx, 0):self.width - max(dx, 0)] = \
+                walkable[max(dy, 0):self.height - max(-dy, 0), max(dx, 0):self.width - max(-dx, 0)]
+            self.degree += shifted
+        self.degree[~walkable] = 0
+
+        self.component = np.full(walkable.shape, NO_LABEL, dtype=np.int32)
+        self.component_sizes: List[int] = []
+        self._label_components()
+
+        self.dead_end_depth = np.zeros(walkable.shape, dtype=np.int16)
+        self.dead_end_entrance: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self._label_dead_ends()
+
+        self.articulation = np.zeros(walkable.shape, dtype=bool)
+        self._find_articulation_points()
+
+        self.corridor = np.full(walkable.shape, NO_LABEL, dtype=np.int32)
+        self.corridors: List[List[Tuple[int, int]]] = []
+        self._label_corridors()
+
+        ys, xs = np.nonzero(walkable & (self.degree >= 3))
+        self.junctions: List[Tuple[int, int]] = list(zip(xs.tolist(), ys.tolist()))
+        self._component_masks: Dict[int, int] = {}
+
+    def neighbors(self, cell: Tuple[int, int]) -> List[Tuple[int, int]]:
+        x, y = cell
+        return [(x + dx, y + dy) for dx, dy in DIRECTIONS
+                if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+                and self.walkable[y + dy, x + dx]]
+
+    def _label_components(self):
+        for y, x in zip(*np.nonzero(self.walkable)):
+            if self.component[y, x] != NO_LABEL:
+                continue
+            label = len(self.component_sizes)
+            self.component[y, x] = label
+            queue = deque([(int(x), int(y))])
+            size = 0
+            while queue:
+                cell = queue.popleft()
+                size += 1
+                for nx, ny in self.neighbors(cell):
+                    if self.component[ny, nx] == NO_LABEL:
+                        self.component[ny, nx] = label
+                        queue.append((nx, ny))
+            self.component_sizes.append(size)
+
+    def _label_dead_ends(self):
+        """Peel cells left with one neighbour until only loops remain, then measure depths from the entrances"""
+        remaining = self.degree.astype(np.int32)
+        peeled = np.zeros(self.walkable.shape, dtype=bool)
+        ys, xs = np.nonzero(self.walkable & (self.degree <= 1))
+        queue = deque(zip(xs.tolist(), ys.tolist()))
+        last_peeled: Dict[int, Tuple[int, int]] = {}
+        while queue:
+            x, y = queue.popleft()
+            if peeled[y, x]:
+                continue
+            peeled[y, x] = True
+            last_peeled[int(self.component[y, x])] = (x, y)
+            for nx, ny in self.neighbors((x, y)):
+                if not peeled[ny, nx]:
+                    remaining[ny, nx] -= 1
+                    if remaining[ny, nx] <= 1:
+                        queue.append((nx, ny))
+
+        # Entrances: loop cells next to peeled cells. A region with no loop at
+        # all is one big dead end, entered from the cell peeled last.
+        entrances = [(x, y) for y, x in zip(*np.nonzero(self.walkable & ~peeled))
+                     if any(peeled[ny, nx] for nx, ny in self.neighbors((x, y)))]
+        for label, cell in last_peeled.items():
+            if peeled[self.component == label].all():
+                peeled[cell[1], cell[0]] = False
+                entrances.append(cell)
+
+        for entrance in entrances:
+            entrance = (int(entrance[0]), int(entrance[1]))
+            queue = deque([entrance])
+            while queue:
+                cell = queue.popleft()
+                depth = self.dead_end_depth[cell[1], cell[0]]
+                for nx, ny in self.neighbors(cell):
+                    if peeled[ny, nx] and self.dead_end_depth[ny, nx] == 0:
+                        self.dead_end_depth[ny, nx] = depth + 1
+                        self.dead_end_entrance[(nx, ny)] = entrance
+                        queue.append((nx, ny))
+
+    def _find_articulation_points(self):
+        """Iterative Tarjan low-link search over every region"""
+        discovery = np.full(self.walkable.shape, -1, dtype=np.int32)
+        low = np.zeros(self.walkable.shape, dtype=np.int32)
+        counter = 0
+        for y, x in zip(*np.nonzero(self.walkable)):
+            root = (int(x), int(y))
+            if discovery[root[1], root[0]] >= 0:
+                continue
+            discovery[root[1], root[0]] = low[root[1], root[0]] = counter
+            counter += 1
+            root_children = 0
+            stack = [(root, None, iter(self.neighbors(root)))]
+            while stack:
+                cell, parent, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    if parent is not None:
+                        low[parent[1], parent[0]] = min(low[parent[1], parent[0]], low[cell[1], cell[0]])
+                        if parent != root and low[cell[1], cell[0]] >= discovery[parent[1], parent[0]]:
+                            self.articulation[parent[1], parent[0]] = True
+                    continue
+                if child == parent:
+                    continue
+                if discovery[child[1], child[0]] >= 0:
+                    low[cell[1], cell[0]] = min(low[cell[1], cell[0]], discovery[child[1], child[0]])
+                    continue
+                discovery[child[1], child[0]] = low[child[1], child[0]] = counter
+                counter += 1
+                if cell == root:
+                    root_children += 1
+                stack.append((child, cell, iter(self.neighbors(child))))
+            if root_children > 1:
+                self.articulation[root[1], root[0]] = True
+
+    def _label_corridors(self):
+        for y, x in zip(*np.nonzero(self.walkable & (self.degree == 2))):
+            if self.corridor[y, x] != NO_LABEL:
+                continue
+            label = len(self.corridors)
+            start = (int(x), int(y))
+            self.corridor[y, x] = label
+            cells = [start]
+            # Walk both ways from the start, keeping the segment's cells in walking order
+            for side, first in enumerate(self.neighbors(start)):
+                run = []
+                previous, current = start, first
+                while self.degree[current[1], current[0]] == 2 and \
+                        self.corridor[current[1], current[0]] == NO_LABEL:
+                    self.corridor[current[1], current[0]] = label
+                    run.append(current)
+                    previous, current = current, next(n for n in self.neighbors(current) if n != previous)
+                cells = run[::-1] + cells if side == 0 else cells + run
+            self.corridors.append(cells)
+
+    def component_of(self, cell: Tuple[int, int]) -> int:
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return int(self.component[y, x])
+        return NO_LABEL
+
+    def component_mask(self, label: int) -> int:
+        """Cells of a region as a bitset over cell ids (y * width + x), 0 for NO_LABEL"""
+        if label == NO_LABEL:
+            return 0
+        mask = self._component_masks.get(label)
+        if mask is None:
+            mask = self._component_masks[label] = array_mask(self.component == label)
+        return mask
+
+    def reachable(self, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+        """Whether b can be walked to from a"""
+        label = self.component_of(a)
+        return label != NO_LABEL and label == self.component_of(b)
+
+    def depth(self, cell: Tuple[int, int]) -> int:
+        """How many cells into a dead-end branch a cell is (0 outside dead ends)"""
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return int(self.dead_end_depth[y, x])
+        return 0
+
+    def branch_cells(self, cells) -> Set[Tuple[int, int]]:
+        """Dead-end cells on the way from each of the given cells out to its branch's entrance"""
+        on_way: Set[Tuple[int, int]] = set()
+        for cell in cells:
+            depth = self.depth(cell)
+            while depth > 0 and cell not in on_way:
+                on_way.add(cell)
+                depth -= 1
+                if depth:
+                    cell = next(n for n in self.neighbors(cell) if self.dead_end_depth[n[1], n[0]] == depth)
+        return on_way
+
+    def is_dead_end(self, cell: Tuple[int, int]) -> bool:
+        return self.depth(cell) > 0
+
+    def entrance(self, cell: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Loop cell a dead-end branch is entered from"""
+        return self.dead_end_entrance.get(cell)
+
+    def is_articulation(self, cell: Tuple[int, int]) -> bool:
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.articulation[y, x])
+
+    def summary(self) -> str:
+        return (f"{len(self.component_sizes)} region(s), {len(self.junctions)} junctions, "
+                f"{len(self.corridors)} corridors, {int(np.count_nonzero(self.dead_end_depth))} "
+                f"dead-end cells, {int(np.count_nonzero(self.articulation))} chokepoints")
+
+
+def topology_for(walkable: np.ndarray) -> MazeTopology:
+    """Topology of a walkability grid, reused across mazes with the same walls"""
+    key = (walkable.shape, walkable.tobytes())
+    topology = _cache.pop(key, None)
+    if topology is None:
+        topology = MazeTopology(walkable.copy())
+    _cache[key] = topology  # Most recently used last
+    while len(_cache) > TOPOLOGY_CACHE_SIZE:
+        del _cache[next(iter(_cache))]
+    return topology
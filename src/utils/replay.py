@@ -0,0 +1,120 @@
+import numpy as np
+from typing import List, Tuple
+
+from ..config.constants import Direction
+from ..environment.bitboard import iter_cells
+
+# Direction <-> index stored in replays (Direction enum order)
+DIRECTION_ORDER = list(Direction)
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTION_ORDER)}
+
+
+class Replay:
+    """
+    A recorded game as per-frame arrays: agent positions and states, the
+    score, the pellets on the board when recording started and the frames
+    at which each was eaten (so the board of any frame can be rebuilt
+    without replaying the frames before it).
+    """
+    ARRAYS = ('pacman_xy', 'pacman_direction', 'pacman_mouth', 'powered',
+              'ghost_xy', 'ghost_frightened', 'ghost_colors', 'score',
+              'start_pellets', 'eaten_frame', 'eaten_cells')
+
+    def __init__(self, layout: List[str], arrays: dict):
+        self.layout = layout
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    def __len__(self) -> int:
+        return len(self.pacman_xy)
+
+    @property
+    def width(self) -> int:
+        return len(self.layout[0])
+
+    @property
+    def height(self) -> int:
+        return len(self.layout)
+
+    def pellets_at(self, frame: int) -> List[Tuple[int, int, bool]]:
+        """(x, y, is_power) of the pellets still on the board at a frame"""
+        eaten = {tuple(cell) for cell in self.eaten_cells[self.eaten_frame <= frame].tolist()}
+        return [(x, y, bool(power)) for x, y, power in self.start_pellets.tolist()
+                if (x, y) not in eaten]
+
+    def save(self, path):
+        """Write the replay as a compressed .npz file"""
+        np.savez_compressed(path, layout=np.array(self.layout),
+                            **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path) -> 'Replay':
+        with np.load(path) as data:
+            return cls([str(row) for row in data['layout']],
+                       {name: data[name] for name in cls.ARRAYS})
+
+
+class ReplayRecorder:
+    """Captures one frame of a Game per call to capture()"""
+
+    def __init__(self, game):
+        self.game = game
+        self.frames = {name: [] for name in Replay.ARRAYS
+                       if name not in ('ghost_colors', 'start_pellets', 'eaten_frame', 'eaten_cells')}
+        self.eaten: List[Tuple[int, int, int]] = []
+        maze = game.maze
+        self.pellets = maze.pellet_bits | maze.power_bits
+        # The maze's own pellets, not the level layout's: load_layout drops unreachable ones
+        self.start_pellets = ([(x, y, 0) for x, y in iter_cells(maze.pellet_bits, maze.width)]
+                              + [(x, y, 1) for x, y in iter_cells(maze.power_bits, maze.width)])
+
+    def note_eaten(self):
+        """Log the pellets eaten since the last tick against the next frame to be captured"""
+        maze = self.game.maze
+        remaining = maze.pellet_bits | maze.power_bits
+        frame = len(self.frames['score'])
+        for x, y in iter_cells(self.pellets & ~remaining, maze.width):
+            self.eaten.append((frame, x, y))
+        self.pellets = remaining
+
+    def capture(self):
+        """Record the game's current state as the next frame"""
+        self.note_eaten()
+        game, frames = self.game, self.frames
+        pacman, store = game.pacman, game.ghost_store
+        frames['pacman_xy'].append((pacman.x, pacman.y))
+        frames['pacman_direction'].append(DIRECTION_INDEX[pacman.direction])
+        frames['pacman_mouth'].append(pacman.mouth_angle)
+        frames['powered'].append(pacman.is_powered_up)
+        frames['ghost_xy'].append(np.stack([store.x[:store.count], store.y[:store.count]], axis=1))
+        frames['ghost_frightened'].append(store.is_frightened[:store.count].copy())
+        frames['score'].append(game.score)
+
+    def record(self, max_ticks: int, every: int = 1) -> Replay:
+        """Run the game headless for up to max_ticks ticks, capturing every `every` ticks"""
+        self.capture()
+        ticks = 0
+        while ticks < max_ticks and not self.game.is_game_over:
+            self.game.update()
+            self.note_eaten()
+            ticks += 1
+            if ticks % every == 0 or self.game.is_game_over:
+                self.capture()
+        return self.replay()
+
+    def replay(self) -> Replay:
+        frames = self.frames
+        eaten = np.array(self.eaten, dtype=np.int32).reshape(-1, 3)
+        return Replay(self.game.level.layout, {
+            'pacman_xy': np.array(frames['pacman_xy'], dtype=np.float32).reshape(-1, 2),
+            'pacman_direction': np.array(frames['pacman_direction'], dtype=np.int8),
+            'pacman_mouth': np.array(frames['pacman_mouth'], dtype=np.int16),
+            'powered': np.array(frames['powered'], dtype=bool),
+            'ghost_xy': np.array(frames['ghost_xy'], dtype=np.float32),
+            'ghost_frightened': np.array(frames['ghost_frightened'], dtype=bool),
+            'ghost_colors': self.game.ghost_store.color[:self.game.ghost_store.count].copy(),
+            'score': np.array(frames['score'], dtype=np.int32),
+            'start_pellets': np.array(self.start_pellets, dtype=np.int32).reshape(-1, 3),
+            'eaten_frame': eaten[:, 0],
+            'eaten_cells': eaten[:, 1:],
+        })
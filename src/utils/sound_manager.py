@@ -2,15 +2,123 @@ import numpy
 import pygame
 import os
 from pathlib import Path
+from typing import Dict, List, Optional
+
+# Category each sound plays in, and how many mixer channels each category owns
+SOUND_CATEGORIES = {
+    'chomp': 'pellet',
+    'power_pellet': 'effect',
+    'ghost_eat': 'effect',
+    'death': 'jingle',
+    'game_start': 'jingle',
+    'win': 'jingle'
+}
+CATEGORY_CHANNELS = {
+    'pellet': 1,
+    'effect': 2,
+    'jingle': 1
+}
+
+# Minimum number of ticks between two plays of the same sound
+SOUND_MIN_INTERVAL = {
+    'chomp': 8,
+    'power_pellet': 30,
+    'ghost_eat': 4,
+    'death': 1,
+    'game_start': 1,
+    'win': 1
+}
+
+# Decoded sounds shared by every SoundManager, keyed by file path
+_decoded_sounds: Dict[str, pygame.mixer.Sound] = {}
+
+
+class NullSoundBackend:
+    """Sound backend that accepts every call and plays nothing (headless runs)"""
+    name = 'null'
+
+    def load(self, path: Path):
+        return path if path.exists() else None
+
+    def make_sound(self, samples):
+        return samples
+
+    def allocate_channels(self, count: int) -> List:
+        return [None] * count
+
+    def is_busy(self, channel) -> bool:
+        return False
+
+    def play(self, sound, channel, volume: float):
+        pass
+
+    def stop(self, channel):
+        pass
+
+    def stop_all(self):
+        pass
+
+
+class PygameSoundBackend:
+    """Sound backend on top of pygame.mixer with a reserved channel pool"""
+    name = 'pygame'
 
-class SoundManager:
     def __init__(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(44100, -16, 2, 2048)
+
+    def load(self, path: Path) -> Optional[pygame.mixer.Sound]:
+        """Decode a sound file once and reuse it across game resets"""
+        key = str(path)
+        if key not in _decoded_sounds:
+            if not path.exists():
+                return None
+            _decoded_sounds[key] = pygame.mixer.Sound(key)
+        return _decoded_sounds[key]
+
+    def make_sound(self, samples) -> pygame.mixer.Sound:
+        return pygame.sndarray.make_sound(samples)
+
+    def allocate_channels(self, count: int) -> List[pygame.mixer.Channel]:
+        """Reserve the first `count` mixer channels so pygame never reuses them"""
+        if pygame.mixer.get_num_channels() < count:
+            pygame.mixer.set_num_channels(count)
+        pygame.mixer.set_reserved(count)
+        return [pygame.mixer.Channel(i) for i in range(count)]
+
+    def is_busy(self, channel) -> bool:
+        return channel.get_busy()
+
+    def play(self, sound, channel, volume: float):
+        channel.set_volume(volume)
+        channel.play(sound)
+
+    def stop(self, channel):
+        channel.stop()
+
+    def stop_all(self):
+        pygame.mixer.stop()
+
+
+def create_sound_backend(headless: bool = False):
+    """Return the pygame backend, or the null backend when headless or no audio device"""
+    if headless:
+        return NullSoundBackend()
+    try:
+        return PygameSoundBackend()
+    except pygame.error as e:
+        print(f"Warning: Audio unavailable, using null sound backend: {e}")
+        return NullSoundBackend()
+
+
+class SoundManager:
+    def __init__(self, headless: bool = False, backend=None):
         """Initialize the sound manager"""
-        pygame.mixer.init(44100, -16, 2, 2048)
+        self.backend = backend if backend is not None else create_sound_backend(headless)
         self.sounds = {}
         self.sound_enabled = True
         self.current_music = None
-        
+
         # Define sound types and their volumes
         self.sound_config = {
             'chomp': 0.5,        # Pellet eating sound
@@ -20,63 +128,114 @@ class SoundManager:
             'game_start': 0.6,    # Game start sound
             'win': 0.7           # Victory sound
         }
-        
+
+        # Fixed channel pool per category
+        self.channels: Dict[str, List] = {}
+        channels = self.backend.allocate_channels(sum(CATEGORY_CHANNELS.values()))
+        start = 0
+        for category, count in CATEGORY_CHANNELS.items():
+            self.channels[category] = channels[start:start + count]
+            start += count
+        self._next_channel = {category: 0 for category in CATEGORY_CHANNELS}
+
+        # Rate limiting state
+        self.tick = 0
+        self.last_played: Dict[str, int] = {}
+        self.dropped = 0
+
         self.load_sounds()
-    
+
     def load_sounds(self):
-        """Load all game sounds"""
+        """Load all game sounds (decoded once per process)"""
         sounds_dir = Path("assets/sounds")
-        
-        for sound_name, volume in self.sound_config.items():
+
+        for sound_name in self.sound_config:
+            if sound_name in self.sounds:
+                continue
             sound_path = sounds_dir / f"{sound_name}.wav"
             try:
-                if sound_path.exists():
-                    sound = pygame.mixer.Sound(str(sound_path))
-                    sound.set_volume(volume)
+                sound = self.backend.load(sound_path)
+                if sound is not None:
                     self.sounds[sound_name] = sound
-                    print(f"Loaded sound: {sound_name}")
                 else:
                     print(f"Warning: Sound file not found: {sound_path}")
             except Exception as e:
                 print(f"Error loading sound {sound_name}: {e}")
-    
+
+    def update(self):
+        """Advance the rate-limiting clock by one game tick"""
+        self.tick += 1
+
+    def _acquire_channel(self, category: str):
+        """Return an idle channel of the category, stealing the oldest for non-pellet sounds"""
+        pool = self.channels[category]
+        for channel in pool:
+            if not self.backend.is_busy(channel):
+                return channel
+        if category == 'pellet':
+            return None
+        index = self._next_channel[category]
+        self._next_channel[category] = (index + 1) % len(pool)
+        return pool[index]
+
     def play_sound(self, sound_name):
-        """Play a sound effect"""
-        if self.sound_enabled and sound_name in self.sounds:
-            try:
-                channel = self.sounds[sound_name].play()
-                if sound_name == 'chomp':
-                    # Don't play overlapping chomp sounds
-                    if channel and channel.get_busy():
-                        return
-                elif sound_name in ['power_pellet', 'ghost_eat', 'death', 'win']:
-                    # Stop any ongoing chomp sounds for important effects
-                    self.stop_sound('chomp')
-            except Exception as e:
-                print(f"Error playing sound {sound_name}: {e}")
-    
+        """Play a sound effect, coalescing repeats within its rate-limit window"""
+        if not self.sound_enabled or sound_name not in self.sounds:
+            return
+
+        last = self.last_played.get(sound_name)
+        if last is not None and self.tick - last < SOUND_MIN_INTERVAL.get(sound_name, 1):
+            self.dropped += 1
+            return
+
+        category = SOUND_CATEGORIES.get(sound_name, 'effect')
+        channel = self._acquire_channel(category)
+        if channel is None:
+            # Don't play overlapping chomp sounds
+            self.dropped += 1
+            return
+
+        try:
+            if category != 'pellet':
+                # Stop any ongoing chomp sounds for important effects
+                self.stop_category('pellet')
+            self.backend.play(self.sounds[sound_name], channel, self.sound_config[sound_name])
+            self.last_played[sound_name] = self.tick
+        except Exception as e:
+            print(f"Error playing sound {sound_name}: {e}")
+
+    def stop_category(self, category: str):
+        """Stop every channel of a sound category"""
+        for channel in self.channels.get(category, []):
+            self.backend.stop(channel)
+
     def stop_sound(self, sound_name):
         """Stop a specific sound"""
-        if sound_name in self.sounds:
-            self.sounds[sound_name].stop()
-    
+        self.stop_category(SOUND_CATEGORIES.get(sound_name, 'effect'))
+
     def stop_all_sounds(self):
         """Stop all currently playing sounds"""
-        pygame.mixer.stop()
-    
+        self.backend.stop_all()
+
+    def reset(self):
+        """Reset rate-limiting state for a new game (decoded sounds are kept)"""
+        self.stop_all_sounds()
+        self.tick = 0
+        self.last_played.clear()
+
     def toggle_sound(self):
         """Toggle sound on/off"""
         self.sound_enabled = not self.sound_enabled
         if not self.sound_enabled:
             self.stop_all_sounds()
         return self.sound_enabled
-    
+
     # In sound_manager.py, add this method
     def create_placeholder_sounds(self):
         """Create simple placeholder sounds for testing"""
         sample_rate = 44100
         duration = 0.1  # seconds
-        
+
         # Create simple tones for each sound type
         for sound_name, frequency in {
             'chomp': 440,        # A4 note
@@ -89,4 +248,4 @@ class SoundManager:
             t = numpy.linspace(0, duration, int(sample_rate * duration))
             wave = numpy.sin(2 * numpy.pi * frequency * t)
             sound_array = numpy.int16(wave * 32767)
-            self.sounds[sound_name] = pygame.sndarray.make_sound(sound_array)
\ No newline at end of file
+            self.sounds[sound_name] = self.backend.make_sound(sound_array)
@@ -0,0 +1,213 @@
+import csv
+import gzip
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core import events
+
+TELEMETRY_CAPACITY = 1 << 16  # Records buffered in memory before new ones are dropped
+TICK_SAMPLE_EVERY = 6         # Ticks between per-tick records (10 per second of game time)
+BACKLOG_SAMPLE_FACTOR = 8     # Per-tick records are this much sparser while the writer lags
+HIGH_WATERMARK = 0.5          # Buffer fill at which the writer counts as lagging
+SEGMENT_RECORDS = 200000      # Records per segment file before rotating to the next
+FLUSH_INTERVAL = 0.5          # Seconds between background writes
+COMPRESS_LEVEL = 5
+CSV_FIELDS = ('tick', 'type', 'x', 'y', 'score', 'pellets', 'powered', 'frightened', 'count', 'detail', 'quality')
+
+
+class RingBuffer:
+    """
+    Fixed-size single-producer, single-consumer record queue. push() never
+    blocks or allocates: when the consumer has fallen a full buffer behind
+    the record is refused instead.
+    """
+
+    def __init__(self, capacity: int = TELEMETRY_CAPACITY):
+        self.capacity = capacity
+        self.slots: List[Optional[Dict]] = [None] * capacity
+        self.head = 0  # Records pushed so far (written only by the producer)
+        self.tail = 0  # Records popped so far (written only by the consumer)
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    def push(self, record: Dict) -> bool:
+        head = self.head
+        if head - self.tail >= self.capacity:
+            return False
+        self.slots[head % self.capacity] = record
+        self.head = head + 1  # Publish only after the slot is filled
+        return True
+
+    def pop_all(self) -> List[Dict]:
+        """Take every record pushed so far"""
+        head, tail, capacity = self.head, self.tail, self.capacity
+        records = [self.slots[i % capacity] for i in range(tail, head)]
+        for i in range(tail, head):
+            self.slots[i % capacity] = None
+        self.tail = head
+        return records
+
+
+class SegmentWriter:
+    """Writes records to gzip-compressed JSONL or CSV files, starting a new segment every segment_records"""
+
+    def __init__(self, directory, fmt: str = 'jsonl', segment_records: int = SEGMENT_RECORDS):
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError(f"Unknown telemetry format: {fmt}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.segment_records = segment_records
+        self.session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.segments: List[Path] = []
+        self.file = None
+        self.csv = None
+        self.written = 0  # Records in the current segment
+
+    def _rotate(self):
+        self.close()
+        path = self.directory / f"telemetry-{self.session}-{len(self.segments):04d}.{self.fmt}.gz"
+        self.file = gzip.open(path, 'wt', compresslevel=COMPRESS_LEVEL, newline='')
+        if self.fmt == 'csv':
+            self.csv = csv.DictWriter(self.file, CSV_FIELDS, extrasaction='ignore')
+            self.csv.writeheader()
+        self.segments.append(path)
+        self.written = 0
+
+    def write(self, records: List[Dict]):
+        while records:
+            if self.file is None or self.written >= self.segment_records:
+                self._rotate()
+            batch = records[:self.segment_records - self.written]
+            records = records[len(batch):]
+            if self.csv is not None:
+                self.csv.writerows(batch)
+            else:
+                self.file.write(''.join(json.dumps(record, separators=(',', ':')) + '\n'
+                                        for record in batch))
+            self.written += len(batch)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.csv = None
+
+
+class Telemetry:
+    """
+    Structured per-tick and per-event game records. The game loop only
+    pushes records into a ring buffer; a background thread drains it into
+    rotating compressed segments. When the writer falls behind, per-tick
+    records are sampled more sparsely, and once the buffer is full new
+    records are dropped and counted rather than waited on.
+    """
+
+    def __init__(self, directory, fmt: str = 'jsonl', capacity: int = TELEMETRY_CAPACITY,
+                 tick_every: int = TICK_SAMPLE_EVERY, segment_records: int = SEGMENT_RECORDS,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.buffer = RingBuffer(capacity)
+        self.writer = SegmentWriter(directory, fmt, segment_records)
+        self.tick_every = tick_every
+        self.flush_interval = flush_interval
+        self.dropped = 0       # Records refused because the buffer was full
+        self.sampled_out = 0   # Per-tick records skipped because the writer was lagging
+        self.written = 0
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='telemetry-writer', daemon=True)
+        self._thread.start()
+
+    def _push(self, record: Dict):
+        if not self.buffer.push(record):
+            self.dropped += 1
+
+    def event(self, tick: int, kind: str, **fields):
+        """Record something that happened during a tick"""
+        self._push({'tick': tick, 'type': kind, **fields})
+
+    def attach(self, game):
+        """Record the game's events (from its EventBus) as they are emitted"""
+        bus = game.events
+
+        def on_pellet(x, y, power):
+            self.event(bus.tick, 'power_pellet' if power else 'pellet', x=x, y=y, score=game.pacman.score)
+
+        def on_power(kind):
+            def handler(**_):
+                cell = game.pacman.cell
+                self.event(bus.tick, kind, x=cell[0], y=cell[1])
+            return handler
+
+        def on_target(target, cell):
+            # AI decision: the pellet Pacman heads for next
+            self.event(bus.tick, 'target', x=target[0], y=target[1], detail=f"from {cell[0]},{cell[1]}")
+
+        def on_ghost_eaten(cell, count):
+            self.event(bus.tick, 'ghost_eaten', x=cell[0], y=cell[1], count=count)
+
+        def on_death(cell):
+            self.event(bus.tick, 'death', x=cell[0], y=cell[1], score=game.pacman.score,
+                       pellets=game.maze.pellets_remaining())
+
+        def on_win():
+            self.event(bus.tick, 'win', score=game.pacman.score)
+
+        bus.subscribe(events.PELLET_EATEN, on_pellet)
+        bus.subscribe(events.POWER_START, on_power('power_start'))
+        bus.subscribe(events.POWER_END, on_power('power_end'))
+        bus.subscribe(events.TARGET_SELECTED, on_target)
+        bus.subscribe(events.GHOST_EATEN, on_ghost_eaten)
+        bus.subscribe(events.PACMAN_DIED, on_death)
+        bus.subscribe(events.LEVEL_CLEARED, on_win)
+
+    def sample(self, game):
+        """Record the game's state every tick_every ticks (more sparsely while the writer lags)"""
+        tick = game.tick_count
+        if tick % self.tick_every:
+            return
+        if len(self.buffer) > self.buffer.capacity * HIGH_WATERMARK and \
+                tick % (self.tick_every * BACKLOG_SAMPLE_FACTOR):
+            self.sampled_out += 1
+            return
+        pacman = game.pacman
+        self._push({'tick': tick, 'type': 'tick', 'x': round(pacman.x, 2), 'y': round(pacman.y, 2),
+                    'score': game.score, 'pellets': game.maze.pellets_remaining(),
+                    'powered': pacman.is_powered_up,
+                    'frightened': int(game.ghost_store.is_frightened[:game.ghost_store.count].sum()),
+                    'quality': game.quality.tier})
+
+    def _drain(self):
+        records = self.buffer.pop_all()
+        if records:
+            self.writer.write(records)
+            self.written += len(records)
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self._drain()
+            self._drain()
+        except BaseException as e:  # Keep the game running; report at close()
+            self.error = e
+        finally:
+            self.writer.close()
+
+    def stats(self) -> Dict:
+        return {'buffered': len(self.buffer), 'written': self.written,
+                'dropped': self.dropped, 'sampled_out': self.sampled_out,
+                'segments': len(self.writer.segments)}
+
+    def close(self):
+        """Write out everything still buffered and stop the writer thread"""
+        self._stop.set()
+        self._thread.join()
+        print(f"Telemetry: {self.written} records in {len(self.writer.segments)} segment(s) "
+              f"under {self.writer.directory} ({self.dropped} dropped, {self.sampled_out} sampled out)")
+        if self.error is not None:
+            print(f"Telemetry writer failed: {self.error!r}")
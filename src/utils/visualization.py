@@ -0,0 +1,279 @@
+import multiprocessing
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from ..config.constants import CELL_SIZE, SCOREBOARD_HEIGHT, TICK_RATE
+from .replay import DIRECTION_ORDER, Replay
+
+FRAME_CHUNK = 120            # Frames rendered per worker task
+MOUTH_ANGLES = range(0, 50, 5)  # Pacman mouth animation steps
+WALL_COLORS = ((0, 0, 255), (0, 0, 139))
+SCOREBOARD_COLORS = ((0, 0, 139), (0, 0, 128))
+PELLET_COLOR = (255, 255, 255)
+POWER_PELLET_COLOR = (255, 255, 128)
+
+Tile = Tuple[np.ndarray, np.ndarray]  # (rgb (h, w, 3), opaque mask (h, w))
+
+
+def _surface_tile(surface: pygame.Surface) -> Tile:
+    """Copy an SRCALPHA surface into (rgb, mask) arrays indexed [y, x]"""
+    rgb = pygame.surfarray.array3d(surface).swapaxes(0, 1).copy()
+    mask = pygame.surfarray.array_alpha(surface).swapaxes(0, 1) > 0
+    return rgb, mask
+
+
+def _gradient(height: int, width: int, top, bottom) -> np.ndarray:
+    factor = (np.arange(height) / max(height, 1))[:, None, None]
+    colors = np.array(top) * (1 - factor) + np.array(bottom) * factor
+    return np.broadcast_to(colors, (height, width, 3)).astype(np.uint8)
+
+
+class TileAtlas:
+    """
+    Sprites rasterized once with the game's own drawing code and kept as
+    NumPy tiles: walls, pellets, Pacman per direction and mouth angle, and
+    ghosts per color.
+    """
+
+    def __init__(self, ghost_colors, cell_size: int = CELL_SIZE):
+        from ..agents.ghost import GhostAgent
+        from ..agents.pacman import PacmanAgent
+        pygame.font.init()
+        self.cell_size = cell_size
+
+        wall = np.zeros((cell_size, cell_size, 3), dtype=np.uint8)
+        wall[1:-1, 1:-1] = _gradient(cell_size - 2, cell_size - 2, *WALL_COLORS)
+        self.wall = wall
+
+        self.pellet = self._circle(PELLET_COLOR, 4)
+        self.power_pellet = self._circle(POWER_PELLET_COLOR, 8)
+
+        pacman = PacmanAgent(0, 0)
+        pacman.autonomous_mode = False  # Don't draw its planned path
+        self.pacman: Dict[Tuple[int, int], Tile] = {}
+        for index, direction in enumerate(DIRECTION_ORDER):
+            for angle in MOUTH_ANGLES:
+                pacman.direction, pacman.mouth_angle = direction, angle
+                self.pacman[(index, angle)] = self._draw(pacman.draw)
+
+        ghost = GhostAgent(0, 0, (0, 0, 0))
+        self.ghosts: Dict[Tuple[int, int, int], Tile] = {}
+        for color in {tuple(int(c) for c in color) for color in ghost_colors}:
+            ghost.color = color
+            self.ghosts[color] = self._draw(ghost.draw)
+        ghost.is_frightened = True
+        self.frightened_ghost = self._draw(ghost.draw)
+
+        self.font = pygame.font.Font(None, 30)
+        self.glyphs: Dict[str, Tile] = {}
+
+    def _draw(self, draw) -> Tile:
+        surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+        draw(surface)
+        return _surface_tile(surface)
+
+    def _circle(self, color, radius: int) -> Tile:
+        surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (self.cell_size // 2, self.cell_size // 2), radius)
+        return _surface_tile(surface)
+
+    def glyph(self, char: str) -> Tile:
+        """Text glyph, rendered on first use"""
+        tile = self.glyphs.get(char)
+        if tile is None:
+            tile = self.glyphs[char] = _surface_tile(self.font.render(char, False, (255, 255, 255)))
+        return tile
+
+
+def stamp(frame: np.ndarray, tile: Tile, left: int, top: int):
+    """Copy a tile's opaque pixels into a frame at (left, top), clipped to the frame"""
+    rgb, mask = tile
+    height, width = mask.shape
+    x0, y0 = max(left, 0), max(top, 0)
+    x1, y1 = min(left + width, frame.shape[1]), min(top + height, frame.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    sub_mask = mask[y0 - top:y1 - top, x0 - left:x1 - left]
+    frame[y0:y1, x0:x1][sub_mask] = rgb[y0 - top:y1 - top, x0 - left:x1 - left][sub_mask]
+
+
+class FrameRenderer:
+    """
+    Rasterizes replay frames straight into NumPy arrays. The walls and
+    scoreboard are drawn once; the board (background plus pellets) is
+    updated incrementally as pellets get eaten, and each frame is the board
+    with the agents and score stamped on top.
+    """
+
+    def __init__(self, replay: Replay, atlas: Optional[TileAtlas] = None):
+        self.replay = replay
+        self.atlas = atlas or TileAtlas(replay.ghost_colors)
+        cs = self.atlas.cell_size
+        self.shape = (replay.height * cs + SCOREBOARD_HEIGHT, replay.width * cs, 3)
+
+        background = np.zeros(self.shape, dtype=np.uint8)
+        background[:SCOREBOARD_HEIGHT] = _gradient(SCOREBOARD_HEIGHT, self.shape[1], *SCOREBOARD_COLORS)
+        for y, row in enumerate(replay.layout):
+            for x, cell in enumerate(row):
+                if cell == 'W':
+                    top = y * cs + SCOREBOARD_HEIGHT
+                    background[top:top + cs, x * cs:(x + 1) * cs] = self.atlas.wall
+        self.background = background
+        self.board = background.copy()
+        self.board_frame: Optional[int] = None
+
+    def _cell_origin(self, x: float, y: float) -> Tuple[int, int]:
+        cs = self.atlas.cell_size
+        return int(x * cs), int(y * cs) + SCOREBOARD_HEIGHT
+
+    def _reset_board(self, frame: int):
+        """Rebuild the board for an arbitrary frame"""
+        np.copyto(self.board, self.background)
+        for x, y, power in self.replay.pellets_at(frame):
+            stamp(self.board, self.atlas.power_pellet if power else self.atlas.pellet, *self._cell_origin(x, y))
+        self.board_frame = frame
+
+    def _advance_board(self, frame: int):
+        """Erase the pellets eaten after the board's frame, up to `frame`"""
+        replay = self.replay
+        eaten = (replay.eaten_frame > self.board_frame) & (replay.eaten_frame <= frame)
+        cs = self.atlas.cell_size
+        for x, y in replay.eaten_cells[eaten].tolist():
+            left, top = self._cell_origin(x, y)
+            self.board[top:top + cs, left:left + cs] = self.background[top:top + cs, left:left + cs]
+        self.board_frame = frame
+
+    def render(self, frame: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Frame `frame` of the replay as an (H, W, 3) uint8 array"""
+        if self.board_frame is None or frame < self.board_frame:
+            self._reset_board(frame)
+        elif frame > self.board_frame:
+            self._advance_board(frame)
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        np.copyto(out, self.board)
+
+        replay, atlas = self.replay, self.atlas
+        for (x, y), frightened, color in zip(replay.ghost_xy[frame].tolist(),
+                                             replay.ghost_frightened[frame].tolist(),
+                                             replay.ghost_colors.tolist()):
+            tile = atlas.frightened_ghost if frightened else atlas.ghosts[tuple(color)]
+            stamp(out, tile, *self._cell_origin(x, y))
+
+        mouth = min(MOUTH_ANGLES, key=lambda angle: abs(angle - int(replay.pacman_mouth[frame])))
+        pacman_tile = atlas.pacman[(int(replay.pacman_direction[frame]), mouth)]
+        stamp(out, pacman_tile, *self._cell_origin(*replay.pacman_xy[frame].tolist()))
+
+        left = 20
+        for char in f"Score: {int(replay.score[frame])}":
+            glyph = atlas.glyph(char)
+            stamp(out, glyph, left, 10)
+            left += glyph[1].shape[1]
+        return out
+
+
+class PngSequenceWriter:
+    """Writes frames as numbered PNG files into a directory"""
+
+    def __init__(self, directory, prefix: str = 'frame'):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.count = 0
+
+    def write(self, frame: np.ndarray):
+        surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+        pygame.image.save(surface, str(self.directory / f"{self.prefix}_{self.count:06d}.png"))
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class FFmpegWriter:
+    """Streams raw frames into an ffmpeg process encoding a GIF or MP4"""
+
+    def __init__(self, path, size: Tuple[int, int], fps: float):
+        executable = shutil.which('ffmpeg')
+        if executable is None:
+            raise RuntimeError("ffmpeg not found on PATH; it is needed for GIF/MP4 output (PNG works without it)")
+        width, height = size
+        command = [executable, '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps),
+                   '-i', '-']
+        if str(path).endswith('.mp4'):
+            # H.264 in yuv420p needs even dimensions
+            command += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p']
+        command.append(str(path))
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self.count = 0
+
+    def write(self, frame: np.ndarray):
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+        self.count += 1
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+def open_writer(path, size: Tuple[int, int], fps: float):
+    """PNG sequence for directories, ffmpeg for .gif/.mp4 files"""
+    if Path(path).suffix in ('.gif', '.mp4'):
+        return FFmpegWriter(path, size, fps)
+    return PngSequenceWriter(path)
+
+
+# Per-process renderer used by pool workers (set up once by _init_worker)
+_worker_renderer: Optional[FrameRenderer] = None
+
+
+def _init_worker(replay: Replay):
+    global _worker_renderer
+    _worker_renderer = FrameRenderer(replay)
+
+
+def _render_chunk(task) -> np.ndarray:
+    frames, downscale = task
+    renderer = _worker_renderer
+    out = np.empty((len(frames),) + renderer.shape, dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        renderer.render(frame, out[i])
+    return out[:, ::downscale, ::downscale] if downscale > 1 else out
+
+
+def render_frames(replay: Replay, frames: Optional[List[int]] = None, processes: int = 1,
+                  downscale: int = 1, chunk: int = FRAME_CHUNK) -> Iterator[np.ndarray]:
+    """Yield rendered frames in order, rendering chunks of them in `processes` worker processes"""
+    frames = list(range(len(replay))) if frames is None else list(frames)
+    tasks = [(frames[i:i + chunk], downscale) for i in range(0, len(frames), chunk)]
+    if processes <= 1:
+        _init_worker(replay)
+        for task in tasks:
+            yield from _render_chunk(task)
+        return
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(replay,)) as pool:
+        # imap keeps chunks in order while later ones render in the background
+        for rendered in pool.imap(_render_chunk, tasks):
+            yield from rendered
+
+
+def render_replay(replay: Replay, out, stride: int = 1, processes: int = 1,
+                  downscale: int = 1, record_every: int = 1) -> int:
+    """Render every `stride`-th frame of a replay to a PNG directory or GIF/MP4 file, return frames written"""
+    frames = list(range(0, len(replay), stride))
+    height = (replay.height * CELL_SIZE + SCOREBOARD_HEIGHT + downscale - 1) // downscale
+    width = (replay.width * CELL_SIZE + downscale - 1) // downscale
+    writer = open_writer(out, (width, height), TICK_RATE / (record_every * stride))
+    try:
+        for frame in render_frames(replay, frames, processes, downscale):
+            writer.write(frame)
+    finally:
+        writer.close()
+    return writer.count
@@ -0,0 +1,164 @@
+"""
+Tune the agents' parameters (AgentSettings in src/config/settings.py) on
+seeded headless games played across a process pool. Candidates are drawn
+from a search space and whittled down by successive halving: every round
+plays the survivors on more seeds and keeps the best 1/eta of them, so bad
+configurations are dropped after a few games.
+
+    python sweep.py --param danger_radius=1,2,3 --param safe_radius=0,1,2 \\
+                    --param power_duration=400:900 --candidates 32
+    python sweep.py --objective ghosts --param reversal_penalty=0:3 \\
+                    --param same_direction_bonus=0:1.5
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')  # Pool.terminate() stops workers with SIGTERM
+
+from src.config.settings import AgentSettings
+
+WIN_BONUS = 2000  # Added to a won game's score, so clearing the maze beats farming ghosts
+
+Sampler = Callable[[random.Random], object]
+
+
+def parse_param(text: str) -> Tuple[str, Sampler]:
+    """NAME=v1,v2,... (pick one) or NAME=LOW:HIGH (uniform; integer if the default is)"""
+    name, _, spec = text.partition('=')
+    if name not in AgentSettings.DEFAULTS or not spec:
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=v1,v2 or NAME=LOW:HIGH with NAME one of {', '.join(AgentSettings.DEFAULTS)}")
+    kind = type(AgentSettings.DEFAULTS[name])
+    if ':' in spec:
+        low, high = (float(v) for v in spec.split(':'))
+        if kind is int:
+            return name, lambda rng: rng.randint(int(low), int(high))
+        return name, lambda rng: round(rng.uniform(low, high), 3)
+    values = [kind(float(v)) for v in spec.split(',')]
+    return name, lambda rng: rng.choice(values)
+
+
+def sample_candidates(space: Dict[str, Sampler], count: int, rng: random.Random) -> List[Dict]:
+    """The defaults plus count - 1 distinct random draws from the space"""
+    candidates = [{}]
+    seen = {()}
+    for _ in range(count * 20):
+        if len(candidates) >= count:
+            break
+        overrides = {name: sample(rng) for name, sample in space.items()}
+        key = tuple(sorted(overrides.items()))
+        if key not in seen:
+            seen.add(key)
+            candidates.append(overrides)
+    return candidates
+
+
+# Per-process level, loaded once by _init_worker
+_worker_level = None
+
+
+def _init_worker(level_path: Optional[str]):
+    global _worker_level
+    if level_path:
+        from src.core.map_loader import MapLoader
+        _worker_level = MapLoader().load_level(level_path)
+
+
+def play(task) -> Tuple[int, bool, int]:
+    """Play one seeded headless game, return (score, won, ticks)"""
+    overrides, seed, max_ticks, ghost_count = task
+    with contextlib.redirect_stdout(io.StringIO()):  # Games log their setup
+        from src.core.game import Game
+        game = Game(headless=True, level=_worker_level, ghost_count=ghost_count,
+                    settings=AgentSettings(**overrides), seed=seed)
+        ticks = game.simulate(max_ticks)
+    return game.score, game.game_won, ticks
+
+
+def fitness(results: List[Tuple[int, bool, int]], objective: str) -> float:
+    """Mean game value for the side being tuned (higher is better)"""
+    value = statistics.fmean(score + (WIN_BONUS if won else 0) for score, won, _ in results)
+    return value if objective == 'pacman' else -value
+
+
+def successive_halving(candidates: List[Dict], seeds: List[int], pool, args) -> List[Tuple[float, Dict]]:
+    """Evaluate candidates on growing numbers of seeds, keeping the best 1/eta each round"""
+    results: Dict[int, List[Tuple[int, bool, int]]] = {i: [] for i in range(len(candidates))}
+    alive = list(range(len(candidates)))
+    games = args.min_games
+    round_index = 0
+    while True:
+        games = min(games, len(seeds))
+        tasks, owners = [], []
+        for i in alive:
+            for seed in seeds[len(results[i]):games]:
+                tasks.append((candidates[i], seed, args.max_ticks, args.swarm))
+                owners.append(i)
+        # Seeds are appended in order, so results line up with seeds[:games]
+        for i, result in zip(owners, pool.imap(play, tasks)):
+            results[i].append(result)
+
+        ranked = sorted(alive, key=lambda i: fitness(results[i], args.objective), reverse=True)
+        print(f"Round {round_index}: {len(alive)} candidates x {games} games")
+        for i in ranked[:5]:
+            wins = sum(won for _, won, _ in results[i])
+            print(f"  {fitness(results[i], args.objective):>9.1f}  wins {wins}/{games}  {AgentSettings(**candidates[i])!r}")
+
+        if len(ranked) == 1 or games == len(seeds):
+            return [(fitness(results[i], args.objective), candidates[i]) for i in ranked]
+        alive = ranked[:max(1, math.ceil(len(ranked) / args.eta))]
+        games *= args.eta
+        round_index += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune agent settings with successive halving")
+    parser.add_argument('--param', type=parse_param, action='append', default=[], metavar='NAME=SPEC',
+                        help="Search space entry: NAME=v1,v2,... or NAME=LOW:HIGH (repeatable)")
+    parser.add_argument('--objective', choices=('pacman', 'ghosts'), default='pacman',
+                        help="Side being tuned: maximise or minimise Pacman's score")
+    parser.add_argument('--candidates', type=int, default=27, help="Configurations sampled (defaults included)")
+    parser.add_argument('--eta', type=int, default=3, help="Keep 1/eta of the candidates per round")
+    parser.add_argument('--min-games', type=int, default=2, help="Games per candidate in the first round")
+    parser.add_argument('--max-games', type=int, default=54, help="Most games a candidate plays")
+    parser.add_argument('--max-ticks', type=int, default=6000, help="Tick limit per game")
+    parser.add_argument('--seed', type=int, default=0, help="Seeds the sampling and the games")
+    parser.add_argument('--level', help="Level file to tune on instead of LEVEL_1")
+    parser.add_argument('--swarm', type=int, help="Ghost count override")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--out', help="Write the ranking as JSON here")
+    args = parser.parse_args()
+    if not args.param:
+        parser.error("give at least one --param")
+
+    rng = random.Random(args.seed)
+    candidates = sample_candidates(dict(args.param), args.candidates, rng)
+    seeds = [args.seed * 100003 + i for i in range(args.max_games)]
+    print(f"Sweeping {len(candidates)} candidates on up to {len(seeds)} seeded games "
+          f"with {args.processes} processes")
+
+    with multiprocessing.Pool(args.processes, initializer=_init_worker, initargs=(args.level,)) as pool:
+        ranking = successive_halving(candidates, seeds, pool, args)
+
+    best_fitness, best = ranking[0]
+    print(f"Best: {AgentSettings(**best)!r} (fitness {best_fitness:.1f})")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'objective': args.objective,
+                       'ranking': [{'fitness': value, 'settings': AgentSettings(**overrides).as_dict()}
+                                   for value, overrides in ranking]}, f, indent=2)
+        print(f"Ranking written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
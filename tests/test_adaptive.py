@@ -0,0 +1,43 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from src.algorithms.adaptive import AdaptivePlanner
+from src.algorithms.distances import BFSDistanceCache
+from src.algorithms.search import BreadthFirstSearch
+from src.config.maze_layouts import LEVEL_1
+from src.environment.maze import Maze
+
+
+@pytest.fixture
+def maze() -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(LEVEL_1[0]), len(LEVEL_1))
+        maze.load_layout(LEVEL_1)
+    return maze
+
+
+def queries(maze, count: int = 300):
+    rng = random.Random(3)
+    cells = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_valid_position(x, y)]
+    return [(rng.choice(cells), rng.sample(cells, rng.choice([1, 3, 8]))) for _ in range(count)]
+
+
+def test_default_choice_ignores_timing(maze):
+    planner = AdaptivePlanner(BFSDistanceCache(maze))
+    first = [planner.find_path(start, goals, maze) for start, goals in queries(maze)]
+    # Costs that would flip every measured choice change nothing by default
+    for costs in planner.costs.values():
+        for name in costs:
+            costs[name] = -costs[name]
+    second = [planner.find_path(start, goals, maze) for start, goals in queries(maze)]
+    assert first == second
+
+
+def test_every_strategy_is_shortest(maze):
+    planner = AdaptivePlanner(BFSDistanceCache(maze), measure=True)
+    for start, goals in queries(maze):
+        assert len(planner.find_path(start, goals, maze)) == len(BreadthFirstSearch().find_path(start, goals, maze))
+    assert set(planner.dispatched) == {'bfs', 'astar', 'table'}
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from src.agents.ghost_store import GhostStore
+from src.algorithms.cooperative import (COOP_MAX_EXPANSIONS, COOP_REPLANS_PER_TICK,
+                                        CooperativeGhostPlanner, ReservationTable)
+from src.algorithms.distances import BFSDistanceCache
+from src.config.maze_layouts import LEVEL_1
+from src.environment.maze import Maze
+
+
+def load(layout) -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(layout[0]), len(layout))
+        maze.load_layout(layout)
+    return maze
+
+
+def open_room(size: int) -> list:
+    wall = 'W' * size
+    return [wall] + ['W' + '.' * (size - 2) + 'W' for _ in range(size - 2)] + [wall]
+
+
+def walkable_cells(maze):
+    return [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_valid_position(x, y)]
+
+
+def claims(start, path, t0):
+    """(cell, t) pairs and (from, to, t) moves of one plan"""
+    cells = [start] + path
+    return ({(cell, t) for t, cell in enumerate(cells, t0)},
+            {(a, b, t) for t, (a, b) in enumerate(zip(cells, cells[1:]), t0 + 1)})
+
+
+@pytest.mark.parametrize('layout, seed', [(LEVEL_1, 0), (LEVEL_1, 1), (open_room(8), 2)])
+def test_plans_never_share_cells_or_swap(layout, seed):
+    maze = load(layout)
+    rng = random.Random(seed)
+    cells = walkable_cells(maze)
+    planner = CooperativeGhostPlanner(BFSDistanceCache(maze))
+    starts = rng.sample(cells, 6)
+    goals = [rng.choice(cells)] * 3 + rng.sample(cells, 3)
+
+    taken, moves = set(), set()
+    for ghost_id, (start, goal) in enumerate(zip(starts, goals)):
+        path = planner.plan_ghost(ghost_id, start, goal, t0=0)
+        for a, b in zip([start] + path, path):
+            assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        plan_cells, plan_moves = claims(start, path, 0)
+        assert not plan_cells & taken
+        assert not {(b, a, t) for a, b, t in plan_moves} & moves
+        taken |= plan_cells
+        moves |= plan_moves
+
+
+def test_reservation_table_release_and_swap():
+    table = ReservationTable()
+    table.reserve(0, (1, 1), [(2, 1), (3, 1)], 0)
+    assert not table.is_free(1, (2, 2), (2, 1), 1)      # Cell taken at t=1
+    assert table.is_free(1, (2, 2), (2, 1), 2)          # Free again at t=2
+    assert not table.is_free(1, (2, 1), (1, 1), 1)      # Would swap with ghost 0
+    assert table.is_free(0, (1, 1), (2, 1), 1)          # Own claims never block
+    table.release(0)
+    assert len(table) == 0 and not table.edges
+
+
+def test_replans_and_expansions_stay_bounded():
+    maze = load(open_room(40))
+    rng = random.Random(5)
+    cells = walkable_cells(maze)
+    planner = CooperativeGhostPlanner(BFSDistanceCache(maze), window=200)
+    store = GhostStore(capacity=32, seed=5)
+    for x, y in rng.sample(cells, 3 * COOP_REPLANS_PER_TICK):
+        store.spawn(x, y, (255, 0, 0))
+
+    searches = planner.searches
+    for tick in range(5):
+        planner.update(store, maze, rng.choice(cells), tick)
+        assert planner.searches - searches <= COOP_REPLANS_PER_TICK
+        searches = planner.searches
+
+    # A long window across a big room would expand far more than the budget
+    before = planner.expansions
+    planner.plan_ghost(999, (1, 1), (38, 38), t0=0)
+    assert planner.expansions - before <= COOP_MAX_EXPANSIONS
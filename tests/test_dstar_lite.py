@@ -0,0 +1,100 @@
+import contextlib
+import heapq
+import io
+import math
+import random
+
+import pytest
+
+from src.algorithms.dstar_lite import DStarLite
+from src.config.maze_layouts import LEVEL_1
+from src.environment.maze import Maze
+
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+@pytest.fixture
+def maze() -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(LEVEL_1[0]), len(LEVEL_1))
+        maze.load_layout(LEVEL_1)
+    return maze
+
+
+def neighbors(maze, cell):
+    return [(cell[0] + dx, cell[1] + dy) for dx, dy in DIRECTIONS
+            if maze.is_valid_position(cell[0] + dx, cell[1] + dy)]
+
+
+def astar_cost(maze, start, goal, extra_costs) -> float:
+    """Cost of the cheapest start-goal path from a fresh A*, inf if there is none"""
+    h = lambda c: abs(c[0] - goal[0]) + abs(c[1] - goal[1])
+    g = {start: 0}
+    open_set = [(h(start), 0, start)]
+    while open_set:
+        _, cost, cell = heapq.heappop(open_set)
+        if cell == goal:
+            return cost
+        if cost > g[cell]:
+            continue
+        for n in neighbors(maze, cell):
+            step = cost + 1 + extra_costs.get(n, 0)
+            if step < g.get(n, math.inf):
+                g[n] = step
+                heapq.heappush(open_set, (step + h(n), step, n))
+    return math.inf
+
+
+def path_cost(maze, start, path, extra_costs) -> float:
+    cost = 0
+    for a, b in zip([start] + path[:-1], path):
+        assert b in neighbors(maze, a)
+        cost += 1 + extra_costs.get(b, 0)
+    return cost
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_replans_match_fresh_astar(maze, seed):
+    rng = random.Random(seed)
+    cells = [(x, y) for x in range(maze.width) for y in range(maze.height)
+             if maze.is_valid_position(x, y)]
+    start, goal = rng.sample(cells, 2)
+    planner = DStarLite(maze)
+    blocked = {}
+    for _ in range(60):
+        # Block a couple of cells (never the start or goal), sometimes only raising
+        # their cost, and unblock the oldest so a handful stay blocked at a time
+        for cell in rng.sample(cells, 2):
+            if cell not in (start, goal):
+                blocked[cell] = math.inf if rng.random() < 0.7 else rng.choice([2, 5])
+        while len(blocked) > 8:
+            del blocked[next(iter(blocked))]
+
+        path = planner.plan(start, goal, dict(blocked))
+        expected = astar_cost(maze, start, goal, blocked)
+        if expected == math.inf:
+            assert path == []
+        else:
+            assert path and path[-1] == goal
+            assert path_cost(maze, start, path, blocked) == expected
+            if all(cost == math.inf for cost in blocked.values()):
+                assert len(path) == expected
+
+        # Step the start along the plan, or randomly when there is none
+        options = [n for n in neighbors(maze, start) if blocked.get(n) != math.inf]
+        if path and rng.random() < 0.8:
+            start = path[0]
+        elif options:
+            start = rng.choice(options)
+        if start == goal:
+            start = rng.choice([c for c in cells if c != goal and c not in blocked])
+    assert planner.resets == 1
+
+
+def test_new_goal_resets_search(maze):
+    planner = DStarLite(maze)
+    a, b, c = maze.pellet_positions()[:3]
+    planner.plan(a, b)
+    planner.plan(a, c)
+    assert planner.resets == 2
+    assert planner.plan(a, c)[-1] == c
@@ -0,0 +1,166 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+from src.agents.ghost_store import DIRECTION_ORDER, GhostStore
+from src.config.constants import Direction, GHOST_SPEED
+from src.config.maze_layouts import LEVEL_1
+from src.environment.maze import Maze
+
+
+class ReferenceGhost:
+    """The per-object ghost update the store replaced, with random picks pinned to the first option"""
+
+    def __init__(self, x: int, y: int, home: tuple):
+        self.x, self.y = float(x), float(y)
+        self.direction = Direction.RIGHT
+        self.is_frightened = False
+        self.frightened_timer = 0
+        self.speed = GHOST_SPEED
+        self.scatter_mode = False
+        self.scatter_timer = 0
+        self.home_corner = home
+        self.stuck_counter = 0
+        self.last_position = (x, y)
+        self.direction_change_cooldown = 0
+        self.last_valid_direction = None
+
+    @staticmethod
+    def _opposite(a: Direction, b: Direction) -> bool:
+        return a.value[0] == -b.value[0] and a.value[1] == -b.value[1]
+
+    def get_valid_moves(self, maze, exclude_reverse: bool = True) -> list:
+        cx, cy = int(round(self.x)), int(round(self.y))
+        moves = [d for d in Direction
+                 if not (exclude_reverse and self._opposite(d, self.direction))
+                 and maze.is_valid_position(cx + d.value[0], cy + d.value[1])]
+        if not moves and exclude_reverse:
+            return self.get_valid_moves(maze, exclude_reverse=False)
+        return moves
+
+    def choose_direction(self, maze, pacman_pos: tuple) -> Direction:
+        cx, cy = int(round(self.x)), int(round(self.y))
+        if self.direction_change_cooldown > 0:
+            self.direction_change_cooldown -= 1
+            if maze.is_valid_position(cx + self.direction.value[0], cy + self.direction.value[1]):
+                return self.direction
+        valid_moves = self.get_valid_moves(maze)
+        if not valid_moves:
+            return self.direction
+        if self.is_frightened:
+            safe = [m for m in valid_moves
+                    if abs(cx + m.value[0] - pacman_pos[0]) + abs(cy + m.value[1] - pacman_pos[1]) > 3]
+            self.direction = (safe or valid_moves)[0]
+            self.direction_change_cooldown = 2
+            return self.direction
+        target = self.home_corner if self.scatter_mode else pacman_pos
+        scores = []
+        for move in valid_moves:
+            score = -(abs(cx + move.value[0] - target[0]) + abs(cy + move.value[1] - target[1]))
+            if move == self.direction:
+                score += 0.5
+            if self.last_valid_direction and self._opposite(move, self.last_valid_direction):
+                score -= 1
+            scores.append((score, move))
+        self.direction = max(scores, key=lambda s: s[0])[1]
+        self.last_valid_direction = self.direction
+        self.direction_change_cooldown = 2
+        return self.direction
+
+    def update(self, maze, pacman_pos: tuple):
+        if self.is_frightened:
+            self.frightened_timer -= 1
+            if self.frightened_timer <= 0:
+                self.is_frightened = False
+                self.speed = GHOST_SPEED
+        if self.scatter_mode:
+            self.scatter_timer -= 1
+            if self.scatter_timer <= 0:
+                self.scatter_mode = False
+        current = (int(round(self.x)), int(round(self.y)))
+        if current == self.last_position:
+            self.stuck_counter += 1
+            if self.stuck_counter > 5:
+                moves = self.get_valid_moves(maze, exclude_reverse=False)
+                if moves:
+                    self.direction = moves[0]
+                self.stuck_counter = 0
+        else:
+            self.stuck_counter = 0
+        self.last_position = current
+        self.direction = self.choose_direction(maze, pacman_pos)
+        next_x = self.x + self.direction.value[0] * self.speed
+        next_y = self.y + self.direction.value[1] * self.speed
+        if maze.is_valid_position(int(round(next_x)), int(round(next_y))):
+            self.x, self.y = next_x, next_y
+
+
+def first_choice(mask: np.ndarray) -> np.ndarray:
+    return np.argmax(mask, axis=1).astype(np.int8)
+
+
+@pytest.fixture
+def maze() -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(LEVEL_1[0]), len(LEVEL_1))
+        maze.load_layout(LEVEL_1)
+    return maze
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_store_matches_per_object_update(maze, seed):
+    rng = random.Random(seed)
+    cells = [(x, y) for x in range(maze.width) for y in range(maze.height)
+             if maze.is_valid_position(x, y)]
+    store = GhostStore(capacity=4)
+    store._random_choice = first_choice
+    reference = []
+    for _ in range(4):
+        x, y = rng.choice(cells)
+        home = rng.choice(cells)
+        ghost = store.spawn(x, y, (255, 0, 0))
+        ghost.set_home_corner(home)
+        reference.append(ReferenceGhost(x, y, home))
+
+    for tick in range(600):
+        pacman_pos = rng.choice(cells) if tick % 40 == 0 else pacman_pos
+        event = rng.random()
+        if event < 0.01:
+            i = rng.randrange(4)
+            store.frighten([i])
+            reference[i].is_frightened = True
+            reference[i].frightened_timer = store.settings.frightened_duration
+            reference[i].speed = GHOST_SPEED * 0.5
+        elif event < 0.02:
+            i = rng.randrange(4)
+            store.scatter_mode[i] = True
+            store.scatter_timer[i] = 420
+            reference[i].scatter_mode = True
+            reference[i].scatter_timer = 420
+
+        store.update(maze, pacman_pos)
+        for ghost in reference:
+            ghost.update(maze, pacman_pos)
+
+        for i, ghost in enumerate(reference):
+            assert (store.x[i], store.y[i]) == (ghost.x, ghost.y), f"tick {tick} ghost {i}"
+            assert DIRECTION_ORDER[store.direction[i]] == ghost.direction
+            assert store.is_frightened[i] == ghost.is_frightened
+            assert store.scatter_mode[i] == ghost.scatter_mode
+            assert store.cooldown[i] == ghost.direction_change_cooldown
+            assert store.stuck_counter[i] == ghost.stuck_counter
+
+
+def test_subset_update_leaves_other_ghosts_alone(maze):
+    x, y = maze.pellet_positions()[0]
+    store = GhostStore(capacity=2, seed=3)
+    store.spawn(x, y, (255, 0, 0))
+    store.spawn(x, y, (0, 255, 0))
+    before = store.snapshot()[0].copy()
+    store.update(maze, (x, y), idx=np.array([0]))
+    after = store.snapshot()[0]
+    assert after[1] == before[1]
+    assert after[0] != before[0]
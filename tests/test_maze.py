@@ -0,0 +1,78 @@
+import contextlib
+import io
+
+import pytest
+
+from src.config.constants import CellType
+from src.config.maze_layouts import LEVEL_1
+from src.environment.bitboard import iter_cells, zobrist_keys
+from src.environment.maze import Maze
+
+
+@pytest.fixture
+def maze() -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(LEVEL_1[0]), len(LEVEL_1))
+        maze.load_layout(LEVEL_1)
+    return maze
+
+
+def recomputed_hash(maze: Maze) -> int:
+    """Zobrist hash of the maze's pellets, from scratch"""
+    pellet_keys, power_keys = zobrist_keys(maze.width * maze.height)
+    value = 0
+    for bits, keys in ((maze.pellet_bits, pellet_keys), (maze.power_bits, power_keys)):
+        for x, y in iter_cells(bits, maze.width):
+            value ^= keys[y * maze.width + x]
+    return value
+
+
+def test_hash_after_load(maze):
+    assert maze.pellet_hash == recomputed_hash(maze)
+
+
+def test_hash_follows_eaten_pellets(maze):
+    pellets = maze.pellet_positions()
+    for x, y in pellets[::3]:
+        maze.eat_pellet(x, y)
+        assert maze.pellet_hash == recomputed_hash(maze)
+    # Eating an empty cell changes nothing
+    x, y = pellets[0]
+    before = maze.pellet_hash
+    assert not maze.eat_pellet(x, y)
+    assert maze.pellet_hash == before
+
+
+def test_hash_after_restore(maze):
+    start_board, start_hash = maze.pellet_board(), maze.pellet_hash
+    for x, y in maze.pellet_positions()[:20]:
+        maze.eat_pellet(x, y)
+    middle_board, middle_hash = maze.pellet_board(), maze.pellet_hash
+    for x, y in maze.pellet_positions():
+        maze.eat_pellet(x, y)
+    assert maze.pellet_hash == recomputed_hash(maze) == 0
+
+    maze.restore_pellets(*middle_board)
+    assert maze.pellet_hash == middle_hash == recomputed_hash(maze)
+    maze.restore_pellets(*start_board)
+    assert maze.pellet_hash == start_hash == recomputed_hash(maze)
+
+
+def test_hash_after_set_cell_type(maze):
+    x, y = maze.pellet_positions()[0]
+    for cell_type in (CellType.POWER_PELLET, CellType.PATH, CellType.PELLET, CellType.WALL, CellType.PELLET):
+        maze.set_cell_type(x, y, cell_type)
+        assert maze.pellet_hash == recomputed_hash(maze)
+
+
+def test_equal_boards_hash_equal(maze):
+    with contextlib.redirect_stdout(io.StringIO()):
+        other = Maze(maze.width, maze.height)
+        other.load_layout(LEVEL_1)
+    pellets = maze.pellet_positions()
+    # The same pellets eaten in a different order give the same hash
+    for x, y in pellets[:10]:
+        maze.eat_pellet(x, y)
+    for x, y in reversed(pellets[:10]):
+        other.eat_pellet(x, y)
+    assert maze.pellet_hash == other.pellet_hash
@@ -0,0 +1,91 @@
+import contextlib
+import io
+
+import pytest
+
+from src.algorithms.path_cache import CachedSearch, PathCache
+from src.algorithms.search import BreadthFirstSearch
+from src.config.constants import CellType
+from src.config.maze_layouts import LEVEL_1
+from src.environment.maze import Maze
+
+
+class CountingBFS(BreadthFirstSearch):
+    def __init__(self):
+        self.calls = 0
+
+    def find_path(self, start, goals, maze):
+        self.calls += 1
+        return super().find_path(start, goals, maze)
+
+
+def load() -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(LEVEL_1[0]), len(LEVEL_1))
+        maze.load_layout(LEVEL_1)
+    return maze
+
+
+@pytest.fixture
+def maze() -> Maze:
+    return load()
+
+
+def test_hits_and_misses(maze):
+    search = CachedSearch(CountingBFS())
+    start, a, b = maze.pellet_positions()[:3]
+    first = search.find_path(start, [a, b], maze)
+    assert search.find_path(start, [b, a], maze) == first  # Goal order doesn't matter
+    assert (search.cache.hits, search.cache.misses, search.algorithm.calls) == (1, 1, 1)
+
+    # Callers get copies: changing one doesn't change the cached path
+    first.clear()
+    assert search.find_path(start, [a, b], maze)
+    search.find_path(a, [b], maze)
+    assert (search.cache.hits, search.cache.misses, search.algorithm.calls) == (2, 2, 2)
+
+
+def test_least_recently_used_is_evicted():
+    cache = PathCache(capacity=2)
+    cache.put('a', [(0, 0)])
+    cache.put('b', [(1, 0)])
+    assert cache.get('a') == [(0, 0)]  # 'a' is now more recent than 'b'
+    cache.put('c', [(2, 0)])
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == [(0, 0)] and cache.get('c') == [(2, 0)]
+
+
+def test_wall_change_invalidates(maze):
+    search = CachedSearch(CountingBFS())
+    start, goal = (1, 1), (8, 1)
+    path = search.find_path(start, [goal], maze)
+    version = maze.version
+
+    # Eating pellets keeps the walls, and so the cached path
+    for x, y in maze.pellet_positions()[:10]:
+        maze.eat_pellet(x, y)
+    assert maze.version == version
+    assert search.find_path(start, [goal], maze) == path
+    assert search.algorithm.calls == 1
+
+    blocked = path[len(path) // 2]
+    maze.set_cell_type(*blocked, CellType.WALL)
+    assert maze.version != version
+    detour = search.find_path(start, [goal], maze)
+    assert search.algorithm.calls == 2
+    assert blocked not in detour and len(detour) > len(path)
+
+    # Opening the wall again brings the old version, and entry, back
+    maze.set_cell_type(*blocked, CellType.PATH)
+    assert maze.version == version
+    assert search.find_path(start, [goal], maze) == path
+    assert search.algorithm.calls == 2
+
+
+def test_new_maze_with_same_walls_reuses_entries(maze):
+    search = CachedSearch(CountingBFS())
+    start, goal = maze.pellet_positions()[:2]
+    path = search.find_path(start, [goal], maze)
+    assert search.find_path(start, [goal], load()) == path
+    assert search.algorithm.calls == 1
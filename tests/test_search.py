@@ -0,0 +1,76 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from src.algorithms.search import AStarSearch, BidirectionalAStar, BidirectionalBFS, BreadthFirstSearch
+from src.config.maze_layouts import LEVEL_1
+from src.environment.maze import Maze
+
+# Two rooms with no opening between them
+SPLIT_LAYOUT = [
+    "WWWWWWWWW",
+    "W...W...W",
+    "W...W...W",
+    "W...W...W",
+    "WWWWWWWWW",
+]
+
+
+def load(layout) -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(layout[0]), len(layout))
+        maze.load_layout(layout)
+    return maze
+
+
+def assert_valid(path, start, goals, maze):
+    assert path[-1] in goals
+    for a, b in zip([start] + path[:-1], path):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        assert maze.is_valid_position(*b)
+
+
+def walkable_cells(maze):
+    return [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_valid_position(x, y)]
+
+
+@pytest.fixture
+def maze() -> Maze:
+    return load(LEVEL_1)
+
+
+@pytest.mark.parametrize('bidirectional', [BidirectionalBFS, BidirectionalAStar])
+def test_bidirectional_matches_one_sided_length(maze, bidirectional):
+    rng = random.Random(7)
+    cells = walkable_cells(maze)
+    for _ in range(200):
+        start, goal = rng.sample(cells, 2)
+        shortest = BreadthFirstSearch().find_path(start, [goal], maze)
+        path = bidirectional().find_path(start, [goal], maze)
+        assert len(path) == len(shortest)
+        assert_valid(path, start, [goal], maze)
+        # AStarSearch never requeues a node it has seen, so it can come out
+        # longer than the optimum but never shorter
+        assert len(path) <= len(AStarSearch().find_path(start, [goal], maze))
+
+
+def test_bidirectional_bfs_nearest_of_several_goals(maze):
+    rng = random.Random(11)
+    cells = walkable_cells(maze)
+    for _ in range(100):
+        start = rng.choice(cells)
+        goals = rng.sample(cells, rng.randint(2, 6))
+        if start in goals:
+            continue
+        expected = BreadthFirstSearch().find_path(start, goals, maze)
+        path = BidirectionalBFS().find_path(start, goals, maze)
+        assert len(path) == len(expected)
+        assert_valid(path, start, goals, maze)
+
+
+@pytest.mark.parametrize('algorithm', [BreadthFirstSearch, AStarSearch, BidirectionalBFS, BidirectionalAStar])
+def test_no_path_between_rooms(algorithm):
+    maze = load(SPLIT_LAYOUT)
+    assert algorithm().find_path((1, 1), [(7, 3)], maze) == []
@@ -0,0 +1,55 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from src.core.game import Game
+
+
+@pytest.fixture
+def game() -> Game:
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(headless=True, seed=3)
+    return game
+
+
+def run(game: Game, ticks: int) -> list:
+    """Per-tick trace of everything a rollback must reproduce"""
+    trace = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(ticks):
+            game.update()
+            trace.append((game.tick_count, game.events.tick, game.pacman.cell, game.ghost_store.positions(),
+                          game.score, game.maze.pellet_bits, game.maze.power_bits, game.maze.pellet_hash))
+    return trace
+
+
+def rng_draws(game: Game) -> tuple:
+    """Next values of both random streams (consumes them)"""
+    return random.random(), game.ghost_store.rng.random()
+
+
+@pytest.mark.parametrize('cooperative', [False, True])
+def test_restore_replays_the_same_ticks(game, cooperative):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.set_cooperative(cooperative)
+    run(game, 60)
+    state = game.snapshot()
+
+    first = run(game, 300)
+    first_draws = rng_draws(game)
+    game.restore(state)
+    assert (game.tick_count, game.events.tick, game.score) == (state.tick_count, state.tick_count, state.score)
+    second = run(game, 300)
+
+    assert second == first
+    assert rng_draws(game) == first_draws
+
+
+def test_snapshot_is_unchanged_by_later_ticks(game):
+    run(game, 30)
+    state = game.snapshot()
+    fields = (state.tick_count, state.score, state.pellet_bits, state.power_bits, state.ghosts[0].tobytes())
+    run(game, 200)
+    assert (state.tick_count, state.score, state.pellet_bits, state.power_bits, state.ghosts[0].tobytes()) == fields
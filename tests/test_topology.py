@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.environment.topology import NO_LABEL, MazeTopology
+
+# A loop with one dead-end branch hanging off its bottom middle cell (3, 3),
+# plus a separate two-cell pocket at the bottom right
+LAYOUT = [
+    "#########",
+    "#.....###",
+    "#.###.###",
+    "#.....###",
+    "###.#####",
+    "###.###.#",
+    "###..##.#",
+    "#########",
+]
+
+
+@pytest.fixture
+def topology() -> MazeTopology:
+    return MazeTopology(np.array([[c == '.' for c in row] for row in LAYOUT]))
+
+
+def test_dead_end_depths(topology):
+    branch = [(3, 4), (3, 5), (3, 6), (4, 6)]
+    for depth, cell in enumerate(branch, 1):
+        assert topology.depth(cell) == depth
+        assert topology.entrance(cell) == (3, 3)
+    assert topology.depth((3, 3)) == 0
+    assert not any(topology.is_dead_end((x, y)) for x in range(1, 6) for y in (1, 3))
+    assert topology.branch_cells([(3, 5)]) == {(3, 5), (3, 4)}
+
+
+def test_articulation_points(topology):
+    points = {(int(x), int(y)) for y, x in zip(*np.nonzero(topology.articulation))}
+    assert points == {(3, 3), (3, 4), (3, 5), (3, 6)}
+    assert not topology.is_articulation((4, 6))
+    assert not topology.is_articulation((-1, 0))
+
+
+def test_corridors(topology):
+    loop = [(2, 3), (1, 3), (1, 2), (1, 1), (2, 1), (3, 1), (4, 1), (5, 1), (5, 2), (5, 3), (4, 3)]
+    corridors = sorted(topology.corridors, key=len, reverse=True)
+    assert corridors[0] in (loop, loop[::-1])
+    assert corridors[1] in ([(3, 4), (3, 5), (3, 6)], [(3, 6), (3, 5), (3, 4)])
+    assert len(corridors) == 2
+    assert topology.corridor[3, 3] == NO_LABEL  # Junction
+    assert topology.junctions == [(3, 3)]
+
+
+def test_regions(topology):
+    assert sorted(topology.component_sizes) == [2, 16]
+    assert topology.reachable((1, 1), (4, 6))
+    assert not topology.reachable((1, 1), (7, 5))
+    # A region without a loop is one dead end entered from one of its ends
+    assert sorted(topology.depth(cell) for cell in [(7, 5), (7, 6)]) == [0, 1]
@@ -0,0 +1,62 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from src.algorithms.distances import BFSDistanceCache
+from src.algorithms.tour import TourPlanner
+from src.config.maze_layouts import LEVEL_1
+from src.environment.maze import Maze
+
+
+@pytest.fixture
+def maze() -> Maze:
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(len(LEVEL_1[0]), len(LEVEL_1))
+        maze.load_layout(LEVEL_1)
+    return maze
+
+
+def tour_length(distances, start, tour) -> int:
+    return sum(distances.distance(a, b) for a, b in zip([start] + tour[:-1], tour))
+
+
+def greedy_tour(distances, start, pellets) -> list:
+    """Plain nearest-neighbour order, the baseline the planner improves on"""
+    planner = TourPlanner(distances)
+    nodes = [start] + pellets
+    order = planner._nearest_neighbor(planner._distance_matrix(nodes))
+    return [nodes[i] for i in order[1:]]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_tour_visits_each_pellet_once_and_beats_greedy(maze, seed):
+    rng = random.Random(seed)
+    distances = BFSDistanceCache(maze)
+    pellets = maze.pellet_positions()
+    start = rng.choice(pellets)
+    pellets = rng.sample(pellets, rng.randint(5, len(pellets)))
+
+    planner = TourPlanner(distances)
+    planner.build(start, pellets)
+
+    assert sorted(planner.tour) == sorted(pellets)
+    assert len(set(planner.tour)) == len(planner.tour)
+    greedy = greedy_tour(distances, start, pellets)
+    assert tour_length(distances, start, planner.tour) <= tour_length(distances, start, greedy)
+
+
+def test_next_target_follows_tour_as_pellets_are_eaten(maze):
+    distances = BFSDistanceCache(maze)
+    planner = TourPlanner(distances)
+    start = maze.pellet_positions()[0]
+    visited = []
+    pos = start
+    while (target := planner.next_target(pos, maze)) is not None:
+        visited.append(target)
+        maze.eat_pellet(*target)
+        pos = target
+    assert planner.builds == 1
+    assert sorted(visited) == sorted(set(visited))
+    assert not maze.pellet_positions()
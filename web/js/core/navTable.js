@@ -0,0 +1,107 @@
+import { SearchAlgorithm } from './pathfinding.js';
+
+// Must match NAV_FORMAT_VERSION in src/core/nav_export.py
+export const NAV_FORMAT_VERSION = 2;
+
+function decodeBase64(text) {
+    const binary = atob(text);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes.buffer;
+}
+
+const TYPED_ARRAYS = { Uint8: Uint8Array, Uint16: Uint16Array, Uint32: Uint32Array };
+
+/**
+ * Precomputed distance and next-hop tables for one layout, built by
+ * build_nav_tables.py. Every query is an array lookup: no search at runtime.
+ */
+export class NavTable {
+    constructor(data) {
+        if (data.version !== NAV_FORMAT_VERSION) {
+            throw new Error(`Unsupported nav table version ${data.version}`);
+        }
+        this.name = data.name;
+        this.width = data.width;
+        this.height = data.height;
+        this.cellCount = data.cellCount;
+        this.directions = data.directions.map(([x, y]) => ({ x, y }));
+        this.noHop = data.noHop;
+        this.unreachable = data.unreachable;
+        this.cellIds = new Int32Array(decodeBase64(data.cellIds));
+        this.distances = new TYPED_ARRAYS[data.distanceType](decodeBase64(data.distances));
+        this.nextHops = new Uint8Array(decodeBase64(data.nextHop));
+    }
+
+    static async load(url) {
+        const response = await fetch(url);
+        if (!response.ok) {
+            throw new Error(`Failed to load nav table ${url}: ${response.status}`);
+        }
+        return new NavTable(await response.json());
+    }
+
+    cellId(pos) {
+        if (pos.x < 0 || pos.x >= this.width || pos.y < 0 || pos.y >= this.height) return -1;
+        return this.cellIds[pos.y * this.width + pos.x];
+    }
+
+    // Wall-aware distance, -1 if either cell is a wall or unreachable
+    distance(from, to) {
+        const a = this.cellId(from);
+        const b = this.cellId(to);
+        if (a < 0 || b < 0) return -1;
+        const distance = this.distances[a * this.cellCount + b];
+        return distance === this.unreachable ? -1 : distance;
+    }
+
+    // First move (a direction vector) of a shortest path, null if none
+    nextMove(from, to) {
+        const a = this.cellId(from);
+        const b = this.cellId(to);
+        if (a < 0 || b < 0) return null;
+        const hop = this.nextHops[a * this.cellCount + b];
+        return hop === this.noHop ? null : this.directions[hop];
+    }
+
+    // Shortest path from start to goal, excluding start
+    path(start, goal) {
+        const path = [];
+        let current = start;
+        let move = this.nextMove(current, goal);
+        while (move) {
+            current = { x: current.x + move.x, y: current.y + move.y };
+            path.push(current);
+            move = this.nextMove(current, goal);
+        }
+        return path;
+    }
+}
+
+/**
+ * SearchAlgorithm answering findPath from a NavTable: the nearest goal by
+ * table distance (the first one on ties), then the table path to it.
+ */
+export class TableSearch extends SearchAlgorithm {
+    constructor(table) {
+        super();
+        this.table = table;
+    }
+
+    findPath(start, goals, maze) {
+        if (!goals || goals.length === 0) return [];
+
+        let best = null;
+        let bestDistance = -1;
+        for (const goal of goals) {
+            const distance = this.table.distance(start, goal);
+            if (distance >= 0 && (best === null || distance < bestDistance)) {
+                best = goal;
+                bestDistance = distance;
+            }
+        }
+        return best ? this.table.path(start, best) : [];
+    }
+}
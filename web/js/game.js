@@ -12,6 +12,7 @@ import {
     GAME_CONFIG
 } from './config/constants.js';
 import { LEVEL_1 } from './config/mazelayouts.js';
+import { NavTable, TableSearch } from './core/navTable.js';
 
 export class PacmanGame {
     constructor() {
@@ -110,6 +111,14 @@ export class PacmanGame {
         const pacmanStart = this.maze.pacmanStart;
         this.pacman = new Pacman(pacmanStart.x, pacmanStart.y);
 
+        // Look paths up in the precomputed table when it has been built (build_nav_tables.py)
+        try {
+            const table = await NavTable.load(new URL('./data/nav/level_1.json', import.meta.url));
+            this.pacman.searchAlgorithm = new TableSearch(table);
+        } catch (error) {
+            console.warn('No navigation table, searching at runtime:', error.message);
+        }
+
         // Initialize ghosts
         const ghostColors = ['#FF0000', '#FFB6FF', '#00FFFF', '#FFB851'];
         const ghostCorners = [
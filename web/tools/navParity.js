@@ -0,0 +1,38 @@
+// Node side of check_nav_parity.py: answers the queries it is given with the
+// web client's code and prints the results as JSON.
+//
+// Input (stdin):  { table: <nav table JSON>, layout: [...rows], queries: [{ start, goals }] }
+// Output:         [{ move, distance, bfsDistance }] with move as a direction index or null
+import { readFileSync } from 'node:fs';
+import { NavTable, TableSearch } from '../js/core/navTable.js';
+import { BreadthFirstSearch } from '../js/core/pathfinding.js';
+
+const input = JSON.parse(readFileSync(0, 'utf8'));
+const table = new NavTable(input.table);
+const tableSearch = new TableSearch(table);
+const bfs = new BreadthFirstSearch();
+
+// Same walkability rule as Maze.isValidPosition (maze.js isn't imported because
+// mazelayouts.js validates LEVEL_1 on load, which has an open bottom-right corner)
+const maze = {
+    isValidPosition: (x, y) => y >= 0 && y < input.layout.length &&
+        x >= 0 && x < input.layout[y].length && input.layout[y][x] !== 'W'
+};
+
+const results = input.queries.map(({ start, goals }) => {
+    const toPoint = ([x, y]) => ({ x, y });
+    const from = toPoint(start);
+    const targets = goals.map(toPoint);
+    const path = tableSearch.findPath(from, targets, maze);
+    const move = path.length
+        ? table.directions.findIndex(d => d.x === path[0].x - from.x && d.y === path[0].y - from.y)
+        : null;
+    const bfsPath = bfs.findPath(from, targets, maze);
+    return {
+        move,
+        distance: path.length,
+        bfsDistance: bfsPath.length,
+    };
+});
+
+process.stdout.write(JSON.stringify(results));